@@ -1,12 +1,13 @@
 """Flow component operations utilities for Langflow."""
 
+from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
 from lfx.graph.graph.base import Graph
 from lfx.log.logger import logger
 
-from langflow.helpers.flow import get_flow_by_id_or_endpoint_name
+from langflow.helpers.flow import get_flow_by_id_or_endpoint_name, invalidate_flow_cache
 from langflow.services.database.models.flow.model import Flow
 from langflow.services.deps import session_scope
 
@@ -277,9 +278,11 @@ async def update_component_field_value(
 
             # Update the flow data
             db_flow.data = flow_data
+            db_flow.updated_at = datetime.now(timezone.utc)
             session.add(db_flow)
             await session.commit()
             await session.refresh(db_flow)
+            invalidate_flow_cache(db_flow.id)
 
     except Exception as e:  # noqa: BLE001
         await logger.aerror(f"Error updating field {field_name} in {component_id} of {flow_id_or_name}: {e}")
@@ -0,0 +1,43 @@
+"""Add file_blob table
+
+Revision ID: 4b9e2c7d1a53
+Revises: 182e5471b900
+Create Date: 2026-10-18 10:12:41.503217
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+from langflow.utils import migration
+
+# revision identifiers, used by Alembic.
+revision: str = "4b9e2c7d1a53"
+down_revision: str | None = "182e5471b900"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if not migration.table_exists("file_blob", conn):
+        op.create_table(
+            "file_blob",
+            sa.Column("path", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("path"),
+        )
+        # Blobs of the files deduplicated so far
+        op.execute(
+            "INSERT INTO file_blob (path, created_at) "
+            "SELECT DISTINCT path, CURRENT_TIMESTAMP FROM file WHERE substr(path, 1, 7) = '_blobs/'"
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if migration.table_exists("file_blob", conn):
+        op.drop_table("file_blob")
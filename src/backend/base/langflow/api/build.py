@@ -1,5 +1,6 @@
 import asyncio
 import json
+import struct
 import time
 import traceback
 import uuid
@@ -16,6 +17,7 @@ from langflow.api.disconnect import DisconnectHandlerStreamingResponse
 from langflow.api.utils import (
     CurrentActiveUser,
     EventDeliveryType,
+    EventFormat,
     build_graph_from_data,
     build_graph_from_db,
     format_elapsed_time,
@@ -29,7 +31,9 @@ from langflow.exceptions.component import ComponentBuildError
 from langflow.schema.message import ErrorMessage
 from langflow.schema.schema import OutputValue
 from langflow.services.database.models.flow.model import Flow
-from langflow.services.deps import get_chat_service, get_telemetry_service, session_scope
+from langflow.services.deps import get_chat_service, get_settings_service, get_telemetry_service, session_scope
+from langflow.services.job_queue.backends import JobEvent, JobEventsExpiredError
+from langflow.services.job_queue.event_queue import JobEventQueue
 from langflow.services.job_queue.service import JobQueueNotFoundError, JobQueueService
 from langflow.services.telemetry.schema import ComponentInputsPayload, ComponentPayload, PlaygroundPayload
 
@@ -98,65 +102,70 @@ async def start_flow_build(
     return job_id
 
 
+def encode_job_event(event: JobEvent, event_format: EventFormat = EventFormat.NDJSON) -> bytes:
+    """Encode an event in `event_format`, with the event ID clients can resume the stream from."""
+    data = event.data or b""
+    # Events are JSON objects with an event and data key, the ID is added as their first key
+    if data.startswith(b"{"):
+        data = b'{"id": "' + event.id.encode() + b'", ' + data[1:]
+    if event_format is EventFormat.NDJSON:
+        return data
+    data = data.rstrip()
+    if event_format is EventFormat.SSE:
+        # The JSON of an event is on a single line, so it fits in one data field
+        return f"id: {event.id}\nevent: {event.type or 'message'}\ndata: ".encode() + data + b"\n\n"
+    return struct.pack(">I", len(data)) + data
+
+
 async def get_flow_events_response(
     *,
     job_id: str,
     queue_service: JobQueueService,
     event_delivery: EventDeliveryType,
+    last_event_id: str | None = None,
+    event_format: EventFormat = EventFormat.NDJSON,
 ):
-    """Get events for a specific build job, either as a stream or single event."""
+    """Get events for a specific build job, either as a stream or single event.
+
+    With `last_event_id`, the events after that event are returned again, so a client that lost its connection
+    can resume where it stopped. Events are encoded in `event_format`.
+    """
     try:
-        main_queue, event_manager, event_task, _ = queue_service.get_queue_data(job_id)
         if event_delivery in (EventDeliveryType.STREAMING, EventDeliveryType.DIRECT):
-            if event_task is None:
-                await logger.aerror(f"No event task found for job {job_id}")
-                raise HTTPException(status_code=404, detail="No event task found for job")
+            if not await queue_service.job_exists(job_id):
+                raise JobQueueNotFoundError(job_id)
             return await create_flow_response(
-                queue=main_queue,
-                event_manager=event_manager,
-                event_task=event_task,
+                job_id=job_id, queue_service=queue_service, last_event_id=last_event_id, event_format=event_format
             )
 
-        # Polling mode - get all available events
+        # Polling mode - get all available events, or wait for the next one
         try:
-            events: list = []
-            # Get all available events from the queue without blocking
-            while not main_queue.empty():
-                _, value, _ = await main_queue.get()
-                if value is None:
-                    # End of stream, trigger end event
-                    if event_task is not None:
-                        event_task.cancel()
-                    event_manager.on_end(data={})
-                    # Include the end event
-                    events.append(None)
-                    break
-                events.append(value.decode("utf-8"))
-
-            # If no events were available, wait for one (with timeout)
-            if not events:
-                _, value, _ = await main_queue.get()
-                if value is None:
-                    # End of stream, trigger end event
-                    if event_task is not None:
-                        event_task.cancel()
-                    event_manager.on_end(data={})
-                else:
-                    events.append(value.decode("utf-8"))
-
-            # Return as NDJSON format - each line is a complete JSON object
-            content = "\n".join([event for event in events if event is not None])
-            return Response(content=content, media_type="application/x-ndjson")
+            events = await queue_service.get_events(job_id, last_event_id)
+            if any(event.data is None for event in events) and (event_task := queue_service.get_job_task(job_id)):
+                # End of stream
+                event_task.cancel()
+
+            # In NDJSON, each line is a complete JSON object
+            separator = b"\n" if event_format is EventFormat.NDJSON else b""
+            content = separator.join(
+                [encode_job_event(event, event_format) for event in events if event.data is not None]
+            )
+            return Response(content=content, media_type=event_format.value)
         except asyncio.CancelledError as exc:
             await logger.ainfo(f"Event polling was cancelled for job {job_id}")
             raise HTTPException(status_code=499, detail="Event polling was cancelled") from exc
         except asyncio.TimeoutError:
             await logger.awarning(f"Timeout while waiting for events for job {job_id}")
-            return Response(content="", media_type="application/x-ndjson")  # Return empty response instead of error
+            return Response(content="", media_type=event_format.value)  # Return empty response instead of error
 
     except JobQueueNotFoundError as exc:
         await logger.aerror(f"Job not found: {job_id}. Error: {exc!s}")
         raise HTTPException(status_code=404, detail=f"Job not found: {exc!s}") from exc
+    except JobEventsExpiredError as exc:
+        # The client can't resume without missing events
+        raise HTTPException(status_code=410, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         if isinstance(exc, HTTPException):
             raise
@@ -165,33 +174,48 @@ async def get_flow_events_response(
 
 
 async def create_flow_response(
-    queue: asyncio.Queue,
-    event_manager: EventManager,
-    event_task: asyncio.Task,
+    *,
+    job_id: str,
+    queue_service: JobQueueService,
+    last_event_id: str | None = None,
+    event_format: EventFormat = EventFormat.NDJSON,
 ) -> DisconnectHandlerStreamingResponse:
-    """Create a streaming response for the flow build process."""
+    """Create a streaming response for the flow build process.
+
+    Without `last_event_id`, the stream consumes the events of the job. With it, the stream starts after that
+    event and leaves the events to be replayed again.
+    """
+    # Validate the offset before the response starts
+    if last_event_id is not None:
+        await queue_service.get_events(job_id, last_event_id, wait=False)
 
-    async def consume_and_yield() -> AsyncIterator[str]:
+    async def consume_and_yield() -> AsyncIterator[bytes]:
+        offset = last_event_id
         while True:
             try:
-                event_id, value, put_time = await queue.get()
-                if value is None:
-                    break
-                get_time = time.time()
-                yield value.decode("utf-8")
-                await logger.adebug(f"Event {event_id} consumed in {get_time - put_time:.4f}s")
+                events = await queue_service.get_events(job_id, offset)
+                for event in events:
+                    if event.data is None:
+                        return
+                    yield encode_job_event(event, event_format)
+                if offset is not None:
+                    offset = events[-1].id
             except Exception as exc:  # noqa: BLE001
                 await logger.aexception(f"Error consuming event: {exc}")
                 break
 
     def on_disconnect() -> None:
+        if get_settings_service().settings.keep_build_running_on_disconnect:
+            logger.debug("Client disconnected, the build keeps running so the client can resume its events")
+            return
         logger.debug("Client disconnected, closing tasks")
-        event_task.cancel()
-        event_manager.on_end(data={})
+        # The job may run on another worker, in which case it runs to completion
+        if event_task := queue_service.get_job_task(job_id):
+            event_task.cancel()
 
     return DisconnectHandlerStreamingResponse(
         consume_and_yield(),
-        media_type="application/x-ndjson",
+        media_type=event_format.value,
         on_disconnect=on_disconnect,
     )
 
@@ -245,7 +269,7 @@ async def generate_flow_events(
             components_count = len(graph.vertices)
             vertices_to_run = list(graph.vertices_to_run.union(get_top_level_vertices(graph, graph.vertices_to_run)))
 
-            await chat_service.set_cache(flow_id_str, graph)
+            await chat_service.set_graph_state(graph)
             await log_telemetry(start_time, components_count, run_id=run_id, success=True)
 
         except Exception as exc:
@@ -369,7 +393,7 @@ async def generate_flow_events(
                     artifacts=artifacts,
                 )
             else:
-                await chat_service.set_cache(flow_id_str, graph)
+                await chat_service.set_graph_state(graph, vertex_ids=[vertex_id])
 
             timedelta = time.perf_counter() - start_time
 
@@ -462,6 +486,9 @@ async def generate_flow_events(
             graph: The graph instance
             event_manager: Manager for handling events
         """
+        if isinstance(event_manager.queue, JobEventQueue):
+            # With the "block" overflow policy, wait for the client to read the events of the build
+            await event_manager.queue.wait_for_space()
         try:
             vertex_build_response: VertexBuildResponse = await _build_vertex(vertex_id, graph, event_manager)
         except asyncio.CancelledError as exc:
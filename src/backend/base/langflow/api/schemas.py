@@ -12,3 +12,5 @@ class UploadFileResponse(BaseModel):
     path: Path
     size: int
     provider: str | None = None
+    sha256: str | None = None
+    """SHA-256 checksum of the content uploaded, unless it was appended to an existing file."""
@@ -14,6 +14,7 @@ from langflow.api.utils.core import (
     CurrentActiveUser,
     DbSession,
     EventDeliveryType,
+    EventFormat,
     build_and_cache_graph_from_data,
     build_graph_from_data,
     build_graph_from_db,
@@ -31,6 +32,7 @@ from langflow.api.utils.core import (
     get_suggestion_message,
     get_top_level_vertices,
     has_api_terms,
+    negotiate_event_format,
     parse_exception,
     parse_value,
     remove_api_keys,
@@ -50,6 +52,7 @@ __all__ = [
     "DbSession",
     # Enums
     "EventDeliveryType",
+    "EventFormat",
     "build_and_cache_graph_from_data",
     "build_graph_from_data",
     "build_graph_from_db",
@@ -68,6 +71,7 @@ __all__ = [
     "get_top_level_vertices",
     # Functions
     "has_api_terms",
+    "negotiate_event_format",
     "parse_exception",
     "parse_value",
     "remove_api_keys",
@@ -14,6 +14,7 @@ from lfx.services.deps import injectable_session_scope, injectable_session_scope
 from sqlalchemy import delete
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from langflow.helpers.flow import invalidate_flow_cache
 from langflow.services.auth.utils import get_current_active_user, get_current_active_user_mcp
 from langflow.services.database.models.flow.model import Flow
 from langflow.services.database.models.message.model import MessageTable
@@ -47,6 +48,40 @@ class EventDeliveryType(str, Enum):
     POLLING = "polling"
 
 
+class EventFormat(str, Enum):
+    """Wire format of build events, negotiated with the Accept header.
+
+    NDJSON sends one JSON object per line, SSE sends `text/event-stream` messages for EventSource clients, and
+    FRAMED prefixes each JSON event with its length, as a 4-byte big-endian integer, for server-to-server clients.
+    """
+
+    NDJSON = "application/x-ndjson"
+    SSE = "text/event-stream"
+    FRAMED = "application/vnd.langflow.event-frames"
+
+
+def negotiate_event_format(accept: str | None) -> EventFormat:
+    """Return the event format preferred by an Accept header, NDJSON if it accepts none of the others."""
+    best_format, best_quality = EventFormat.NDJSON, 0.0
+    for media_range in (accept or "").split(","):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        try:
+            event_format = EventFormat(media_type.lower())
+        except ValueError:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > best_quality:
+            best_format, best_quality = event_format, quality
+    return best_format
+
+
 def has_api_terms(word: str):
     return "api" in word and ("key" in word or ("token" in word and "tokens" not in word))
 
@@ -198,7 +233,7 @@ async def build_graph_from_db_no_cache(flow_id: uuid.UUID, session: AsyncSession
 
 async def build_graph_from_db(flow_id: uuid.UUID, session: AsyncSession, chat_service: ChatService, **kwargs):
     graph = await build_graph_from_db_no_cache(flow_id=flow_id, session=session, **kwargs)
-    await chat_service.set_cache(str(flow_id), graph)
+    await chat_service.set_graph_state(graph)
     return graph
 
 
@@ -211,7 +246,7 @@ async def build_and_cache_graph_from_data(
     # Convert flow_id to str if it's UUID
     str_flow_id = str(flow_id) if isinstance(flow_id, uuid.UUID) else flow_id
     graph = Graph.from_payload(graph_data, str_flow_id)
-    await chat_service.set_cache(str_flow_id, graph)
+    await chat_service.set_graph_state(graph)
     return graph
 
 
@@ -311,6 +346,7 @@ async def cascade_delete_flow(session: AsyncSession, flow_id: uuid.UUID) -> None
         await session.exec(delete(TransactionTable).where(TransactionTable.flow_id == flow_id))
         await session.exec(delete(VertexBuildTable).where(VertexBuildTable.flow_id == flow_id))
         await session.exec(delete(Flow).where(Flow.id == flow_id))
+        invalidate_flow_cache(flow_id)
     except Exception as e:
         msg = f"Unable to cascade delete flow: {flow_id}"
         raise RuntimeError(msg, e) from e
@@ -6,9 +6,8 @@ import traceback
 import uuid
 from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Header, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
-from lfx.graph.graph.base import Graph
 from lfx.graph.utils import log_vertex_build
 from lfx.log.logger import logger
 from lfx.schema.schema import InputValueRequest, OutputValue
@@ -25,6 +24,7 @@ from langflow.api.utils import (
     format_elapsed_time,
     format_exception_message,
     get_top_level_vertices,
+    negotiate_event_format,
     parse_exception,
     verify_public_flow_and_get_user,
 )
@@ -101,7 +101,7 @@ async def retrieve_vertices_order(
         # and return the same structure but only with the ids
         components_count = len(graph.vertices)
         vertices_to_run = list(graph.vertices_to_run.union(get_top_level_vertices(graph, graph.vertices_to_run)))
-        await chat_service.set_cache(str(flow_id), graph)
+        await chat_service.set_graph_state(graph)
         background_tasks.add_task(
             telemetry_service.log_package_playground,
             PlaygroundPayload(
@@ -203,12 +203,25 @@ async def get_build_events(
     queue_service: Annotated[JobQueueService, Depends(get_queue_service)],
     *,
     event_delivery: EventDeliveryType = EventDeliveryType.STREAMING,
+    last_event_id: str | None = None,
+    last_event_id_header: Annotated[str | None, Header(alias="Last-Event-ID")] = None,
+    accept: Annotated[str | None, Header()] = None,
 ):
-    """Get events for a specific build job."""
+    """Get events for a specific build job.
+
+    Pass the ID of the last event received, in `last_event_id` or the `Last-Event-ID` header, to get the events
+    after it again, for example after a lost connection. The response is a 410 if some of those events were
+    already dropped.
+
+    Events are sent as NDJSON, unless the Accept header asks for `text/event-stream` or
+    `application/vnd.langflow.event-frames`, length-prefixed JSON frames.
+    """
     return await get_flow_events_response(
         job_id=job_id,
         queue_service=queue_service,
         event_delivery=event_delivery,
+        last_event_id=last_event_id or last_event_id_header,
+        event_format=negotiate_event_format(accept),
     )
 
 
@@ -280,13 +293,12 @@ async def build_vertex(
     error_message = None
     run_id = None
     try:
-        graph: Graph = await chat_service.get_cache(flow_id_str)
+        cached_graph = await chat_service.get_graph_state(flow_id_str)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="Graph not found") from exc
 
     try:
-        cache = await chat_service.get_cache(flow_id_str)
-        if isinstance(cache, CacheMiss):
+        if isinstance(cached_graph, CacheMiss):
             # If there's no cache
             await logger.awarning(f"No cache found for {flow_id_str}. Building graph starting at {vertex_id}")
 
@@ -299,7 +311,7 @@ async def build_vertex(
             run_id = str(uuid.uuid4())
             graph.set_run_id(run_id)
         else:
-            graph = cache.get("result")
+            graph = cached_graph
             await graph.initialize_run()
             run_id = graph.run_id
         vertex = graph.get_vertex(vertex_id)
@@ -339,7 +351,7 @@ async def build_vertex(
             background_tasks.add_task(graph.end_all_traces_in_context(error=exc))
             # If there's an error building the vertex
             # we need to clear the cache
-            await chat_service.clear_cache(flow_id_str)
+            await chat_service.clear_graph_state(flow_id_str)
 
         result_data_response.message = artifacts
 
@@ -372,7 +384,7 @@ async def build_vertex(
         graph.reset_inactivated_vertices()
         graph.reset_activated_vertices()
 
-        await chat_service.set_cache(flow_id_str, graph)
+        await chat_service.set_graph_state(graph, vertex_ids=[vertex_id])
 
         # graph.stop_vertex tells us if the user asked
         # to stop the build of the graph at a certain vertex
@@ -427,20 +439,20 @@ async def _stream_vertex(flow_id: str, vertex_id: str, chat_service: ChatService
     graph = None
     try:
         try:
-            cache = await chat_service.get_cache(flow_id)
+            cached_graph = await chat_service.get_graph_state(flow_id)
         except Exception as exc:  # noqa: BLE001
             await logger.aexception("Error building Component")
             yield str(StreamData(event="error", data={"error": str(exc)}))
             return
 
-        if isinstance(cache, CacheMiss):
+        if isinstance(cached_graph, CacheMiss):
             # If there's no cache
             msg = f"No cache found for {flow_id}."
             await logger.aerror(msg)
             yield str(StreamData(event="error", data={"error": msg}))
             return
         else:
-            graph = cache.get("result")
+            graph = cached_graph
 
         try:
             vertex: InterfaceVertex = graph.get_vertex(vertex_id)
@@ -501,7 +513,7 @@ async def _stream_vertex(flow_id: str, vertex_id: str, chat_service: ChatService
     finally:
         await logger.adebug("Closing stream")
         if graph:
-            await chat_service.set_cache(flow_id, graph)
+            await chat_service.set_graph_state(graph, vertex_ids=[vertex_id])
         yield str(StreamData(event="close", data={"message": "Stream closed"}))
 
 
@@ -42,7 +42,7 @@ from langflow.exceptions.api import APIException, InvalidChatInputError
 from langflow.exceptions.serialization import SerializationError
 from langflow.helpers.flow import get_flow_by_id_or_endpoint_name
 from langflow.interface.initialize.loading import update_params_with_load_from_db_fields
-from langflow.processing.process import process_tweaks, run_graph_internal
+from langflow.processing.process import build_graph_from_flow_data, process_tweaks, run_graph_internal
 from langflow.schema.graph import Tweaks
 from langflow.services.auth.utils import api_key_security, get_current_active_user, get_webhook_user
 from langflow.services.cache.utils import save_uploaded_file
@@ -150,10 +150,15 @@ async def simple_run_flow(
         if flow.data is None:
             msg = f"Flow {flow_id_str} has no data"
             raise ValueError(msg)
-        graph_data = flow.data.copy()
-        graph_data = process_tweaks(graph_data, input_request.tweaks or {}, stream=stream)
-        graph = Graph.from_payload(
-            graph_data, flow_id=flow_id_str, user_id=str(user_id), flow_name=flow.name, context=context
+        graph = build_graph_from_flow_data(
+            flow.data,
+            input_request.tweaks,
+            flow_id=flow_id_str,
+            updated_at=flow.updated_at,
+            stream=stream,
+            flow_name=flow.name,
+            user_id=str(user_id),
+            context=context,
         )
         if run_id is None:
             run_id = str(uuid4())
@@ -22,6 +22,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from langflow.api.utils import CurrentActiveUser, DbSession, cascade_delete_flow, remove_api_keys, validate_is_component
 from langflow.api.v1.schemas import FlowListCreate
+from langflow.helpers.flow import invalidate_flow_cache
 from langflow.helpers.user import get_user_by_flow_id_or_endpoint_name
 from langflow.initial_setup.constants import STARTER_FOLDER_NAME
 from langflow.services.database.models.flow.model import (
@@ -363,6 +364,7 @@ async def update_flow(
         session.add(db_flow)
         await session.flush()
         await session.refresh(db_flow)
+        invalidate_flow_cache(db_flow.id)
         await _save_flow_to_fs(db_flow)
 
         # Convert to FlowRead while session is still active to avoid detached instance errors
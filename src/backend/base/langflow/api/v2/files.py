@@ -1,22 +1,29 @@
+import asyncio
+import hashlib
 import io
 import re
+import time
 import uuid
 import zipfile
-from collections.abc import AsyncGenerator, AsyncIterable
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Callable, Sequence
+from contextlib import AsyncExitStack, nullcontext
 from datetime import datetime
+from functools import partial
 from http import HTTPStatus
 from pathlib import Path
 from typing import Annotated
+from weakref import WeakValueDictionary
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 from lfx.log.logger import logger
-from sqlmodel import col, select
+from sqlmodel import col, delete, select
 
 from langflow.api.schemas import UploadFileResponse
 from langflow.api.utils import CurrentActiveUser, DbSession
 from langflow.services.database.models.file.model import File as UserFile
+from langflow.services.database.models.file.model import FileBlob
 from langflow.services.deps import get_settings_service, get_storage_service
 from langflow.services.settings.service import SettingsService
 from langflow.services.storage.service import StorageService
@@ -26,6 +33,15 @@ router = APIRouter(tags=["Files"], prefix="/files")
 # Set the static name of the MCP servers file
 MCP_SERVERS_FILE = "_mcp_servers"
 SAMPLE_DATA_DIR = Path(__file__).parent / "sample_data"
+# Size of the chunks uploads are streamed to the storage service in
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Size of the chunks files are read in to be zipped, and number of chunks of the next file fetched ahead
+ZIP_CHUNK_SIZE = 1024 * 1024
+ZIP_PREFETCH_CHUNKS = 8
+# Namespace of the content-addressed blobs deduplicated files point at, shared by all users
+BLOB_FLOW_ID = "_blobs"
+# Locks of the blobs this worker is saving or deleting, since SQLite ignores the row locks taken on them
+_blob_locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
 
 
 def is_permanent_storage_failure(error: Exception) -> bool:
@@ -103,6 +119,76 @@ async def fetch_file_object(file_id: uuid.UUID, current_user: CurrentActiveUser,
     return file
 
 
+def storage_location(file: UserFile, current_user: CurrentActiveUser) -> tuple[str, str]:
+    """Return the flow_id and file name the content of a file is stored with in the storage service.
+
+    Deduplicated files point at a blob shared by all users, other files are stored in the namespace of their user.
+    """
+    flow_id, _, file_name = file.path.rpartition("/")
+    if flow_id == BLOB_FLOW_ID:
+        return flow_id, file_name
+    return str(current_user.id), file_name
+
+
+def is_blob(file: UserFile) -> bool:
+    """Whether the content of a file is a blob shared by the deduplicated files with the same content."""
+    return file.path.startswith(f"{BLOB_FLOW_ID}/")
+
+
+def blob_lock(path: str) -> asyncio.Lock:
+    """Return the lock this worker holds while it locks the row of the blob at `path`, until its session commits."""
+    lock = _blob_locks.get(path)
+    if lock is None:
+        lock = _blob_locks[path] = asyncio.Lock()
+    return lock
+
+
+async def delete_unreferenced_blobs(paths: Sequence[str], session: DbSession, storage_service: StorageService) -> None:
+    """Delete the blobs at `paths` that no file points at anymore, and commit the session.
+
+    The files that pointed at the blobs must be deleted, and committed, first. The rows of the blobs are locked while
+    their references are counted and their content is deleted, and uploads of the same content lock them before
+    adding their file, see `save_blob_routine`. So, across workers, either the new file is counted here and the blob
+    is kept, or the upload finds the blob gone and saves its content again.
+    """
+    paths = sorted(set(paths))
+    if not paths:
+        return
+    async with AsyncExitStack() as stack:
+        for path in paths:
+            await stack.enter_async_context(blob_lock(path))
+        # Locked in order, so deletes of several blobs don't deadlock
+        stmt = select(FileBlob.path).where(col(FileBlob.path).in_(paths)).order_by(FileBlob.path).with_for_update()
+        blob_paths = (await session.exec(stmt)).all()
+        stmt = select(UserFile.path).where(col(UserFile.path).in_(blob_paths)).distinct()
+        referenced = set((await session.exec(stmt)).all())
+        unreferenced = {path.partition("/")[2]: path for path in blob_paths if path not in referenced}
+        errors = await delete_from_storage(storage_service, [(BLOB_FLOW_ID, blob_name) for blob_name in unreferenced])
+        for (_, blob_name), error in errors.items():
+            if not is_permanent_storage_failure(error):
+                # The files are already deleted, so the blob is left in storage, and its row kept
+                await logger.awarning("Failed to delete unused blob %s from storage: %s", blob_name, error)
+                del unreferenced[blob_name]
+        if unreferenced:
+            await session.exec(delete(FileBlob).where(col(FileBlob.path).in_(unreferenced.values())))
+        await session.commit()
+
+
+async def delete_from_storage(
+    storage_service: StorageService, locations: Sequence[tuple[str, str]]
+) -> dict[tuple[str, str], Exception]:
+    """Delete files from the storage service by their location, and return the error of each file not deleted."""
+    file_names_by_flow_id: dict[str, dict[str, None]] = {}
+    for flow_id, file_name in locations:
+        file_names_by_flow_id.setdefault(flow_id, {})[file_name] = None
+
+    errors: dict[tuple[str, str], Exception] = {}
+    for flow_id, file_names in file_names_by_flow_id.items():
+        failures = await storage_service.delete_files(flow_id, list(file_names))
+        errors.update({(flow_id, file_name): error for file_name, error in failures.items()})
+    return errors
+
+
 async def save_file_routine(
     file,
     storage_service,
@@ -111,19 +197,78 @@ async def save_file_routine(
     file_name=None,
     *,
     append: bool = False,
-):
-    """Routine to save the file content to the storage service."""
+) -> tuple[uuid.UUID, str, int, str]:
+    """Routine to save the file content to the storage service.
+
+    The content is streamed to the storage service, without reading it in memory, and its size and SHA-256
+    checksum are computed on the way.
+
+    Returns:
+        The ID for the file, the name it was saved with, and the size and checksum of the content saved.
+    """
     file_id = uuid.uuid4()
 
-    if not file_content:
-        file_content = await file.read()
     if not file_name:
         file_name = file.filename
 
+    size = 0
+    checksum = hashlib.sha256()
+
+    async def chunks() -> AsyncGenerator[bytes, None]:
+        nonlocal size
+        async for chunk in byte_stream_generator(
+            file if file_content is None else file_content, chunk_size=UPLOAD_CHUNK_SIZE
+        ):
+            size += len(chunk)
+            checksum.update(chunk)
+            yield chunk
+
     # Save the file using the storage service.
-    await storage_service.save_file(flow_id=str(current_user.id), file_name=file_name, data=file_content, append=append)
+    await storage_service.save_file_stream(
+        flow_id=str(current_user.id), file_name=file_name, chunks=chunks(), append=append
+    )
+
+    return file_id, file_name, size, checksum.hexdigest()
+
+
+async def hash_blob_routine(file: UploadFile, file_extension: str) -> tuple[uuid.UUID, str, int, str]:
+    """Routine to find the path of the blob of a file, keyed by the SHA-256 checksum of its content.
+
+    Returns:
+        The ID for the file, its path, and the size and checksum of its content.
+    """
+    size = 0
+    checksum = hashlib.sha256()
+    async for chunk in byte_stream_generator(file, chunk_size=UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        checksum.update(chunk)
+    sha256 = checksum.hexdigest()
+
+    # The extension is kept, since components pick how to parse files by the extension of their path
+    blob_name = f"{sha256}.{file_extension}" if file_extension else sha256
+    return uuid.uuid4(), f"{BLOB_FLOW_ID}/{blob_name}", size, sha256
+
+
+async def save_blob_routine(file: UploadFile, session: DbSession, storage_service: StorageService, path: str) -> bool:
+    """Routine to store the content of a file as the blob at `path`, unless the blob is stored already.
+
+    Locks the row of the blob, or adds it, so the file pointing at the blob must be added and committed in the same
+    transaction, under `blob_lock`. See `delete_unreferenced_blobs`.
 
-    return file_id, file_name
+    Returns:
+        Whether the blob was saved.
+    """
+    stmt = select(FileBlob).where(FileBlob.path == path).with_for_update()
+    if (await session.exec(stmt)).first() is not None:
+        return False
+    await file.seek(0)
+    await storage_service.save_file_stream(
+        flow_id=BLOB_FLOW_ID,
+        file_name=path.partition("/")[2],
+        chunks=byte_stream_generator(file, chunk_size=UPLOAD_CHUNK_SIZE),
+    )
+    session.add(FileBlob(path=path))
+    return True
 
 
 @router.post("", status_code=HTTPStatus.CREATED)
@@ -170,6 +315,9 @@ async def upload_user_file(
 
         # Initialize existing_file for append mode
         existing_file = None
+        # Blob of a deduplicated file appended to, which the file gets its own copy of first
+        blob_to_copy = None
+        deduplicate = settings_service.settings.deduplicate_files and not append and new_filename != mcp_file_ext
 
         if new_filename == mcp_file_ext:
             # Check if an existing record exists; if so, delete it to replace with the new one
@@ -182,7 +330,11 @@ async def upload_user_file(
         elif append:
             # In append mode, check if file exists and reuse the same filename
             existing_file = await get_file_by_name(root_filename, current_user, session)
-            if existing_file:
+            if existing_file and existing_file.path.startswith(f"{BLOB_FLOW_ID}/"):
+                # The content of deduplicated files is shared, so it is copied to a file of the user
+                blob_to_copy = storage_location(existing_file, current_user)
+                unique_filename = f"{existing_file.name}{Path(existing_file.path).suffix}"
+            elif existing_file:
                 # File exists, append to it by reusing the same filename
                 # Extract the filename from the path
                 unique_filename = existing_file.path.split("/")[-1] if "/" in existing_file.path else existing_file.path
@@ -212,15 +364,28 @@ async def upload_user_file(
             # Create the unique filename with extension for storage
             unique_filename = f"{root_filename}.{file_extension}" if file_extension else root_filename
 
-        # Read file content, save with unique filename, and compute file size in one routine
+        # Stream the file content with unique filename, computing its size and checksum in one routine
+        # The blob of a deduplicated file is saved with the file, under the lock of the blob
         try:
-            file_id, stored_file_name = await save_file_routine(
-                file, storage_service, current_user, file_name=unique_filename, append=append
-            )
-            file_size = await storage_service.get_file_size(
-                flow_id=str(current_user.id),
-                file_name=stored_file_name,
-            )
+            if deduplicate:
+                file_id, file_path, file_size, checksum = await hash_blob_routine(file, file_extension)
+            else:
+                if blob_to_copy is not None:
+                    await storage_service.save_file_stream(
+                        flow_id=str(current_user.id),
+                        file_name=unique_filename,
+                        chunks=storage_service.get_file_stream(*blob_to_copy),
+                    )
+                file_id, stored_file_name, file_size, checksum = await save_file_routine(
+                    file, storage_service, current_user, file_name=unique_filename, append=append
+                )
+                file_path = f"{current_user.id}/{stored_file_name}"
+            if append and existing_file:
+                # The size of the whole file, not of the content appended
+                file_size = await storage_service.get_file_size(
+                    flow_id=str(current_user.id),
+                    file_name=stored_file_name,
+                )
         except FileNotFoundError as e:
             # S3 bucket doesn't exist or file not found, or file was uploaded but can't be found
             raise HTTPException(status_code=404, detail=str(e)) from e
@@ -232,10 +397,16 @@ async def upload_user_file(
             raise HTTPException(status_code=500, detail=f"Error accessing file: {e}") from e
 
         if append and existing_file:
+            blob_path = None
+            if blob_to_copy is not None:
+                blob_path, existing_file.path = existing_file.path, file_path
             existing_file.size = file_size
             session.add(existing_file)
             await session.commit()
             await session.refresh(existing_file)
+            if blob_path is not None:
+                # The file has its own copy of the content now
+                await delete_unreferenced_blobs([blob_path], session, storage_service)
             new_file = existing_file
         else:
             # Create a new file record
@@ -243,25 +414,40 @@ async def upload_user_file(
                 id=file_id,
                 user_id=current_user.id,
                 name=root_filename,
-                path=f"{current_user.id}/{stored_file_name}",
+                path=file_path,
                 size=file_size,
             )
 
-        session.add(new_file)
-        try:
-            await session.flush()
-            await session.refresh(new_file)
-        except Exception as db_err:
-            # Database insert failed - clean up the uploaded file to avoid orphaned files
+        async with blob_lock(file_path) if deduplicate else nullcontext():
+            if deduplicate:
+                try:
+                    await save_blob_routine(file, session, storage_service, file_path)
+                except Exception as e:
+                    status_code = 403 if isinstance(e, PermissionError) else 500
+                    raise HTTPException(status_code=status_code, detail=f"Error accessing file: {e}") from e
+
+            session.add(new_file)
             try:
-                await storage_service.delete_file(flow_id=str(current_user.id), file_name=stored_file_name)
-            except OSError as e:
-                #  If delete fails, just log the error
-                await logger.aerror(f"Failed to clean up uploaded file {stored_file_name}: {e}")
-
-            raise HTTPException(
-                status_code=500, detail=f"Error inserting file metadata into database: {db_err}"
-            ) from db_err
+                await session.flush()
+                await session.refresh(new_file)
+                if deduplicate:
+                    # Releases the row of the blob
+                    await session.commit()
+                    await session.refresh(new_file)
+            except Exception as db_err:
+                # Database insert failed - clean up the uploaded file to avoid orphaned files
+                # Blobs are kept, other uploads of the same content may have saved them too
+                flow_id, stored_file_name = storage_location(new_file, current_user)
+                if not deduplicate:
+                    try:
+                        await storage_service.delete_file(flow_id=flow_id, file_name=stored_file_name)
+                    except OSError as e:
+                        #  If delete fails, just log the error
+                        await logger.aerror(f"Failed to clean up uploaded file {stored_file_name}: {e}")
+
+                raise HTTPException(
+                    status_code=500, detail=f"Error inserting file metadata into database: {db_err}"
+                ) from db_err
     except HTTPException:
         # Re-raise HTTP exceptions (like 409 conflicts) without modification
         raise
@@ -269,7 +455,13 @@ async def upload_user_file(
         # Optionally, you could also delete the file from disk if the DB insert fails.
         raise HTTPException(status_code=500, detail=f"Database error: {e}") from e
 
-    return UploadFileResponse(id=new_file.id, name=new_file.name, path=Path(new_file.path), size=new_file.size)
+    return UploadFileResponse(
+        id=new_file.id,
+        name=new_file.name,
+        path=Path(new_file.path),
+        size=new_file.size,
+        sha256=None if append and existing_file else checksum,
+    )
 
 
 async def get_file_by_name(
@@ -305,17 +497,13 @@ async def load_sample_files(current_user: CurrentActiveUser, session: DbSession,
         binary_data = sample_file_path.read_bytes()
 
         # Write the sample file content to the storage service
-        file_id, _ = await save_file_routine(
+        file_id, _, file_size, _ = await save_file_routine(
             sample_file_path,
             storage_service,
             current_user,
             file_content=binary_data,
             file_name=sample_file_name,
         )
-        file_size = await storage_service.get_file_size(
-            flow_id=str(current_user.id),
-            file_name=sample_file_name,
-        )
         # Create a UserFile object for the sample file
         sample_file = UserFile(
             id=file_id,
@@ -379,34 +567,42 @@ async def delete_files_batch(
         # Track database deletion failures
         db_failures = []
 
-        # Delete all files from the storage service
-        for file in files:
-            # Extract just the filename from the path (strip user_id prefix)
-            file_name = file.path.split("/")[-1]
+        # Delete all files from the storage service at once, but blobs, which are deleted after the files if no
+        # other file uses them
+        locations = [storage_location(file, current_user) for file in files]
+        blob_paths = [file.path for file in files if is_blob(file)]
+        deletion_errors = await delete_from_storage(
+            storage_service,
+            [location for file, location in zip(files, locations, strict=True) if not is_blob(file)],
+        )
+
+        for file, location in zip(files, locations, strict=True):
+            file_name = location[1]
             storage_deleted = False
 
-            try:
-                await storage_service.delete_file(flow_id=str(current_user.id), file_name=file_name)
+            err = deletion_errors.get(location)
+            if err is None:
                 storage_deleted = True
-            except OSError as err:
-                # Check if this is a "permanent" failure where file/storage is gone
-                # These are safe to delete from DB even if storage deletion failed
-                if is_permanent_storage_failure(err):
-                    # File/storage is permanently gone - safe to delete from DB
-                    await logger.awarning(
-                        "File %s not found in storage (permanent failure), will remove from database: %s",
-                        file_name,
-                        err,
-                    )
-                    storage_deleted = True  # Treat as "deleted" for DB purposes
-                else:
-                    # Transient failure (network, timeout, permissions) - keep in DB for retry
-                    storage_failures.append(f"{file_name}: {err}")
-                    await logger.awarning(
-                        "Failed to delete file %s from storage (transient error, keeping in database for retry): %s",
-                        file_name,
-                        err,
-                    )
+            elif not isinstance(err, OSError):
+                raise err
+            # Check if this is a "permanent" failure where file/storage is gone
+            # These are safe to delete from DB even if storage deletion failed
+            elif is_permanent_storage_failure(err):
+                # File/storage is permanently gone - safe to delete from DB
+                await logger.awarning(
+                    "File %s not found in storage (permanent failure), will remove from database: %s",
+                    file_name,
+                    err,
+                )
+                storage_deleted = True  # Treat as "deleted" for DB purposes
+            else:
+                # Transient failure (network, timeout, permissions) - keep in DB for retry
+                storage_failures.append(f"{file_name}: {err}")
+                await logger.awarning(
+                    "Failed to delete file %s from storage (transient error, keeping in database for retry): %s",
+                    file_name,
+                    err,
+                )
 
             # Only delete from database if storage deletion succeeded OR it was a permanent failure
             if storage_deleted:
@@ -433,6 +629,10 @@ async def delete_files_batch(
             if len(db_failures) == len(files):
                 raise HTTPException(status_code=500, detail=f"Failed to delete any files from database: {db_failures}")
 
+        if blob_paths:
+            await session.commit()
+            await delete_unreferenced_blobs(blob_paths, session, storage_service)
+
         # Calculate how many files were actually deleted from database
         # Files successfully deleted = total - (kept due to transient storage failures) - (DB deletion failures)
         files_deleted = len(files) - len(storage_failures) - len(db_failures)
@@ -454,6 +654,84 @@ async def delete_files_batch(
     return {"message": message}
 
 
+class _ZipOutput(io.RawIOBase):
+    """Unseekable output of a ZipFile, drained as the archive is written.
+
+    ZipFile writes the entries of unseekable outputs with data descriptors, after their data, so it never seeks
+    back to their headers.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+async def _prefetch(chunks: AsyncIterator[bytes], queue: asyncio.Queue) -> None:
+    """Put the chunks of a file on a queue, then None, or the exception raised reading them."""
+    try:
+        async for chunk in chunks:
+            await queue.put(chunk)
+    except Exception as exc:  # noqa: BLE001
+        await queue.put(exc)
+    else:
+        await queue.put(None)
+
+
+async def stream_zip(
+    entries: Sequence[tuple[str, int, Callable[[], AsyncIterator[bytes]]]],
+) -> AsyncGenerator[bytes, None]:
+    """Stream a ZIP archive of `(name, size, open_stream)` entries, without holding their content in memory.
+
+    The chunks of the next entry are fetched, up to ZIP_PREFETCH_CHUNKS of them, while the current one is written.
+    """
+    output = _ZipOutput()
+    queues: list[asyncio.Queue] = []
+    tasks: list[asyncio.Task] = []
+
+    def fetch(index: int) -> None:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=ZIP_PREFETCH_CHUNKS)
+        queues.append(queue)
+        tasks.append(asyncio.create_task(_prefetch(entries[index][2](), queue)))
+
+    try:
+        with zipfile.ZipFile(output, "w") as zip_file:
+            for index, (name, size, _) in enumerate(entries):
+                if index == 0:
+                    fetch(index)
+                if index + 1 < len(entries):
+                    fetch(index + 1)
+                info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+                # Same permissions as ZipFile.writestr, and a size to pick ZIP64 for entries over 4 GB
+                info.external_attr = 0o600 << 16
+                info.file_size = size
+                with zip_file.open(info, "w") as entry:
+                    while (chunk := await queues[index].get()) is not None:
+                        if isinstance(chunk, Exception):
+                            raise chunk
+                        entry.write(chunk)
+                        if data := output.drain():
+                            yield data
+                if data := output.drain():
+                    yield data
+        if data := output.drain():
+            yield data
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 @router.post("/batch/", status_code=HTTPStatus.OK)
 async def download_files_batch(
     file_ids: list[uuid.UUID],
@@ -471,34 +749,24 @@ async def download_files_batch(
         if not files:
             raise HTTPException(status_code=404, detail="No files found")
 
-        # Create a byte stream to hold the ZIP file
-        zip_stream = io.BytesIO()
-
-        # Create a ZIP file
-        with zipfile.ZipFile(zip_stream, "w") as zip_file:
-            for file in files:
-                # Get the file content from storage
-                file_content = await storage_service.get_file(
-                    flow_id=str(current_user.id), file_name=file.path.split("/")[-1]
-                )
-
-                # Get the file extension from the original filename
-                file_extension = Path(file.path).suffix
-                # Create the filename with extension
-                filename_with_extension = f"{file.name}{file_extension}"
-
-                # Write the file to the ZIP with the proper extension
-                zip_file.writestr(filename_with_extension, file_content)
-
-        # Seek to the beginning of the byte stream
-        zip_stream.seek(0)
+        entries = [
+            (
+                # The filename with the extension of the stored file
+                f"{file.name}{Path(file.path).suffix}",
+                file.size,
+                partial(
+                    storage_service.get_file_stream, *storage_location(file, current_user), chunk_size=ZIP_CHUNK_SIZE
+                ),
+            )
+            for file in files
+        ]
 
         # Generate the filename with the current datetime
         current_time = datetime.now(tz=ZoneInfo("UTC")).astimezone().strftime("%Y%m%d_%H%M%S")
         filename = f"{current_time}_langflow_files.zip"
 
         return StreamingResponse(
-            zip_stream,
+            stream_zip(entries),
             media_type="application/x-zip-compressed",
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
@@ -572,13 +840,13 @@ async def download_file(
         if not file:
             raise HTTPException(status_code=404, detail="File not found")
 
-        # Get the basename of the file path
-        file_name = file.path.split("/")[-1]
+        # Get where the content of the file is stored
+        flow_id, file_name = storage_location(file, current_user)
 
         # If return_content is True, read the file content and return it
         if return_content:
             # For content return, get the full file
-            file_content = await storage_service.get_file(flow_id=str(current_user.id), file_name=file_name)
+            file_content = await storage_service.get_file(flow_id=flow_id, file_name=file_name)
             if file_content is None:
                 raise HTTPException(status_code=404, detail="File not found")
             return await read_file_content(file_content, decode=True)
@@ -586,11 +854,11 @@ async def download_file(
         # For streaming, use the appropriate method based on storage type
         if hasattr(storage_service, "get_file_stream"):
             # S3 storage - use streaming method
-            file_stream = storage_service.get_file_stream(flow_id=str(current_user.id), file_name=file_name)
+            file_stream = storage_service.get_file_stream(flow_id=flow_id, file_name=file_name)
             byte_stream = file_stream
         else:
             # Local storage - get file and convert to stream
-            file_content = await storage_service.get_file(flow_id=str(current_user.id), file_name=file_name)
+            file_content = await storage_service.get_file(flow_id=flow_id, file_name=file_name)
             if file_content is None:
                 raise HTTPException(status_code=404, detail="File not found")
             byte_stream = byte_stream_generator(file_content)
@@ -649,13 +917,16 @@ async def delete_file(
         if not file_to_delete:
             raise HTTPException(status_code=404, detail="File not found")
 
-        # Extract just the filename from the path (strip user_id prefix)
-        file_name = file_to_delete.path.split("/")[-1]
+        # Get where the content of the file is stored
+        flow_id, file_name = storage_location(file_to_delete, current_user)
+        # The blob of a deduplicated file is deleted after the file, if no other file uses it
+        blob_path = file_to_delete.path if is_blob(file_to_delete) else None
 
         # Delete the file from the storage service first
         storage_deleted = False
         try:
-            await storage_service.delete_file(flow_id=str(current_user.id), file_name=file_name)
+            if blob_path is None:
+                await storage_service.delete_file(flow_id=flow_id, file_name=file_name)
             storage_deleted = True
         except Exception as err:
             # Check if this is a "permanent" failure where file/storage is gone
@@ -694,7 +965,11 @@ async def delete_file(
                     status_code=500, detail=f"Error deleting file from database: {db_error}"
                 ) from db_error
 
-            return {"detail": f"File {file_to_delete.name} deleted successfully"}
+            response = {"detail": f"File {file_to_delete.name} deleted successfully"}
+            if blob_path is not None:
+                await session.commit()
+                await delete_unreferenced_blobs([blob_path], session, storage_service)
+            return response
     except HTTPException:
         # Re-raise HTTPException to avoid being caught by the generic exception handler
         raise
@@ -721,34 +996,42 @@ async def delete_all_files(
         storage_failures = []
         db_failures = []
 
-        # Delete all files from the storage service
-        for file in files:
-            # Extract just the filename from the path (strip user_id prefix)
-            file_name = file.path.split("/")[-1]
+        # Delete all files from the storage service at once, but blobs, which are deleted after the files if no
+        # other file uses them
+        locations = [storage_location(file, current_user) for file in files]
+        blob_paths = [file.path for file in files if is_blob(file)]
+        deletion_errors = await delete_from_storage(
+            storage_service,
+            [location for file, location in zip(files, locations, strict=True) if not is_blob(file)],
+        )
+
+        for file, location in zip(files, locations, strict=True):
+            file_name = location[1]
             storage_deleted = False
 
-            try:
-                await storage_service.delete_file(flow_id=str(current_user.id), file_name=file_name)
+            err = deletion_errors.get(location)
+            if err is None:
                 storage_deleted = True
-            except OSError as err:
-                # Check if this is a "permanent" failure where file/storage is gone
-                # These are safe to delete from DB even if storage deletion failed
-                if is_permanent_storage_failure(err):
-                    # File/storage is permanently gone - safe to delete from DB
-                    await logger.awarning(
-                        "File %s not found in storage, also removing from database: %s",
-                        file_name,
-                        err,
-                    )
-                    storage_deleted = True
-                else:
-                    # Transient failure (network, timeout, permissions) - keep in DB for retry
-                    storage_failures.append(f"{file_name}: {err}")
-                    await logger.awarning(
-                        "Failed to delete file %s from storage (transient error, keeping in database for retry): %s",
-                        file_name,
-                        err,
-                    )
+            elif not isinstance(err, OSError):
+                raise err
+            # Check if this is a "permanent" failure where file/storage is gone
+            # These are safe to delete from DB even if storage deletion failed
+            elif is_permanent_storage_failure(err):
+                # File/storage is permanently gone - safe to delete from DB
+                await logger.awarning(
+                    "File %s not found in storage, also removing from database: %s",
+                    file_name,
+                    err,
+                )
+                storage_deleted = True
+            else:
+                # Transient failure (network, timeout, permissions) - keep in DB for retry
+                storage_failures.append(f"{file_name}: {err}")
+                await logger.awarning(
+                    "Failed to delete file %s from storage (transient error, keeping in database for retry): %s",
+                    file_name,
+                    err,
+                )
 
             # Only delete from database if storage deletion succeeded OR it was a permanent failure
             if storage_deleted:
@@ -774,6 +1057,10 @@ async def delete_all_files(
             if len(db_failures) == len(files):
                 raise HTTPException(status_code=500, detail=f"Failed to delete any files from database: {db_failures}")
 
+        if blob_paths:
+            await session.commit()
+            await delete_unreferenced_blobs(blob_paths, session, storage_service)
+
         # Calculate how many files were actually deleted from database
         # Files successfully deleted = total - (kept due to transient storage failures) - (DB deletion failures)
         files_deleted = len(files) - len(storage_failures) - len(db_failures)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, cast
+import pickle
+import threading
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 from uuid import UUID
 
+from cachetools import LRUCache
 from fastapi import HTTPException
 from lfx.log.logger import logger
 from pydantic.v1 import BaseModel, Field, create_model
@@ -15,6 +18,7 @@ from langflow.services.deps import get_settings_service, session_scope
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable
+    from datetime import datetime
 
     from lfx.graph.graph.base import Graph
     from lfx.graph.schema import RunOutputs
@@ -396,22 +400,82 @@ def get_arg_names(inputs: list[Vertex]) -> list[dict[str, str]]:
     ]
 
 
+class CachedFlow(NamedTuple):
+    """A flow loaded by `get_flow_by_id_or_endpoint_name` and the version it was loaded at."""
+
+    updated_at: datetime | None
+    flow: FlowRead
+    """The flow without its data."""
+    data: bytes
+    """The pickled flow data, loaded again for every caller so they can modify it."""
+
+
+_flow_cache: LRUCache[UUID, CachedFlow] | None = None
+_flow_cache_lock = threading.Lock()
+
+
+def _get_flow_cache() -> LRUCache[UUID, CachedFlow] | None:
+    global _flow_cache  # noqa: PLW0603
+    maxsize = get_settings_service().settings.flow_cache_size
+    if maxsize <= 0:
+        return None
+    with _flow_cache_lock:
+        if _flow_cache is None or _flow_cache.maxsize != maxsize:
+            _flow_cache = LRUCache(maxsize=maxsize)
+        return _flow_cache
+
+
+def invalidate_flow_cache(flow_id: UUID | str) -> None:
+    """Drop the cached definition of a flow."""
+    with _flow_cache_lock:
+        if _flow_cache is not None:
+            _flow_cache.pop(UUID(str(flow_id)), None)
+
+
+def clear_flow_cache() -> None:
+    with _flow_cache_lock:
+        if _flow_cache is not None:
+            _flow_cache.clear()
+
+
 async def get_flow_by_id_or_endpoint_name(flow_id_or_name: str, user_id: str | UUID | None = None) -> FlowRead | None:
+    """Load a flow by ID, or by endpoint name for the given user.
+
+    Flows are cached with their `updated_at`. Each call only queries the ID and `updated_at` of the flow and loads
+    the whole flow again when it changed, so updates made by other workers are seen right away.
+    """
     async with session_scope() as session:
-        endpoint_name = None
         try:
-            flow_id = UUID(flow_id_or_name)
-            flow = await session.get(Flow, flow_id)
+            stmt = select(Flow.id, Flow.updated_at).where(Flow.id == UUID(flow_id_or_name))
         except ValueError:
-            endpoint_name = flow_id_or_name
-            stmt = select(Flow).where(Flow.endpoint_name == endpoint_name)
+            stmt = select(Flow.id, Flow.updated_at).where(Flow.endpoint_name == flow_id_or_name)
             if user_id:
                 uuid_user_id = UUID(user_id) if isinstance(user_id, str) else user_id
                 stmt = stmt.where(Flow.user_id == uuid_user_id)
-            flow = (await session.exec(stmt)).first()
+        version = (await session.exec(stmt)).first()
+        flow = None
+        cache = _get_flow_cache()
+        if version is not None:
+            flow_id, updated_at = version
+            cached = None
+            if cache is not None:
+                with _flow_cache_lock:
+                    cached = cache.get(flow_id)
+            if cached is not None and cached.updated_at == updated_at:
+                return cached.flow.model_copy(update={"data": pickle.loads(cached.data)})  # noqa: S301
+            flow = await session.get(Flow, flow_id)
         if flow is None:
             raise HTTPException(status_code=404, detail=f"Flow identifier {flow_id_or_name} not found")
-        return FlowRead.model_validate(flow, from_attributes=True)
+        flow_read = FlowRead.model_validate(flow, from_attributes=True)
+        if cache is not None:
+            cached = CachedFlow(
+                flow.updated_at,
+                flow_read.model_copy(update={"data": None}),
+                pickle.dumps(flow_read.data, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+            with _flow_cache_lock:
+                cache[flow.id] = cached
+        return flow_read
 
 
 async def generate_unique_flow_name(flow_name, user_id, session):
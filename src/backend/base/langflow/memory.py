@@ -1,6 +1,8 @@
 import asyncio
 import json
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from uuid import UUID
 
 from langchain_core.chat_history import BaseChatMessageHistory
@@ -15,6 +17,9 @@ from langflow.schema.message import Message
 from langflow.services.database.models.message.model import MessageRead, MessageTable
 from langflow.services.deps import session_scope
 
+# Messages added while a `abuffer_messages` context is active, keyed by id
+_message_buffer: ContextVar[dict[UUID, MessageTable] | None] = ContextVar("message_buffer", default=None)
+
 
 def _get_variable_query(
     sender: str | None = None,
@@ -143,18 +148,71 @@ async def aadd_messages(messages: Message | list[Message], flow_id: str | UUID |
 
     try:
         messages_models = [MessageTable.from_message(msg, flow_id=flow_id) for msg in messages]
-        async with session_scope() as session:
-            messages_models = await aadd_messagetables(messages_models, session)
-        return [await Message.create(**message.model_dump()) for message in messages_models]
+        buffer = _message_buffer.get()
+        if buffer is not None:
+            buffer.update((message.id, message) for message in messages_models)
+            messages_reads = [_messagetable_to_read(message) for message in messages_models]
+        else:
+            async with session_scope() as session:
+                messages_reads = await aadd_messagetables(messages_models, session)
+        return await _messages_from_reads(messages_reads)
     except Exception as e:
         await logger.aexception(e)
         raise
 
 
+async def _messages_from_reads(messages: list[MessageRead]) -> list[Message]:
+    if any(message.files for message in messages):
+        # Creating a message with files is blocking (is_image_file), so they are all created in one thread
+        return await asyncio.to_thread(lambda: [Message(**message.model_dump()) for message in messages])
+    return [Message(**message.model_dump()) for message in messages]
+
+
+@asynccontextmanager
+async def abuffer_messages() -> AsyncIterator[None]:
+    """Coalesce the messages added and updated in this context into a single write on exit.
+
+    Useful for components that send many messages in one run, e.g. an agent streaming tool calls:
+    a message that is added and then updated several times is inserted once, with its last content.
+    Buffered messages are not visible to `aget_messages` until the context exits. Nested contexts
+    share the outermost buffer.
+    """
+    if _message_buffer.get() is not None:
+        yield
+        return
+    buffer: dict[UUID, MessageTable] = {}
+    token = _message_buffer.set(buffer)
+    try:
+        yield
+    finally:
+        _message_buffer.reset(token)
+        if buffer:
+            async with session_scope() as session:
+                await aadd_messagetables(list(buffer.values()), session)
+
+
 async def aupdate_messages(messages: Message | list[Message]) -> list[Message]:
     if not isinstance(messages, list):
         messages = [messages]
 
+    # Messages still in the `abuffer_messages` buffer are updated in place and written once on exit
+    buffer = _message_buffer.get() or {}
+    buffered_messages: list[MessageRead] = []
+    if buffer:
+        unbuffered_messages = []
+        for message in messages:
+            buffered = buffer.get(_message_id(message))
+            if buffered is None:
+                unbuffered_messages.append(message)
+                continue
+            buffered.sqlmodel_update(message.model_dump(exclude_unset=True, exclude_none=True))
+            if buffered.flow_id and isinstance(buffered.flow_id, str):
+                buffered.flow_id = UUID(buffered.flow_id)
+            buffered_messages.append(_messagetable_to_read(buffered))
+        if not unbuffered_messages:
+            return buffered_messages
+        messages = unbuffered_messages
+
     async with session_scope() as session:
         updated_messages: list[MessageTable] = []
         for message in messages:
@@ -171,7 +229,9 @@ async def aupdate_messages(messages: Message | list[Message]) -> list[Message]:
                 await logger.awarning(error_message)
                 raise ValueError(error_message)
 
-        return [MessageRead.model_validate(message, from_attributes=True) for message in updated_messages]
+        return buffered_messages + [
+            MessageRead.model_validate(message, from_attributes=True) for message in updated_messages
+        ]
 
 
 async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession, retry_count: int = 0):
@@ -187,10 +247,12 @@ async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession
     The retry mechanism has a limit to prevent infinite recursion.
     """
     max_retries = 3
+    # The rows are complete before the insert (the ids are generated client side), so the returned
+    # messages are built from them instead of refreshing each row after the commit.
+    new_messages = [_messagetable_to_read(message) for message in messages]
     try:
         try:
-            for message in messages:
-                session.add(message)
+            session.add_all(messages)
             await session.commit()
             # This is a hack.
             # We are doing this because build_public_tmp causes the CancelledError to be raised
@@ -204,8 +266,6 @@ async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession
                 error_msg = "Add Message operation cancelled after multiple retries"
                 raise ValueError(error_msg) from None
             return await aadd_messagetables(messages, session, retry_count + 1)
-        for message in messages:
-            await session.refresh(message)
     except asyncio.CancelledError as e:
         await logger.aexception(e)
         error_msg = "Operation cancelled"
@@ -214,14 +274,22 @@ async def aadd_messagetables(messages: list[MessageTable], session: AsyncSession
         await logger.aexception(e)
         raise
 
-    new_messages = []
-    for msg in messages:
-        msg.properties = json.loads(msg.properties) if isinstance(msg.properties, str) else msg.properties  # type: ignore[arg-type]
-        msg.content_blocks = [json.loads(j) if isinstance(j, str) else j for j in msg.content_blocks]  # type: ignore[arg-type]
-        msg.category = msg.category or ""
-        new_messages.append(msg)
+    return new_messages
+
+
+def _message_id(message: Message) -> UUID | None:
+    message_id = getattr(message, "id", None)
+    if not message_id:
+        return None
+    return message_id if isinstance(message_id, UUID) else UUID(str(message_id))
+
 
-    return [MessageRead.model_validate(message, from_attributes=True) for message in new_messages]
+def _messagetable_to_read(message: MessageTable) -> MessageRead:
+    data = {field: getattr(message, field) for field in MessageRead.model_fields}
+    data["properties"] = json.loads(data["properties"]) if isinstance(data["properties"], str) else data["properties"]
+    data["content_blocks"] = [json.loads(j) if isinstance(j, str) else j for j in data["content_blocks"] or []]
+    data["category"] = data["category"] or ""
+    return MessageRead.model_validate(data)
 
 
 def delete_messages(session_id: str | None = None, context_id: str | None = None) -> None:
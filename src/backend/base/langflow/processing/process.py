@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import threading
 from typing import TYPE_CHECKING, Any, cast
 
+import orjson
+from cachetools import LRUCache
+from lfx.graph.graph.base import Graph
+from lfx.graph.graph.compiled import CompiledFlow
 from lfx.graph.vertex.base import Vertex
 from lfx.log.logger import logger
 from lfx.processing.utils import validate_and_repair_json
@@ -12,8 +18,9 @@ from langflow.schema.schema import INPUT_FIELD_NAME
 from langflow.services.deps import get_settings_service
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from lfx.events.event_manager import EventManager
-    from lfx.graph.graph.base import Graph
     from lfx.graph.schema import RunOutputs
     from lfx.schema.schema import InputValueRequest
 
@@ -218,3 +225,96 @@ def process_tweaks_on_graph(graph: Graph, tweaks: dict[str, dict[str, Any]]):
             logger.warning("Each node should be a Vertex with an 'id' attribute of type str")
 
     return graph
+
+
+_compiled_flows: LRUCache[tuple[str, str, str], CompiledFlow] | None = None
+_compiled_flows_lock = threading.Lock()
+
+
+def _get_compiled_flows_cache() -> LRUCache[tuple[str, str, str], CompiledFlow] | None:
+    global _compiled_flows  # noqa: PLW0603
+    maxsize = get_settings_service().settings.compiled_flow_cache_size
+    if maxsize <= 0:
+        return None
+    with _compiled_flows_lock:
+        if _compiled_flows is None or _compiled_flows.maxsize != maxsize:
+            _compiled_flows = LRUCache(maxsize=maxsize)
+        return _compiled_flows
+
+
+def clear_compiled_flows_cache() -> None:
+    with _compiled_flows_lock:
+        if _compiled_flows is not None:
+            _compiled_flows.clear()
+
+
+def _hash_tweaks(tweaks: dict[str, Any], *, stream: bool) -> str | None:
+    try:
+        payload = orjson.dumps({"tweaks": tweaks, "stream": stream}, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return None
+    return hashlib.sha256(payload).hexdigest()
+
+
+def compile_flow_with_tweaks(
+    flow_data: dict[str, Any],
+    tweaks: Tweaks | dict[str, Any],
+    *,
+    stream: bool = False,
+    flow_id: str | None = None,
+    flow_name: str | None = None,
+    user_id: str | None = None,
+    context: dict | None = None,
+) -> tuple[CompiledFlow, Graph]:
+    """Applies the tweaks to a copy of the flow data, compiles the result and creates a first Graph from it."""
+    graph_data = process_tweaks(flow_data.copy(), tweaks, stream=stream)
+    return CompiledFlow.compile_to_graph(
+        graph_data, flow_id=flow_id, flow_name=flow_name, user_id=user_id, context=context
+    )
+
+
+def build_graph_from_flow_data(
+    flow_data: dict[str, Any],
+    tweaks: Tweaks | dict[str, Any] | None,
+    *,
+    flow_id: str,
+    updated_at: datetime | None,
+    stream: bool = False,
+    flow_name: str | None = None,
+    user_id: str | None = None,
+    context: dict | None = None,
+) -> Graph:
+    """Builds a new Graph for a run of a flow, reusing a cached compiled flow when possible.
+
+    Compiled flows are cached by flow ID, flow version (`updated_at`) and a hash of the tweaks, so updating
+    the flow or sending different tweaks compiles it again. Tweaks that are not JSON serializable bypass the cache.
+    The cache only saves ungrouping and cycle detection: the vertices and edges of the graph, and its components,
+    are still built for each run.
+
+    Tweaks are applied to a shallow copy of `flow_data`, so the nodes they change are modified in place, as
+    `flow_data` is expected to be loaded for the request.
+    """
+    tweaks_dict = (tweaks.model_dump() if isinstance(tweaks, BaseModel) else tweaks) or {}
+    cache = _get_compiled_flows_cache()
+    tweaks_hash = _hash_tweaks(tweaks_dict, stream=stream) if cache is not None else None
+    if cache is None or tweaks_hash is None:
+        graph_data = process_tweaks(flow_data.copy(), tweaks_dict, stream=stream)
+        return Graph.from_payload(graph_data, flow_id=flow_id, flow_name=flow_name, user_id=user_id, context=context)
+
+    key = (flow_id, updated_at.isoformat() if updated_at else "", tweaks_hash)
+    with _compiled_flows_lock:
+        compiled_flow = cache.get(key)
+    if compiled_flow is None:
+        compiled_flow, graph = compile_flow_with_tweaks(
+            flow_data,
+            tweaks_dict,
+            stream=stream,
+            flow_id=flow_id,
+            flow_name=flow_name,
+            user_id=user_id,
+            context=context,
+        )
+        with _compiled_flows_lock:
+            cache[key] = compiled_flow
+        return graph
+    return compiled_flow.to_graph(flow_id=flow_id, flow_name=flow_name, user_id=user_id, context=context)
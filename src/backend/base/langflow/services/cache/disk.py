@@ -1,5 +1,4 @@
 import asyncio
-import pickle
 import time
 from typing import Generic
 
@@ -8,10 +7,13 @@ from lfx.log.logger import logger
 from lfx.services.cache.utils import CACHE_MISS
 
 from langflow.services.cache.base import AsyncBaseCacheService, AsyncLockType
+from langflow.services.cache.serializer import CacheSerializer
 
 
 class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
-    def __init__(self, cache_dir, max_size=None, expiration_time=3600) -> None:
+    def __init__(
+        self, cache_dir, max_size=None, expiration_time=3600, serializer: CacheSerializer | None = None
+    ) -> None:
         self.cache = Cache(cache_dir)
         # Let's clear the cache for now to maintain a similar
         # behavior as the in-memory cache
@@ -22,6 +24,7 @@ class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
         self.lock = asyncio.Lock()
         self.max_size = max_size
         self.expiration_time = expiration_time
+        self.serializer = serializer or CacheSerializer()
 
     async def get(self, key, lock: asyncio.Lock | None = None):
         if not lock:
@@ -35,7 +38,7 @@ class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
         if item:
             if time.time() - item["time"] < self.expiration_time:
                 self.cache.touch(key)  # Refresh the expiry time
-                return pickle.loads(item["value"]) if isinstance(item["value"], bytes) else item["value"]
+                return self.serializer.loads(item["value"])
             logger.info(f"Cache item for key '{key}' has expired and will be deleted.")
             self.cache.delete(key)  # Log before deleting the expired item
         return CACHE_MISS
@@ -50,7 +53,7 @@ class AsyncDiskCache(AsyncBaseCacheService, Generic[AsyncLockType]):
     async def _set(self, key, value) -> None:
         if self.max_size and len(self.cache) >= self.max_size:
             await asyncio.to_thread(self.cache.cull)
-        item = {"value": pickle.dumps(value) if not isinstance(value, str | bytes) else value, "time": time.time()}
+        item = {"value": await asyncio.to_thread(self.serializer.dumps, value), "time": time.time()}
         await asyncio.to_thread(self.cache.set, key, item)
 
     async def delete(self, key, lock: asyncio.Lock | None = None) -> None:
@@ -6,6 +6,7 @@ from lfx.log.logger import logger
 from typing_extensions import override
 
 from langflow.services.cache.disk import AsyncDiskCache
+from langflow.services.cache.serializer import CacheSerializer
 from langflow.services.cache.service import AsyncInMemoryCache, CacheService, RedisCache, ThreadingInMemoryCache
 from langflow.services.factory import ServiceFactory
 
@@ -30,15 +31,25 @@ class CacheServiceFactory(ServiceFactory):
                 db=settings_service.settings.redis_db,
                 url=settings_service.settings.redis_url,
                 expiration_time=settings_service.settings.redis_cache_expire,
+                serializer=CacheSerializer(compression_threshold=settings_service.settings.cache_compression_threshold),
             )
 
         if settings_service.settings.cache_type == "memory":
-            return ThreadingInMemoryCache(expiration_time=settings_service.settings.cache_expire)
+            return ThreadingInMemoryCache(
+                expiration_time=settings_service.settings.cache_expire,
+                max_bytes=settings_service.settings.cache_max_bytes or None,
+                sweep_interval=settings_service.settings.cache_sweep_interval or None,
+            )
         if settings_service.settings.cache_type == "async":
-            return AsyncInMemoryCache(expiration_time=settings_service.settings.cache_expire)
+            return AsyncInMemoryCache(
+                expiration_time=settings_service.settings.cache_expire,
+                max_bytes=settings_service.settings.cache_max_bytes or None,
+                sweep_interval=settings_service.settings.cache_sweep_interval or None,
+            )
         if settings_service.settings.cache_type == "disk":
             return AsyncDiskCache(
                 cache_dir=settings_service.settings.config_dir,
                 expiration_time=settings_service.settings.cache_expire,
+                serializer=CacheSerializer(compression_threshold=settings_service.settings.cache_compression_threshold),
             )
         return None
@@ -0,0 +1,96 @@
+import pickle
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+import dill
+
+# The first byte of a serialized value tells how to load it. Pickle streams (protocol 2 and up)
+# start with b"\x80", so values written before the format byte existed are still loaded, with dill.
+PICKLE_FORMAT = b"p"
+DILL_FORMAT = b"d"
+COMPRESSED_PICKLE_FORMAT = b"P"
+COMPRESSED_DILL_FORMAT = b"D"
+
+
+@dataclass
+class SerializationStats:
+    """Serialization counters for one type of value."""
+
+    dumps: int = 0
+    loads: int = 0
+    dumped_bytes: int = 0
+    dump_seconds: float = 0.0
+    load_seconds: float = 0.0
+    dill_fallbacks: int = 0
+    compressed: int = 0
+
+
+class CacheSerializer:
+    """Serializes the values stored by external cache backends.
+
+    Values are pickled with the highest protocol, which is fast for the values we cache
+    (`Data`, `Message`, `DataFrame`, dicts of them and graphs made of importable classes).
+    Only values plain pickle can't handle, like lambdas or classes built at runtime, fall back
+    to `dill.dumps(recurse=True)`. Payloads of at least `compression_threshold` bytes are
+    compressed with zlib; set it to 0 to disable compression.
+
+    Subclass it and pass it to the cache to plug in another format.
+    """
+
+    def __init__(self, compression_threshold: int = 1024 * 1024, compression_level: int = 1) -> None:
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self._stats: dict[str, SerializationStats] = {}
+        self._stats_lock = threading.Lock()
+
+    def dumps(self, value: Any) -> bytes:
+        start = time.perf_counter()
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            data_format, compressed_format = PICKLE_FORMAT, COMPRESSED_PICKLE_FORMAT
+        except (pickle.PicklingError, AttributeError, TypeError):
+            data = dill.dumps(value, recurse=True)
+            data_format, compressed_format = DILL_FORMAT, COMPRESSED_DILL_FORMAT
+        compressed = bool(self.compression_threshold) and len(data) >= self.compression_threshold
+        data = compressed_format + zlib.compress(data, self.compression_level) if compressed else data_format + data
+        with self._stats_lock:
+            stats = self._get_stats(value)
+            stats.dumps += 1
+            stats.dumped_bytes += len(data)
+            stats.dump_seconds += time.perf_counter() - start
+            stats.dill_fallbacks += data_format == DILL_FORMAT
+            stats.compressed += compressed
+        return data
+
+    def loads(self, data: bytes) -> Any:
+        start = time.perf_counter()
+        data_format, payload = data[:1], memoryview(data)[1:]
+        if data_format == PICKLE_FORMAT:
+            value = pickle.loads(payload)
+        elif data_format == COMPRESSED_PICKLE_FORMAT:
+            value = pickle.loads(zlib.decompress(payload))
+        elif data_format == DILL_FORMAT:
+            value = dill.loads(payload)
+        elif data_format == COMPRESSED_DILL_FORMAT:
+            value = dill.loads(zlib.decompress(payload))
+        else:
+            value = dill.loads(data)
+        with self._stats_lock:
+            stats = self._get_stats(value)
+            stats.loads += 1
+            stats.load_seconds += time.perf_counter() - start
+        return value
+
+    def _get_stats(self, value: Any) -> SerializationStats:
+        type_name = type(value).__name__
+        if type_name not in self._stats:
+            self._stats[type_name] = SerializationStats()
+        return self._stats[type_name]
+
+    def get_stats(self) -> dict[str, SerializationStats]:
+        """Return a copy of the serialization counters, by type name of the values."""
+        with self._stats_lock:
+            return {type_name: SerializationStats(**vars(stats)) for type_name, stats in self._stats.items()}
@@ -1,13 +1,14 @@
 import asyncio
+import dataclasses
 import pickle
 import threading
 import time
+import weakref
 from collections import OrderedDict
 from typing import Generic, Union
 
-import dill
 from lfx.log.logger import logger
-from lfx.services.cache.utils import CACHE_MISS
+from lfx.services.cache.utils import CACHE_MISS, CacheStats, approximate_size, sweep_expired_items
 from typing_extensions import override
 
 from langflow.services.cache.base import (
@@ -17,6 +18,7 @@ from langflow.services.cache.base import (
     ExternalAsyncBaseCacheService,
     LockType,
 )
+from langflow.services.cache.serializer import CacheSerializer
 
 
 class ThreadingInMemoryCache(CacheService, Generic[LockType]):
@@ -29,6 +31,9 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
     Attributes:
         max_size (int, optional): Maximum number of items to store in the cache.
         expiration_time (int, optional): Time in seconds after which a cached item expires. Default is 1 hour.
+        max_bytes (int, optional): Maximum approximate size in bytes of the cached values.
+        sweep_interval (float, optional): Time in seconds between removals of the expired items in a
+            background thread. Without it, expired items are only removed when they are accessed.
 
     Example:
         cache = InMemoryCache(max_size=3, expiration_time=5)
@@ -43,17 +48,24 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
         b = cache["b"]
     """
 
-    def __init__(self, max_size=None, expiration_time=60 * 60) -> None:
+    def __init__(self, max_size=None, expiration_time=60 * 60, max_bytes=None, sweep_interval=None) -> None:
         """Initialize a new InMemoryCache instance.
 
         Args:
             max_size (int, optional): Maximum number of items to store in the cache.
             expiration_time (int, optional): Time in seconds after which a cached item expires. Default is 1 hour.
+            max_bytes (int, optional): Maximum approximate size in bytes of the cached values.
+            sweep_interval (float, optional): Time in seconds between removals of the expired items.
         """
         self._cache: OrderedDict = OrderedDict()
         self._lock = threading.RLock()
         self.max_size = max_size
         self.expiration_time = expiration_time
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._stats = CacheStats()
+        self._sweeper: threading.Thread | None = None
+        self._stop_sweeper = threading.Event()
 
     def get(self, key, lock: Union[threading.Lock, None] = None):  # noqa: UP007
         """Retrieve an item from the cache.
@@ -74,9 +86,12 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
             if self.expiration_time is None or time.time() - item["time"] < self.expiration_time:
                 # Move the key to the end to make it recently used
                 self._cache.move_to_end(key)
+                self._stats.hits += 1
                 # Check if the value is pickled
                 return pickle.loads(item["value"]) if isinstance(item["value"], bytes) else item["value"]
-            self.delete(key)
+            self._remove(key)
+            self._stats.expirations += 1
+        self._stats.misses += 1
         return CACHE_MISS
 
     def set(self, key, value, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
@@ -92,13 +107,17 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
         with lock or self._lock:
             if key in self._cache:
                 # Remove existing key before re-inserting to update order
-                self.delete(key)
+                self._remove(key)
             elif self.max_size and len(self._cache) >= self.max_size:
                 # Remove least recently used item
-                self._cache.popitem(last=False)
-            # pickle locally to mimic Redis
-
-            self._cache[key] = {"value": value, "time": time.time()}
+                self._evict()
+            size = approximate_size(value) if self.max_bytes else 0
+            self._cache[key] = {"value": value, "time": time.time(), "size": size}
+            self._stats.bytes += size
+            # Remove least recently used items until the cache fits its budget, keeping at least the new item
+            while self.max_bytes and self._stats.bytes > self.max_bytes and len(self._cache) > 1:
+                self._evict()
+            self._start_sweeper()
 
     def upsert(self, key, value, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         """Inserts or updates a value in the cache.
@@ -139,12 +158,59 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
 
     def delete(self, key, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         with lock or self._lock:
-            self._cache.pop(key, None)
+            self._remove(key)
 
     def clear(self, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         """Clear all items from the cache."""
         with lock or self._lock:
             self._cache.clear()
+            self._stats.bytes = 0
+
+    def expire(self) -> int:
+        """Remove the expired items from the cache.
+
+        Returns:
+            The number of items removed.
+        """
+        if self.expiration_time is None:
+            return 0
+        with self._lock:
+            now = time.time()
+            expired = [key for key, item in self._cache.items() if now - item["time"] >= self.expiration_time]
+            for key in expired:
+                self._remove(key)
+            self._stats.expirations += len(expired)
+        return len(expired)
+
+    def get_stats(self) -> CacheStats:
+        """Return the hits, misses, evictions, expirations, items and bytes of the cache."""
+        with self._lock:
+            return dataclasses.replace(self._stats, items=len(self._cache))
+
+    def _remove(self, key) -> None:
+        if (item := self._cache.pop(key, None)) is not None:
+            self._stats.bytes -= item["size"]
+
+    def _evict(self) -> None:
+        _, item = self._cache.popitem(last=False)
+        self._stats.bytes -= item["size"]
+        self._stats.evictions += 1
+
+    def _start_sweeper(self) -> None:
+        if not self.sweep_interval or self.expiration_time is None or self._stop_sweeper.is_set():
+            return
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = threading.Thread(
+                target=sweep_expired_items,
+                args=(weakref.ref(self), self._stop_sweeper, self.sweep_interval),
+                name=f"{type(self).__name__}-sweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
+
+    async def teardown(self) -> None:
+        """Stop the background removal of expired items."""
+        self._stop_sweeper.set()
 
     def contains(self, key) -> bool:
         """Check if the key is in the cache."""
@@ -196,7 +262,15 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
         b = cache["b"]
     """
 
-    def __init__(self, host="localhost", port=6379, db=0, url=None, expiration_time=60 * 60) -> None:
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        url=None,
+        expiration_time=60 * 60,
+        serializer: CacheSerializer | None = None,
+    ) -> None:
         """Initialize a new RedisCache instance.
 
         Args:
@@ -206,6 +280,7 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
             url (str, optional): Redis URL.
             expiration_time (int, optional): Time in seconds after which a
                 cached item expires. Default is 1 hour.
+            serializer (CacheSerializer, optional): Serializer of the cached values.
         """
         # Redis is a main dependency, no need to import check
         from redis.asyncio import StrictRedis
@@ -219,6 +294,7 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
         else:
             self._client = StrictRedis(host=host, port=port, db=db)
         self.expiration_time = expiration_time
+        self.serializer = serializer or CacheSerializer()
 
     async def is_connected(self) -> bool:
         """Check if the Redis client is connected."""
@@ -237,12 +313,12 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
         if key is None:
             return CACHE_MISS
         value = await self._client.get(str(key))
-        return dill.loads(value) if value else CACHE_MISS
+        return self.serializer.loads(value) if value else CACHE_MISS
 
     @override
     async def set(self, key, value, lock=None) -> None:
         try:
-            if pickled := dill.dumps(value, recurse=True):
+            if pickled := self.serializer.dumps(value):
                 result = await self._client.setex(str(key), self.expiration_time, pickled)
                 if not result:
                     msg = "RedisCache could not set the value."
@@ -292,12 +368,24 @@ class RedisCache(ExternalAsyncBaseCacheService, Generic[LockType]):
 
 
 class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
-    def __init__(self, max_size=None, expiration_time=3600) -> None:
+    """An in-memory cache for the event loop, with the same eviction and expiry as ThreadingInMemoryCache.
+
+    The expired items are removed every `sweep_interval` seconds by a callback scheduled on the loop
+    of the last `set`, so no thread or task is needed.
+    """
+
+    def __init__(self, max_size=None, expiration_time=3600, max_bytes=None, sweep_interval=None) -> None:
         self.cache: OrderedDict = OrderedDict()
 
         self.lock = asyncio.Lock()
         self.max_size = max_size
         self.expiration_time = expiration_time
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._stats = CacheStats()
+        self._sweep_handle: asyncio.TimerHandle | None = None
+        self._sweep_loop: asyncio.AbstractEventLoop | None = None
+        self._stopped = False
 
     async def get(self, key, lock: asyncio.Lock | None = None):
         async with lock or self.lock:
@@ -308,9 +396,12 @@ class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
         if item:
             if time.time() - item["time"] < self.expiration_time:
                 self.cache.move_to_end(key)
+                self._stats.hits += 1
                 return pickle.loads(item["value"]) if isinstance(item["value"], bytes) else item["value"]
+            self._stats.expirations += 1
             await logger.ainfo(f"Cache item for key '{key}' has expired and will be deleted.")
             await self._delete(key)  # Log before deleting the expired item
+        self._stats.misses += 1
         return CACHE_MISS
 
     async def set(self, key, value, lock: asyncio.Lock | None = None) -> None:
@@ -321,18 +412,24 @@ class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
             )
 
     async def _set(self, key, value) -> None:
-        if self.max_size and len(self.cache) >= self.max_size:
-            self.cache.popitem(last=False)
-        self.cache[key] = {"value": value, "time": time.time()}
-        self.cache.move_to_end(key)
+        if key in self.cache:
+            self._remove(key)
+        elif self.max_size and len(self.cache) >= self.max_size:
+            self._evict()
+        size = approximate_size(value) if self.max_bytes else 0
+        self.cache[key] = {"value": value, "time": time.time(), "size": size}
+        self._stats.bytes += size
+        # Remove least recently used items until the cache fits its budget, keeping at least the new item
+        while self.max_bytes and self._stats.bytes > self.max_bytes and len(self.cache) > 1:
+            self._evict()
+        self._schedule_sweep()
 
     async def delete(self, key, lock: asyncio.Lock | None = None) -> None:
         async with lock or self.lock:
             await self._delete(key)
 
     async def _delete(self, key) -> None:
-        if key in self.cache:
-            del self.cache[key]
+        self._remove(key)
 
     async def clear(self, lock: asyncio.Lock | None = None) -> None:
         async with lock or self.lock:
@@ -340,6 +437,59 @@ class AsyncInMemoryCache(AsyncBaseCacheService, Generic[AsyncLockType]):
 
     async def _clear(self) -> None:
         self.cache.clear()
+        self._stats.bytes = 0
+
+    def expire(self) -> int:
+        """Remove the expired items from the cache.
+
+        Returns:
+            The number of items removed.
+        """
+        now = time.time()
+        expired = [key for key, item in self.cache.items() if now - item["time"] >= self.expiration_time]
+        for key in expired:
+            self._remove(key)
+        self._stats.expirations += len(expired)
+        return len(expired)
+
+    def get_stats(self) -> CacheStats:
+        """Return the hits, misses, evictions, expirations, items and bytes of the cache."""
+        return dataclasses.replace(self._stats, items=len(self.cache))
+
+    def _remove(self, key) -> None:
+        if (item := self.cache.pop(key, None)) is not None:
+            self._stats.bytes -= item["size"]
+
+    def _evict(self) -> None:
+        _, item = self.cache.popitem(last=False)
+        self._stats.bytes -= item["size"]
+        self._stats.evictions += 1
+
+    def _schedule_sweep(self) -> None:
+        if not self.sweep_interval or self._stopped:
+            return
+        loop = asyncio.get_running_loop()
+        # The callback is bound to the loop it was scheduled in, so it is rescheduled if the loop changed
+        if self._sweep_handle is None or self._sweep_handle.cancelled() or self._sweep_loop is not loop:
+            self._sweep_loop = loop
+            self._sweep_handle = loop.call_later(self.sweep_interval, self._sweep)
+
+    def _sweep(self) -> None:
+        self._sweep_handle = None
+        if self._stopped:
+            return
+        # The callback runs between two awaits, so it only has to skip operations that are holding the lock
+        if not self.lock.locked():
+            self.expire()
+        if self.cache:
+            self._schedule_sweep()
+
+    async def teardown(self) -> None:
+        """Stop the background removal of expired items."""
+        self._stopped = True
+        if self._sweep_handle is not None:
+            self._sweep_handle.cancel()
+            self._sweep_handle = None
 
     async def upsert(self, key, value, lock: asyncio.Lock | None = None) -> None:
         await self._upsert(key, value, lock)
@@ -1,12 +1,22 @@
 import asyncio
 from collections import defaultdict
 from threading import RLock
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from cachetools import LRUCache
+from lfx.services.cache.utils import CacheMiss
 
 from langflow.services.base import Service
 from langflow.services.cache.base import AsyncBaseCacheService, CacheService
+from langflow.services.cache.service import AsyncInMemoryCache, ThreadingInMemoryCache
 from langflow.services.deps import get_cache_service
 
+if TYPE_CHECKING:
+    from lfx.graph.graph.base import Graph
+
+GRAPH_STATE_PREFIX = "graph_state"
+GRAPH_TOPOLOGIES_MAX_SIZE = 1024
+
 
 class ChatService(Service):
     """Service class for managing chat-related operations."""
@@ -17,6 +27,8 @@ class ChatService(Service):
         self.async_cache_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
         self._sync_cache_locks: dict[str, RLock] = defaultdict(RLock)
         self.cache_service: CacheService | AsyncBaseCacheService = get_cache_service()
+        # (key, run_id) pairs whose topology is already cached, so it is only written once per run
+        self._cached_topologies: LRUCache[tuple[str, str], bool] = LRUCache(maxsize=GRAPH_TOPOLOGIES_MAX_SIZE)
 
     async def set_cache(self, key: str, data: Any, lock: asyncio.Lock | None = None) -> bool:
         """Set the cache for a client.
@@ -65,3 +77,104 @@ class ChatService(Service):
         if isinstance(self.cache_service, AsyncBaseCacheService):
             return await self.cache_service.delete(key, lock=lock or self.async_cache_locks[key])
         return await asyncio.to_thread(self.cache_service.delete, key, lock=lock or self._sync_cache_locks[key])
+
+    @property
+    def caches_graph_references(self) -> bool:
+        """Whether the cache keeps a reference to the cached graph instead of serializing it."""
+        return isinstance(self.cache_service, ThreadingInMemoryCache | AsyncInMemoryCache)
+
+    @staticmethod
+    def _graph_state_key(key: str, *parts: str) -> str:
+        return ":".join([GRAPH_STATE_PREFIX, key, *parts])
+
+    async def set_graph_state(self, graph: "Graph", vertex_ids: list[str] | None = None) -> None:
+        """Cache the state of a graph between builds.
+
+        In-memory caches store a reference to the graph itself. Caches that serialize their values
+        (e.g. Redis) get the static topology of the graph once per run, and then only the build state
+        of the vertices that were built and the run state of the graph, keyed by flow ID, run ID and
+        vertex ID, instead of the whole graph after every vertex.
+
+        Args:
+            graph (Graph): The graph to cache.
+            vertex_ids (Optional[list[str]], optional): The vertices built since the graph was last cached.
+                If None, or if the topology of this run was not cached yet, every built vertex is cached.
+                Defaults to None.
+        """
+        if self.caches_graph_references:
+            await self.set_cache(str(graph.flow_id or graph.get_run_state()["run_id"]), graph)
+            return
+        run_state = graph.get_run_state()
+        run_id = str(run_state["run_id"])
+        key = str(graph.flow_id or run_id)
+        if vertex_ids is None or (key, run_id) not in self._cached_topologies:
+            topology = {
+                "raw_graph_data": graph.raw_graph_data,
+                "flow_id": graph.flow_id,
+                "flow_name": graph.flow_name,
+                "user_id": graph.user_id,
+            }
+            await self.set_cache(self._graph_state_key(key, run_id, "topology"), topology)
+            self._cached_topologies[key, run_id] = True
+            vertex_ids = [vertex.id for vertex in graph.vertices if vertex.built]
+        for vertex_id in vertex_ids:
+            vertex = graph.get_vertex(vertex_id)
+            await self.set_cache(self._graph_state_key(key, run_id, vertex_id), vertex.get_build_state())
+        await self.set_cache(self._graph_state_key(key), run_state)
+
+    async def get_graph_state(self, key: str) -> "Graph | CacheMiss":
+        """Get a graph cached with `set_graph_state`.
+
+        Args:
+            key (str): The flow ID (or run ID for graphs without a flow) the graph was cached for.
+
+        Returns:
+            Graph | CacheMiss: The graph, rebuilt from its cached state if needed, or a cache miss.
+        """
+        if self.caches_graph_references:
+            cached = await self.get_cache(key)
+            return cached if isinstance(cached, CacheMiss) else cached["result"]
+
+        from lfx.graph.graph.base import Graph
+
+        run_state = await self.get_cache(self._graph_state_key(key))
+        if isinstance(run_state, CacheMiss):
+            return run_state
+        run_state = run_state["result"]
+        run_id = str(run_state["run_id"])
+        topology = await self.get_cache(self._graph_state_key(key, run_id, "topology"))
+        if isinstance(topology, CacheMiss):
+            return topology
+        topology = topology["result"]
+        graph = Graph.from_payload(
+            topology["raw_graph_data"],
+            flow_id=topology["flow_id"],
+            flow_name=topology["flow_name"],
+            user_id=topology["user_id"],
+        )
+        graph.set_run_state(run_state)
+        for vertex_id in run_state["built_vertices"]:
+            vertex_state = await self.get_cache(self._graph_state_key(key, run_id, vertex_id))
+            if isinstance(vertex_state, CacheMiss):
+                return vertex_state
+            graph.get_vertex(vertex_id).set_build_state(vertex_state["result"])
+        self._cached_topologies[key, run_id] = True
+        return graph
+
+    async def clear_graph_state(self, key: str) -> None:
+        """Clear a graph cached with `set_graph_state`.
+
+        Args:
+            key (str): The flow ID (or run ID for graphs without a flow) the graph was cached for.
+        """
+        if self.caches_graph_references:
+            await self.clear_cache(key)
+            return
+        run_state = await self.get_cache(self._graph_state_key(key))
+        if isinstance(run_state, CacheMiss):
+            return
+        run_id = str(run_state["result"]["run_id"])
+        for part in ["topology", *run_state["result"]["built_vertices"]]:
+            await self.clear_cache(self._graph_state_key(key, run_id, part))
+        self._cached_topologies.pop((key, run_id), None)
+        await self.clear_cache(self._graph_state_key(key))
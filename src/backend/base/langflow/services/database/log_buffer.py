@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from typing import TYPE_CHECKING
+
+from lfx.log.logger import logger
+from lfx.services.deps import session_scope
+
+from langflow.services.database.models.transactions.crud import delete_old_transactions, log_transactions
+from langflow.services.database.models.vertex_builds.crud import delete_old_vertex_builds, log_vertex_builds
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from langflow.services.database.models.transactions.model import TransactionBase
+    from langflow.services.database.models.vertex_builds.model import VertexBuildBase
+
+
+class DatabaseLogBuffer:
+    """Write-behind buffer for transactions and vertex builds.
+
+    Records are written in batches, as soon as `batch_size` records are buffered or at the latest
+    every `flush_interval` seconds. Old records are deleted every `retention_interval` seconds,
+    only for the flows and vertices that got new records, instead of on every insert.
+
+    The background task is started by the first record added, and `stop` writes what is left.
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 1.0, retention_interval: float = 60.0) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_interval = retention_interval
+        self._transactions: list[TransactionBase] = []
+        self._vertex_builds: list[VertexBuildBase] = []
+        # Flows and vertices written to since old records were last deleted
+        self._written_flow_ids: set[UUID] = set()
+        self._written_vertices: set[tuple[UUID, str]] = set()
+        self._last_retention = time.monotonic()
+        self._flush_event: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._transactions) + len(self._vertex_builds)
+
+    def add_transaction(self, transaction: TransactionBase) -> None:
+        self._transactions.append(transaction)
+        self._on_add()
+
+    def add_vertex_build(self, vertex_build: VertexBuildBase) -> None:
+        self._vertex_builds.append(vertex_build)
+        self._on_add()
+
+    def _on_add(self) -> None:
+        loop = asyncio.get_running_loop()
+        # The task is bound to the loop it was created in, so it is recreated if the loop changed
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._stopping = False
+            self._flush_event = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        if len(self) >= self.batch_size:
+            self._flush_event.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.flush_interval)
+            self._flush_event.clear()
+            await self.flush()
+            if time.monotonic() - self._last_retention >= self.retention_interval:
+                await self.delete_old_records()
+
+    async def flush(self) -> None:
+        """Write all buffered records to the database."""
+        transactions, self._transactions = self._transactions, []
+        vertex_builds, self._vertex_builds = self._vertex_builds, []
+        if not transactions and not vertex_builds:
+            return
+        try:
+            async with session_scope() as session:
+                if transactions:
+                    await log_transactions(session, transactions)
+                if vertex_builds:
+                    await log_vertex_builds(session, vertex_builds)
+        except Exception:  # noqa: BLE001
+            await logger.aexception(
+                f"Error writing {len(transactions)} transactions and {len(vertex_builds)} vertex builds"
+            )
+            return
+        self._written_flow_ids.update(transaction.flow_id for transaction in transactions if transaction.flow_id)
+        self._written_vertices.update((vertex_build.flow_id, vertex_build.id) for vertex_build in vertex_builds)
+
+    async def delete_old_records(self) -> None:
+        """Delete old transactions and vertex builds of the flows and vertices written to since the last call."""
+        flow_ids, self._written_flow_ids = self._written_flow_ids, set()
+        vertices, self._written_vertices = self._written_vertices, set()
+        self._last_retention = time.monotonic()
+        if not flow_ids and not vertices:
+            return
+        try:
+            async with session_scope() as session:
+                if flow_ids:
+                    await delete_old_transactions(session, flow_ids)
+                if vertices:
+                    await delete_old_vertex_builds(session, vertices)
+        except Exception:  # noqa: BLE001
+            await logger.aexception("Error deleting old transactions and vertex builds")
+
+    async def stop(self) -> None:
+        """Stop the background task and write the remaining records."""
+        if self._task is not None and not self._task.done():
+            if self._task.get_loop() is asyncio.get_running_loop():
+                self._stopping = True
+                self._flush_event.set()
+                await self._task
+            else:
+                self._task.cancel()
+        self._task = None
+        await self.flush()
+        await self.delete_old_records()
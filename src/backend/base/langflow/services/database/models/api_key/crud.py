@@ -1,9 +1,14 @@
 import datetime
+import hashlib
 import os
 import secrets
-from typing import TYPE_CHECKING
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
 from uuid import UUID
 
+from cachetools import TTLCache
+from sqlalchemy import bindparam, update
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -15,6 +20,51 @@ from langflow.services.deps import get_settings_service
 if TYPE_CHECKING:
     from sqlmodel.sql.expression import SelectOfScalar
 
+API_KEY_CACHE_MAX_SIZE = 4096
+
+
+class CachedApiKey(NamedTuple):
+    """A validated API key and the column values of its user."""
+
+    api_key_id: UUID
+    user_id: UUID
+    user: dict[str, Any]
+
+
+# Validated API keys keyed by their SHA-256 digest, see `_check_key_from_db`
+_api_key_cache: TTLCache[str, CachedApiKey] | None = None
+# Uses and last use of each API key not written to the database yet, see `_record_api_key_usage`
+_api_key_usage: dict[UUID, tuple[int, datetime.datetime]] = {}
+_api_key_usage_flushed_at = 0.0
+_api_key_lock = threading.Lock()
+
+
+def _get_api_key_cache(settings_service) -> TTLCache[str, CachedApiKey] | None:
+    global _api_key_cache  # noqa: PLW0603
+    ttl = settings_service.settings.api_key_cache_ttl
+    if ttl <= 0:
+        return None
+    with _api_key_lock:
+        if _api_key_cache is None or _api_key_cache.ttl != ttl:
+            _api_key_cache = TTLCache(maxsize=API_KEY_CACHE_MAX_SIZE, ttl=ttl)
+        return _api_key_cache
+
+
+def invalidate_api_key_cache(*, api_key_id: UUID | str | None = None, user_id: UUID | str | None = None) -> None:
+    """Drop the cached API keys with the given ID, or that belong to the given user."""
+    with _api_key_lock:
+        if _api_key_cache is None:
+            return
+        for digest, cached in list(_api_key_cache.items()):
+            if str(cached.api_key_id) == str(api_key_id) or str(cached.user_id) == str(user_id):
+                _api_key_cache.pop(digest, None)
+
+
+def clear_api_key_cache() -> None:
+    with _api_key_lock:
+        if _api_key_cache is not None:
+            _api_key_cache.clear()
+
 
 async def get_api_keys(session: AsyncSession, user_id: UUID) -> list[ApiKeyRead]:
     query: SelectOfScalar = select(ApiKey).where(ApiKey.user_id == user_id)
@@ -47,6 +97,7 @@ async def delete_api_key(session: AsyncSession, api_key_id: UUID) -> None:
         msg = "API Key not found"
         raise ValueError(msg)
     await session.delete(api_key)
+    invalidate_api_key_cache(api_key_id=api_key_id)
 
 
 async def check_key(session: AsyncSession, api_key: str) -> User | None:
@@ -69,17 +120,75 @@ async def check_key(session: AsyncSession, api_key: str) -> User | None:
 
 
 async def _check_key_from_db(session: AsyncSession, api_key: str, settings_service) -> User | None:
-    """Validate API key against the database."""
-    query: SelectOfScalar = select(ApiKey).options(selectinload(ApiKey.user)).where(ApiKey.api_key == api_key)
-    api_key_object: ApiKey | None = (await session.exec(query)).first()
-    if api_key_object is not None:
-        if settings_service.settings.disable_track_apikey_usage is not True:
-            api_key_object.total_uses += 1
-            api_key_object.last_used_at = datetime.datetime.now(datetime.timezone.utc)
-            session.add(api_key_object)
-            await session.flush()
-        return api_key_object.user
-    return None
+    """Validate API key against the database.
+
+    Validated keys are cached for `api_key_cache_ttl` seconds. On a cache hit the user is rebuilt from the cached
+    column values, so it is not attached to `session`.
+    """
+    if not api_key:
+        return None
+    cache = _get_api_key_cache(settings_service)
+    digest = hashlib.sha256(api_key.encode()).hexdigest()
+    cached: CachedApiKey | None = None
+    if cache is not None:
+        with _api_key_lock:
+            cached = cache.get(digest)
+    if cached is None:
+        query: SelectOfScalar = select(ApiKey).options(selectinload(ApiKey.user)).where(ApiKey.api_key == api_key)
+        api_key_object: ApiKey | None = (await session.exec(query)).first()
+        if api_key_object is None or api_key_object.user is None:
+            return None
+        user = api_key_object.user
+        cached = CachedApiKey(api_key_object.id, api_key_object.user_id, user.model_dump())
+        if cache is not None:
+            with _api_key_lock:
+                cache[digest] = cached
+    else:
+        user = User.model_validate(cached.user)
+    if settings_service.settings.disable_track_apikey_usage is not True:
+        await _record_api_key_usage(session, cached.api_key_id, settings_service)
+    return user
+
+
+async def _record_api_key_usage(session: AsyncSession, api_key_id: UUID, settings_service) -> None:
+    """Count a use of the API key, and write the counted uses of all keys once per flush interval.
+
+    Updating the key row on every request makes it the hottest row of the database under load.
+    """
+    global _api_key_usage_flushed_at  # noqa: PLW0603
+    now = datetime.datetime.now(datetime.timezone.utc)
+    with _api_key_lock:
+        uses, _ = _api_key_usage.get(api_key_id, (0, now))
+        _api_key_usage[api_key_id] = (uses + 1, now)
+        if time.monotonic() - _api_key_usage_flushed_at < settings_service.settings.api_key_usage_flush_interval:
+            return
+        _api_key_usage_flushed_at = time.monotonic()
+    await flush_api_key_usage(session)
+
+
+async def flush_api_key_usage(session: AsyncSession) -> None:
+    """Write the counted uses of API keys to the database in one batched UPDATE."""
+    with _api_key_lock:
+        pending = dict(_api_key_usage)
+        _api_key_usage.clear()
+    if not pending:
+        return
+    table = ApiKey.__table__  # type: ignore[attr-defined]
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("key_id"))
+        .values(total_uses=table.c.total_uses + bindparam("uses"), last_used_at=bindparam("used_at"))
+    )
+    params = [{"key_id": key_id, "uses": uses, "used_at": used_at} for key_id, (uses, used_at) in pending.items()]
+    try:
+        await session.exec(statement, params=params)  # type: ignore[call-overload]
+    except Exception:
+        # Keep the uses for the next flush
+        with _api_key_lock:
+            for key_id, (uses, used_at) in pending.items():
+                new_uses, last_used_at = _api_key_usage.get(key_id, (0, used_at))
+                _api_key_usage[key_id] = (uses + new_uses, max(used_at, last_used_at))
+        raise
 
 
 async def _check_key_from_env(session: AsyncSession, api_key: str, settings_service) -> User | None:
@@ -1,5 +1,6 @@
-from .model import File
+from .model import File, FileBlob
 
 __all__ = [
     "File",
+    "FileBlob",
 ]
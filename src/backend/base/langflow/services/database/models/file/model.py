@@ -17,3 +17,16 @@ class File(SQLModel, table=True):  # type: ignore[call-arg]
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     __table_args__ = (UniqueConstraint("name", "user_id"),)
+
+
+class FileBlob(SQLModel, table=True):  # type: ignore[call-arg]
+    """Content stored once for all the deduplicated files with the same SHA-256 checksum, which point at its path.
+
+    The row of a blob exists while its content is stored. It is locked by the uploads adding a file that points at
+    the blob and by the deletes checking whether any file still does, so they are serialized across workers.
+    """
+
+    __tablename__ = "file_blob"
+
+    path: str = Field(primary_key=True)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
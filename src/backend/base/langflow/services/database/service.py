@@ -8,7 +8,7 @@ import time
 from contextlib import asynccontextmanager, nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import anyio
 import sqlalchemy as sa
@@ -28,7 +28,10 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 from langflow.initial_setup.constants import STARTER_FOLDER_NAME
 from langflow.services.base import Service
 from langflow.services.database import models
+from langflow.services.database.log_buffer import DatabaseLogBuffer
+from langflow.services.database.models.transactions.model import TransactionBase
 from langflow.services.database.models.user.crud import get_user_by_username
+from langflow.services.database.models.vertex_builds.model import VertexBuildBase
 from langflow.services.database.session import NoopSession
 from langflow.services.database.utils import Result, TableResults
 from langflow.services.deps import get_settings_service
@@ -73,6 +76,12 @@ class DatabaseService(Service):
             expire_on_commit=False,
         )
 
+        self.log_buffer = DatabaseLogBuffer(
+            batch_size=self.settings_service.settings.db_log_batch_size,
+            flush_interval=self.settings_service.settings.db_log_flush_interval,
+            retention_interval=self.settings_service.settings.db_log_retention_interval,
+        )
+
         # Check if Alembic should log to stdout or a file.
         # If file, check if the provided path is absolute, cross-platform.
         alembic_log_file = self.settings_service.settings.alembic_log_file
@@ -222,6 +231,14 @@ class DatabaseService(Service):
             async with self.async_session_maker() as session:
                 yield session
 
+    async def log_transaction(self, **transaction: Any) -> None:
+        """Buffer a transaction to be written to the database in the next batch."""
+        self.log_buffer.add_transaction(TransactionBase(**transaction))
+
+    async def log_vertex_build(self, **vertex_build: Any) -> None:
+        """Buffer a vertex build to be written to the database in the next batch."""
+        self.log_buffer.add_vertex_build(VertexBuildBase(**vertex_build))
+
     async def assign_orphaned_flows_to_superuser(self) -> None:
         """Assign orphaned flows to the default superuser when auto login is enabled."""
         settings_service = get_settings_service()
@@ -503,6 +520,10 @@ class DatabaseService(Service):
 
     async def teardown(self) -> None:
         await logger.adebug("Tearing down database")
+        try:
+            await self.log_buffer.stop()
+        except Exception:  # noqa: BLE001
+            await logger.aexception("Error writing buffered transactions and vertex builds")
         try:
             settings_service = get_settings_service()
             # remove the default superuser if auto_login is enabled
@@ -0,0 +1,287 @@
+"""Storage of the events of build jobs.
+
+The events of a job are appended to an ordered log by the worker running the job, and read from it by any
+worker, so event polling doesn't need sticky sessions when the log is shared, like with Redis streams.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+class JobEvent(NamedTuple):
+    """An event of a job. `data` is None for the end of the stream."""
+
+    id: str
+    data: bytes | None
+    type: str | None = None
+
+
+class JobEventsExpiredError(Exception):
+    """Raised when events after the requested offset were already dropped from the event log of a job."""
+
+    def __init__(self, job_id: str, offset: str) -> None:
+        self.job_id = job_id
+        self.offset = offset
+        super().__init__(f"Events after {offset} of job_id {job_id} are no longer available")
+
+
+class JobEventBackend(ABC):
+    """Ordered, append-only event log of each job.
+
+    Events are read in two ways: `read(job_id)` consumes them, so each event is returned once, to any
+    reader, which matches event polling, and `read(job_id, offset)` returns the events after `offset`
+    without consuming them, to let a client that reconnects replay what it missed.
+    """
+
+    @abstractmethod
+    async def create(self, job_id: str) -> None:
+        """Create the event log of a job. Does nothing if it exists."""
+
+    @abstractmethod
+    async def append(self, job_id: str, events: Sequence[tuple[str | None, bytes | None]]) -> list[str]:
+        """Append `(type, data)` events to the log of a job and return their IDs. None data ends the stream."""
+
+    @abstractmethod
+    async def read(self, job_id: str, offset: str | None = None, *, timeout: float = 0) -> list[JobEvent]:
+        """Return the next events of a job, waiting up to `timeout` seconds for one if there are none.
+
+        Without `offset`, the returned events are consumed. With it, the events after the event with that ID
+        are returned, and the log is left as is.
+
+        Raises:
+            JobEventsExpiredError: If some of the events after `offset` were dropped from the log.
+        """
+
+    @abstractmethod
+    async def exists(self, job_id: str) -> bool:
+        """Whether the event log of a job exists."""
+
+    @abstractmethod
+    async def delete(self, job_id: str) -> None:
+        """Delete the event log of a job."""
+
+    async def wait_for_readers(self, job_id: str, max_pending: int) -> None:  # noqa: B027
+        """Wait until fewer than `max_pending` events of a job were not read yet.
+
+        Backends that don't keep the events in the memory of the worker don't need readers to keep up, and
+        return right away.
+        """
+
+    async def close(self) -> None:  # noqa: B027
+        """Release the resources of the backend."""
+
+
+class _InMemoryLog:
+    def __init__(self) -> None:
+        self.events: list[tuple[str | None, bytes | None]] = []
+        # Position of the first event kept, the ones before it were dropped
+        self.start = 0
+        self.cursor = 0
+        # Position after the last event returned by any read, consuming or not
+        self.delivered = 0
+        self.changed = asyncio.Event()
+        self.read = asyncio.Event()
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.events)
+
+
+class InMemoryJobEventBackend(JobEventBackend):
+    """Keeps the events of each job in the memory of this worker. Event IDs are their positions in the log.
+
+    Only the last `max_events` events of each job are kept, 0 keeps all of them. They are kept until the job is
+    cleaned up, whether or not they were read, on top of the unread events in the queue of the job.
+    """
+
+    def __init__(self, max_events: int = 0) -> None:
+        self._logs: dict[str, _InMemoryLog] = {}
+        self.max_events = max_events
+
+    async def create(self, job_id: str) -> None:
+        self._logs.setdefault(job_id, _InMemoryLog())
+
+    async def append(self, job_id: str, events: Sequence[tuple[str | None, bytes | None]]) -> list[str]:
+        log = self._logs.setdefault(job_id, _InMemoryLog())
+        start = log.end
+        log.events.extend(events)
+        if self.max_events and len(log.events) > self.max_events:
+            dropped = len(log.events) - self.max_events
+            del log.events[:dropped]
+            log.start += dropped
+        log.changed.set()
+        return [str(index) for index in range(start, log.end)]
+
+    async def read(self, job_id: str, offset: str | None = None, *, timeout: float = 0) -> list[JobEvent]:
+        log = self._logs.get(job_id)
+        if log is None:
+            return []
+        position = log.cursor if offset is None else int(offset) + 1
+        if position >= log.end and timeout > 0:
+            log.changed.clear()
+            try:
+                await asyncio.wait_for(log.changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+            if self._logs.get(job_id) is not log:
+                return []
+        if offset is not None and position < log.start:
+            raise JobEventsExpiredError(job_id, offset)
+        position = max(position, log.start)
+        events = [
+            JobEvent(str(index), data, event_type)
+            for index, (event_type, data) in enumerate(log.events[position - log.start :], start=position)
+        ]
+        if offset is None:
+            log.cursor = log.end
+        if events:
+            log.delivered = max(log.delivered, log.end)
+            log.read.set()
+        return events
+
+    async def wait_for_readers(self, job_id: str, max_pending: int) -> None:
+        log = self._logs.get(job_id)
+        while (
+            log is not None and self._logs.get(job_id) is log and log.end - max(log.delivered, log.start) >= max_pending
+        ):
+            log.read.clear()
+            await log.read.wait()
+
+    async def exists(self, job_id: str) -> bool:
+        return job_id in self._logs
+
+    async def delete(self, job_id: str) -> None:
+        log = self._logs.pop(job_id, None)
+        if log is not None:
+            # Wake up the readers waiting for events, and the writer waiting for readers
+            log.changed.set()
+            log.read.set()
+
+
+class RedisJobEventBackend(JobEventBackend):
+    """Keeps the events of each job in a Redis stream, shared by all workers.
+
+    Events are consumed through a consumer group of the stream, so each event is returned to one reader,
+    whichever worker it polls. Streams expire `expiration_time` seconds after their last event, and are trimmed
+    to about their last `max_events` events, 0 keeps all of them.
+    """
+
+    GROUP_NAME = "langflow"
+    END_FIELD = b"end"
+    DATA_FIELD = b"data"
+    TYPE_FIELD = b"type"
+
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        url=None,
+        expiration_time=60 * 60,
+        prefix="langflow:job_events:",
+        max_events=0,
+        client: Any = None,
+    ) -> None:
+        if client is None:
+            # Redis is a main dependency, no need to import check
+            from redis.asyncio import StrictRedis
+
+            client = StrictRedis.from_url(url) if url else StrictRedis(host=host, port=port, db=db)
+        self._client = client
+        self.expiration_time = expiration_time
+        self.prefix = prefix
+        self.max_events = max_events
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}{job_id}"
+
+    async def create(self, job_id: str) -> None:
+        from redis.exceptions import ResponseError
+
+        key = self._key(job_id)
+        try:
+            await self._client.xgroup_create(key, self.GROUP_NAME, id="0", mkstream=True)
+        except ResponseError as exc:
+            # The group exists already
+            if "BUSYGROUP" not in str(exc):
+                raise
+        await self._client.expire(key, self.expiration_time)
+
+    async def append(self, job_id: str, events: Sequence[tuple[str | None, bytes | None]]) -> list[str]:
+        key = self._key(job_id)
+        async with self._client.pipeline(transaction=False) as pipe:
+            for event_type, data in events:
+                if data is None:
+                    fields = {self.END_FIELD: b""}
+                else:
+                    fields = {self.DATA_FIELD: data}
+                    if event_type:
+                        fields[self.TYPE_FIELD] = event_type
+                pipe.xadd(
+                    key,
+                    fields,
+                    maxlen=self.max_events or None,
+                    approximate=True,
+                )
+            pipe.expire(key, self.expiration_time)
+            results = await pipe.execute()
+        return [_decode(event_id) for event_id in results[:-1]]
+
+    async def read(self, job_id: str, offset: str | None = None, *, timeout: float = 0) -> list[JobEvent]:
+        key = self._key(job_id)
+        block = int(timeout * 1000) or None
+        if offset is None:
+            response = await self._client.xreadgroup(self.GROUP_NAME, "reader", {key: ">"}, block=block, noack=True)
+        else:
+            await self._check_not_trimmed(job_id, key, offset)
+            response = await self._client.xread({key: offset}, block=block)
+        events = []
+        for _stream, entries in response or []:
+            for event_id, fields in entries:
+                event_type = fields.get(self.TYPE_FIELD)
+                data = fields.get(self.DATA_FIELD)
+                events.append(JobEvent(_decode(event_id), data, None if event_type is None else _decode(event_type)))
+        return events
+
+    async def _check_not_trimmed(self, job_id: str, key: str, offset: str) -> None:
+        """Raise JobEventsExpiredError if events after `offset` were trimmed from the stream."""
+        from redis.exceptions import ResponseError
+
+        try:
+            info = await self._client.xinfo_stream(key)
+        except ResponseError:
+            # The stream doesn't exist
+            return
+        if (last_trimmed := info.get("max-deleted-entry-id")) is not None:
+            trimmed = _stream_id(last_trimmed) > _stream_id(offset)
+        else:
+            # Before Redis 7, only the first entry tells what was trimmed, so the event at `offset` being gone
+            # counts as a gap
+            first_entry = info.get("first-entry")
+            trimmed = first_entry is not None and _stream_id(first_entry[0]) > _stream_id(offset)
+        if trimmed:
+            raise JobEventsExpiredError(job_id, offset)
+
+    async def exists(self, job_id: str) -> bool:
+        return bool(await self._client.exists(self._key(job_id)))
+
+    async def delete(self, job_id: str) -> None:
+        await self._client.delete(self._key(job_id))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _stream_id(value: bytes | str) -> tuple[int, int]:
+    milliseconds, _, sequence = _decode(value).partition("-")
+    return int(milliseconds), int(sequence or 0)
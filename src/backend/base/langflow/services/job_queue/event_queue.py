@@ -0,0 +1,159 @@
+"""Bounded queue of the events of a build job.
+
+The events of a build are produced synchronously by its EventManager, with `put_nowait`, so a full queue can't
+make producers wait. Instead, once the queue holds `max_size` events, its overflow policy decides what happens
+to new token events, which make up most of the events of streamed messages:
+
+- "coalesce_tokens" merges them into the last queued token event of the same message.
+- "drop_tokens" drops them.
+- "block" keeps them, and the build waits for space before building its next component.
+
+Other events, like the end of a component build or the end of the stream, are always kept, so clients never
+miss the structure of a build.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Literal
+
+import orjson
+
+OverflowPolicy = Literal["block", "drop_tokens", "coalesce_tokens"]
+
+
+def _is_token(item: tuple[Any, bytes | None, float]) -> bool:
+    event_id = item[0]
+    return isinstance(event_id, str) and event_id.startswith("token-")
+
+
+def get_event_type(event_id: Any) -> str | None:
+    """Return the type of an event from its ID, `{event_type}-{uuid}`, or `token-{n}` for token events."""
+    if not isinstance(event_id, str):
+        return None
+    return event_id.partition("-")[0] or None
+
+
+class _TokenMerge:
+    """Chunks of the token events merged into a queued token event, joined when it is dequeued."""
+
+    __slots__ = ("chunks", "event", "size")
+
+    def __init__(self, event: dict) -> None:
+        self.event = event
+        self.chunks: list[str] = [event["data"]["chunk"]]
+        self.size = 0
+
+
+class JobEventQueue(asyncio.Queue):
+    """Queue of `(event_id, data, timestamp)` items, bounded to `max_size` events by its overflow policy.
+
+    `max_size` 0 makes the queue unbounded. `block_timeout` is the time in seconds a build waits for space with
+    the "block" policy before failing, so builds whose client is gone don't wait forever.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 0,
+        overflow_policy: OverflowPolicy = "coalesce_tokens",
+        block_timeout: float = 300,
+    ) -> None:
+        # Bounded by the overflow policy, not by asyncio, which would raise on put_nowait
+        super().__init__()
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.pending_bytes = 0
+        self.max_pending_bytes = 0
+        self.dropped_events = 0
+        self.coalesced_events = 0
+        # Token events merged into a queued token event, by `id` of the queued item
+        self._merges: dict[int, _TokenMerge] = {}
+        self._space = asyncio.Event()
+
+    def is_over_limit(self) -> bool:
+        """Whether the queue holds `max_size` events or more."""
+        return bool(self.max_size) and self.qsize() >= self.max_size
+
+    def put_nowait(self, item) -> None:
+        if self.is_over_limit() and _is_token(item):
+            if self.overflow_policy == "coalesce_tokens":
+                if self._coalesce(item):
+                    return
+            elif self.overflow_policy == "drop_tokens":
+                self.dropped_events += 1
+                return
+        super().put_nowait(item)
+
+    async def wait_for_space(self) -> None:
+        """With the "block" policy, wait until the queue is under its limit.
+
+        Raises:
+            TimeoutError: If there was no space for `block_timeout` seconds.
+        """
+        if self.overflow_policy != "block":
+            return
+        while self.is_over_limit():
+            self._space.clear()
+            try:
+                await asyncio.wait_for(self._space.wait(), self.block_timeout)
+            except asyncio.TimeoutError as exc:
+                msg = f"No client read the events of the build for {self.block_timeout} seconds"
+                raise TimeoutError(msg) from exc
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        """Size of the queue and what its overflow policy did."""
+        return {
+            "pending_events": self.qsize(),
+            "pending_bytes": self.pending_bytes,
+            "max_pending_bytes": self.max_pending_bytes,
+            "dropped_events": self.dropped_events,
+            "coalesced_events": self.coalesced_events,
+        }
+
+    def _coalesce(self, item: tuple[Any, bytes, float]) -> bool:
+        """Merge a token event into the last queued event, if it is a token event of the same message.
+
+        The chunks are only joined when the merged event is dequeued, so each token event is parsed once.
+        """
+        if not self._queue or not _is_token(self._queue[-1]):
+            return False
+        last = self._queue[-1]
+        merge = self._merges.get(id(last))
+        if merge is None:
+            last_event = orjson.loads(last[1])
+            if not isinstance(last_event["data"].get("chunk"), str):
+                return False
+            merge = _TokenMerge(last_event)
+        event = orjson.loads(item[1])
+        chunk = event["data"].get("chunk")
+        if not isinstance(chunk, str) or merge.event["data"].get("id") != event["data"].get("id"):
+            return False
+        self._merges[id(last)] = merge
+        merge.chunks.append(chunk)
+        size = len(chunk.encode())
+        merge.size += size
+        self._track(size)
+        self.coalesced_events += 1
+        return True
+
+    def _track(self, size: int) -> None:
+        self.pending_bytes += size
+        self.max_pending_bytes = max(self.max_pending_bytes, self.pending_bytes)
+
+    def _put(self, item) -> None:
+        super()._put(item)
+        self._track(len(item[1] or b""))
+
+    def _get(self):
+        item = super()._get()
+        self._track(-len(item[1] or b""))
+        merge = self._merges.pop(id(item), None)
+        if merge is not None:
+            self._track(-merge.size)
+            merge.event["data"]["chunk"] = "".join(merge.chunks)
+            item = (item[0], orjson.dumps(merge.event) + b"\n\n", item[2])
+        if not self.is_over_limit():
+            self._space.set()
+        return item
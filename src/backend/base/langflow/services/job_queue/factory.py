@@ -1,11 +1,42 @@
-from langflow.services.base import Service
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from typing_extensions import override
+
 from langflow.services.factory import ServiceFactory
+from langflow.services.job_queue.backends import (
+    InMemoryJobEventBackend,
+    JobEventBackend,
+    RedisJobEventBackend,
+)
 from langflow.services.job_queue.service import JobQueueService
 
+if TYPE_CHECKING:
+    from lfx.services.settings.service import SettingsService
+
 
 class JobQueueServiceFactory(ServiceFactory):
     def __init__(self):
         super().__init__(JobQueueService)
 
-    def create(self) -> Service:
-        return JobQueueService()
+    @override
+    def create(self, settings_service: SettingsService):
+        settings = settings_service.settings
+        backend: JobEventBackend
+        if settings.job_queue_type == "redis":
+            backend = RedisJobEventBackend(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                url=settings.redis_url,
+                expiration_time=settings.redis_job_queue_expire,
+                max_events=settings.job_events_replay_size,
+            )
+        else:
+            backend = InMemoryJobEventBackend(max_events=settings.job_events_replay_size)
+        return JobQueueService(
+            backend=backend,
+            max_queue_size=settings.job_queue_max_size,
+            overflow_policy=settings.job_queue_overflow_policy,
+        )
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import re
+import time
 
 from lfx.log.logger import logger
 
 from langflow.events.event_manager import EventManager
 from langflow.services.base import Service
+from langflow.services.job_queue.backends import InMemoryJobEventBackend, JobEvent, JobEventBackend
+from langflow.services.job_queue.event_queue import JobEventQueue, OverflowPolicy, get_event_type
+
+# Seconds a read waits for new events before checking that the job still exists
+EVENT_READ_TIMEOUT = 5.0
+# IDs of the events of all backends: positions in the log, or Redis stream IDs
+EVENT_ID_PATTERN = re.compile(r"\d+(-\d+)?")
 
 
 class JobQueueNotFoundError(Exception):
@@ -25,6 +34,15 @@ class JobQueueService(Service):
       - Launch and manage asynchronous tasks that process these job queues.
       - Safely clean up resources by cancelling active tasks and emptying queues.
       - Automatically perform periodic cleanup of inactive or completed job queues.
+      - Read the events of a job from any worker, when the event backend is shared.
+
+    The EventManager of a job puts its events on the job's asyncio queue, and a forwarding task of the worker
+    running the job appends them to the job's event log in the `JobEventBackend`. Events are read from the
+    backend, so with `RedisJobEventBackend` any worker can serve the events of a job.
+
+    With `max_queue_size`, the forwarding task waits for the readers of a job when `max_queue_size` of its events
+    were not read yet, and the queue of the job holds up to `max_queue_size` events, past which its
+    `overflow_policy` applies, so jobs whose client stops reading don't grow without bounds.
 
     The cleanup process follows a two-phase approach:
       1. When a task is cancelled or fails, it is marked for cleanup by setting a timestamp
@@ -39,6 +57,9 @@ class JobQueueService(Service):
               * The associated EventManager instance.
               * The asyncio.Task processing the job (if any).
               * The cleanup timestamp (if any).
+        _forwarders (dict[str, asyncio.Task]): Tasks forwarding the events of each job to the backend.
+        _logs_created (dict[str, asyncio.Event]): Set once the event log of each job exists in the backend.
+        _backend (JobEventBackend): Event log of the jobs.
         _cleanup_task (asyncio.Task | None): Background task for periodic cleanup.
         _closed (bool): Flag indicating whether the service is currently active.
         CLEANUP_GRACE_PERIOD (int): Number of seconds to wait after a task is marked for cleanup
@@ -61,13 +82,28 @@ class JobQueueService(Service):
 
     name = "job_queue_service"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        backend: JobEventBackend | None = None,
+        max_queue_size: int = 0,
+        overflow_policy: OverflowPolicy = "coalesce_tokens",
+    ) -> None:
         """Initialize the JobQueueService.
 
         Sets up the internal registry for job queues, initializes the cleanup task, and sets the service state
         to active.
+
+        Args:
+            backend (JobEventBackend | None): Event log of the jobs. Defaults to an in-memory log.
+            max_queue_size (int): Maximum number of events of a job not read yet, 0 for no limit.
+            overflow_policy (OverflowPolicy): What to do with the token events of a job past `max_queue_size`.
         """
         self._queues: dict[str, tuple[asyncio.Queue, EventManager, asyncio.Task | None, float | None]] = {}
+        self._forwarders: dict[str, asyncio.Task] = {}
+        self._logs_created: dict[str, asyncio.Event] = {}
+        self._backend: JobEventBackend = backend or InMemoryJobEventBackend()
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
         self._cleanup_task: asyncio.Task | None = None
         self._closed = False
         self.ready = False
@@ -117,6 +153,7 @@ class JobQueueService(Service):
         # Clean up each registered job queue.
         for job_id in list(self._queues.keys()):
             await self.cleanup_job(job_id)
+        await self._backend.close()
         await logger.adebug("JobQueueService stopped: all job queues have been cleaned up.")
 
     async def teardown(self) -> None:
@@ -142,11 +179,14 @@ class JobQueueService(Service):
             msg = f"Queue for job_id {job_id} already exists"
             raise ValueError(msg)
 
-        main_queue: asyncio.Queue = asyncio.Queue()
+        # Builds waiting for space fail after the grace period their job would be cleaned up after
+        main_queue = JobEventQueue(self.max_queue_size, self.overflow_policy, block_timeout=self.CLEANUP_GRACE_PERIOD)
         event_manager: EventManager = self._create_default_event_manager(main_queue)
 
         # Register the queue without an active task.
         self._queues[job_id] = (main_queue, event_manager, None, None)
+        self._logs_created[job_id] = asyncio.Event()
+        self._forwarders[job_id] = asyncio.create_task(self._forward_events(job_id, main_queue))
         logger.debug(f"Queue and event manager successfully created for job_id {job_id}")
         return main_queue, event_manager
 
@@ -182,6 +222,13 @@ class JobQueueService(Service):
         # Initiate the new asynchronous task.
         task = asyncio.create_task(task_coro)
         self._queues[job_id] = (main_queue, event_manager, task, None)
+
+        def end_stream(_task: asyncio.Task) -> None:
+            # End the event stream of jobs that failed or were cancelled too, so readers stop waiting
+            if self._queues.get(job_id, (None, None, None))[2] is task:
+                main_queue.put_nowait((None, None, time.time()))
+
+        task.add_done_callback(end_stream)
         logger.debug(f"New task started for job_id {job_id}")
 
     def get_queue_data(self, job_id: str) -> tuple[asyncio.Queue, EventManager, asyncio.Task | None, float | None]:
@@ -208,6 +255,81 @@ class JobQueueService(Service):
         except KeyError as exc:
             raise JobQueueNotFoundError(job_id) from exc
 
+    def get_queue_metrics(self, job_id: str) -> dict[str, int]:
+        """Return the size of the queue of a job, and how many events its overflow policy dropped or coalesced.
+
+        Raises:
+            JobQueueNotFoundError: If the job_id is not found.
+        """
+        main_queue = self.get_queue_data(job_id)[0]
+        return main_queue.metrics if isinstance(main_queue, JobEventQueue) else {"pending_events": main_queue.qsize()}
+
+    def get_job_task(self, job_id: str) -> asyncio.Task | None:
+        """Return the task of a job, if it runs on this worker."""
+        return self._queues[job_id][2] if job_id in self._queues else None
+
+    async def job_exists(self, job_id: str) -> bool:
+        """Whether the job exists, on this worker or, with a shared backend, on any worker."""
+        return job_id in self._queues or await self._backend.exists(job_id)
+
+    async def get_events(self, job_id: str, offset: str | None = None, *, wait: bool = True) -> list[JobEvent]:
+        """Read the next events of a job from the event backend.
+
+        Args:
+            job_id (str): Unique identifier for the job.
+            offset (str | None): ID of the last event the caller received. Without it, the events are
+                consumed, so each of them is returned once.
+            wait (bool): Whether to wait for an event if there are none.
+
+        Returns:
+            list[JobEvent]: The events, in order. An event without data ends the stream.
+
+        Raises:
+            JobQueueNotFoundError: If the job doesn't exist, or was cleaned up while waiting.
+            JobEventsExpiredError: If some of the events after `offset` are no longer kept.
+            RuntimeError: If the service is closed.
+            ValueError: If the offset is not an event ID.
+        """
+        if offset is not None and not EVENT_ID_PATTERN.fullmatch(offset):
+            msg = f"Invalid event ID: {offset}"
+            raise ValueError(msg)
+        while True:
+            if self._closed:
+                msg = f"Queue service is closed for job_id: {job_id}"
+                raise RuntimeError(msg)
+            if not await self.job_exists(job_id):
+                raise JobQueueNotFoundError(job_id)
+            if (log_created := self._logs_created.get(job_id)) is not None:
+                await log_created.wait()
+            events = await self._backend.read(job_id, offset, timeout=EVENT_READ_TIMEOUT if wait else 0)
+            if events or not wait:
+                return events
+
+    async def _forward_events(self, job_id: str, queue: asyncio.Queue) -> None:
+        """Append the events put on the queue of a job to its event log, until the end of the stream."""
+        try:
+            await self._backend.create(job_id)
+        finally:
+            self._logs_created[job_id].set()
+        while True:
+            if self.max_queue_size:
+                # Leave the events in the queue, where its overflow policy applies, until readers catch up
+                await self._backend.wait_for_readers(job_id, self.max_queue_size)
+            items = [await queue.get()]
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            # The type of each event is kept with it, so readers don't parse events to get it
+            events = [(get_event_type(event_id), value) for event_id, value, _ in items]
+            ends = [index for index, (_, value) in enumerate(events) if value is None]
+            if ends:
+                events = events[: ends[0] + 1]
+            try:
+                await self._backend.append(job_id, events)
+            except Exception as exc:  # noqa: BLE001
+                await logger.aerror(f"Error forwarding {len(events)} events of job_id {job_id}: {exc}")
+            if events[-1][1] is None:
+                return
+
     async def cleanup_job(self, job_id: str) -> None:
         """Clean up and release resources for a specific job.
 
@@ -237,6 +359,12 @@ class JobQueueService(Service):
                 await logger.aerror(f"Error in task for job_id {job_id}: {exc}")
             await logger.adebug(f"Task cancellation complete for job_id {job_id}")
 
+        forwarder = self._forwarders.pop(job_id, None)
+        self._logs_created.pop(job_id, None)
+        if forwarder and not forwarder.done():
+            forwarder.cancel()
+            await asyncio.wait([forwarder])
+
         # Clear the queue since we just cancelled the task or it has completed
         items_cleared = 0
         while not main_queue.empty():
@@ -247,8 +375,11 @@ class JobQueueService(Service):
                 break
 
         await logger.adebug(f"Removed {items_cleared} items from queue for job_id {job_id}")
-        # Remove the job entry from the registry
+        if isinstance(main_queue, JobEventQueue) and (main_queue.dropped_events or main_queue.coalesced_events):
+            await logger.ainfo(f"Readers of job_id {job_id} fell behind, its queue metrics: {main_queue.metrics}")
+        # Remove the job entry from the registry and its event log
         self._queues.pop(job_id, None)
+        await self._backend.delete(job_id)
         await logger.adebug(f"Cleanup successful for job_id {job_id}: resources have been released.")
 
     async def _periodic_cleanup(self) -> None:
@@ -284,8 +415,9 @@ class JobQueueService(Service):
                     f"Has exception: {task.exception() is not None if task.done() else 'N/A'}"
                 )
 
-                # Check if task should be marked for cleanup
-                if task and (task.cancelled() or (task.done() and task.exception() is not None)):
+                # Check if task should be marked for cleanup. Finished jobs are cleaned up too, since their
+                # event log is kept until then
+                if task.done():
                     if cleanup_time is None:
                         # Mark for cleanup by setting the timestamp
                         self._queues[job_id] = (
@@ -294,9 +426,7 @@ class JobQueueService(Service):
                             self._queues[job_id][2],
                             current_time,
                         )
-                        await logger.adebug(
-                            f"Job queue for job_id {job_id} marked for cleanup - Task cancelled or failed"
-                        )
+                        await logger.adebug(f"Job queue for job_id {job_id} marked for cleanup - Task finished")
                     elif current_time - cleanup_time >= self.CLEANUP_GRACE_PERIOD:
                         # Enough time has passed, perform the actual cleanup
                         await logger.adebug(f"Cleaning up job_id {job_id} after grace period")
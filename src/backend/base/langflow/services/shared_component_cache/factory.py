@@ -15,4 +15,7 @@ class SharedComponentCacheServiceFactory(ServiceFactory):
 
     @override
     def create(self, settings_service: "SettingsService"):
-        return SharedComponentCacheService(expiration_time=settings_service.settings.cache_expire)
+        return SharedComponentCacheService(
+            expiration_time=settings_service.settings.cache_expire,
+            sweep_interval=settings_service.settings.cache_sweep_interval or None,
+        )
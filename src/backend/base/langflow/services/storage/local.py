@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import contextlib
+import uuid
 from typing import TYPE_CHECKING
 
 from aiofile import async_open
@@ -10,6 +12,8 @@ from langflow.logging.logger import logger
 from langflow.services.storage.service import StorageService
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator
+
     from langflow.services.session.service import SessionService
     from langflow.services.settings.service import SettingsService
 
@@ -84,6 +88,43 @@ class LocalStorageService(StorageService):
             logger.exception(f"Error saving file {file_name} in flow {flow_id}")
             raise
 
+    async def save_file_stream(
+        self, flow_id: str, file_name: str, chunks: AsyncIterable[bytes], *, append: bool = False
+    ) -> None:
+        """Save a file in the local storage from its chunks, written as they arrive.
+
+        Without `append`, the chunks are written to a temporary file, synced to disk and renamed to the file, so
+        the file is never left partially written.
+
+        Args:
+            flow_id: The identifier for the flow.
+            file_name: The name of the file to be saved.
+            chunks: The byte content of the file, in chunks.
+            append: If True, append to existing file; if False, overwrite.
+        """
+        folder_path = self.data_dir / flow_id
+        await folder_path.mkdir(parents=True, exist_ok=True)
+        file_path = folder_path / file_name
+        write_path = file_path if append else folder_path / f".{file_name}.{uuid.uuid4().hex}.part"
+
+        try:
+            async with async_open(str(write_path), "ab" if append else "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                await f.flush(sync_metadata=True)
+            if not append:
+                await write_path.replace(file_path)
+            action = "appended to" if append else "saved"
+            await logger.ainfo(f"File {file_name} {action} successfully in flow {flow_id}.")
+        except Exception:
+            logger.exception(f"Error saving file {file_name} in flow {flow_id}")
+            raise
+        finally:
+            # Remove what was written of a failed or cancelled upload
+            if not append:
+                with contextlib.suppress(OSError):
+                    await write_path.unlink(missing_ok=True)
+
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
         """Retrieve a file from the local storage.
 
@@ -109,8 +150,10 @@ class LocalStorageService(StorageService):
         logger.debug(f"File {file_name} retrieved successfully from flow {flow_id}.")
         return content
 
-    async def get_file_stream(self, flow_id: str, file_name: str, chunk_size: int = 8192):
-        """Retrieve a file from storage as a stream."""
+    async def get_file_stream(
+        self, flow_id: str, file_name: str, chunk_size: int = 8192, *, start: int = 0, end: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """Retrieve the bytes `start` to `end` of a file, excluding `end`, in chunks. `end` None reads to the end."""
         file_path = self.data_dir / flow_id / file_name
         if not await file_path.exists():
             await logger.awarning(f"File {file_name} not found in flow {flow_id}.")
@@ -118,10 +161,14 @@ class LocalStorageService(StorageService):
             raise FileNotFoundError(msg)
 
         async with async_open(str(file_path), "rb") as f:
-            while True:
-                chunk = await f.read(chunk_size)
+            f.seek(start)
+            remaining = None if end is None else max(end - start, 0)
+            while remaining is None or remaining > 0:
+                chunk = await f.read(chunk_size if remaining is None else min(chunk_size, remaining))
                 if not chunk:
                     break
+                if remaining is not None:
+                    remaining -= len(chunk)
                 yield chunk
 
     async def list_files(self, flow_id: str) -> list[str]:
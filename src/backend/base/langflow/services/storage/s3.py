@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import os
+import threading
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import TYPE_CHECKING, Any
 
 from langflow.logging.logger import logger
 
 from .service import StorageService
 
+# Size of the parts of multipart uploads. S3 requires at least 5 MiB for all parts but the last
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+# Maximum number of keys of a DeleteObjects request
+DELETE_OBJECTS_BATCH_SIZE = 1000
+
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterable, AsyncIterator, Sequence
 
     from langflow.services.session.service import SessionService
     from langflow.services.settings.service import SettingsService
@@ -54,6 +62,11 @@ class S3StorageService(StorageService):
         # Create session - AWS credentials are picked up from environment variables
         self.session = aioboto3.Session()
         self._client = None
+        self._client_stack: AsyncExitStack | None = None
+        # Event loop the shared client belongs to, and lock guarding its creation on that loop
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._client_lock = asyncio.Lock()
+        self._client_loop_lock = threading.Lock()
 
         self.set_ready()
         logger.info(
@@ -88,9 +101,41 @@ class S3StorageService(StorageService):
         """
         return logical_path
 
-    def _get_client(self):
-        """Get or create an S3 client using the async context manager."""
-        return self.session.client("s3")
+    def _owns_client(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Return whether the shared client belongs to the given event loop, claiming it if it is free.
+
+        The client and its connections are bound to the loop that created them. The shared client is released when
+        its loop is closed, e.g. the temporary loop of a sync caller, and can then be claimed by another loop.
+        """
+        with self._client_loop_lock:
+            if self._client_loop is None or self._client_loop.is_closed():
+                # The connections of a client of a closed loop can't be closed anymore, only dropped
+                self._client = None
+                self._client_stack = None
+                self._client_loop = loop
+                self._client_lock = asyncio.Lock()
+            return self._client_loop is loop
+
+    @asynccontextmanager
+    async def _get_client(self):
+        """Yield an S3 client for the running event loop.
+
+        The client, with its connection pool and resolved credentials, is created on first use and kept until
+        teardown, so operations don't pay for a new client, and TLS connections, each time. Operations running on
+        another event loop than the one of the shared client, like sync callers running a coroutine on a loop of
+        their own in a worker thread, get a client for the duration of the call.
+        """
+        if not self._owns_client(asyncio.get_running_loop()):
+            async with self.session.client("s3") as s3_client:
+                yield s3_client
+            return
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    stack = AsyncExitStack()
+                    self._client = await stack.enter_async_context(self.session.client("s3"))
+                    self._client_stack = stack
+        yield self._client
 
     async def save_file(self, flow_id: str, file_name: str, data: bytes, *, append: bool = False) -> None:
         """Save a file to S3.
@@ -120,35 +165,102 @@ class S3StorageService(StorageService):
                 }
 
                 if self.tags:
-                    tag_string = "&".join([f"{k}={v}" for k, v in self.tags.items()])
-                    put_params["Tagging"] = tag_string
+                    put_params["Tagging"] = self._tagging()
 
                 await s3_client.put_object(**put_params)
 
             await logger.ainfo(f"File {file_name} saved successfully to S3: s3://{self.bucket_name}/{key}")
 
         except Exception as e:
-            error_msg = str(e)
-            error_code = None
+            raise self._save_error(e, flow_id, file_name) from e
 
-            if hasattr(e, "response") and isinstance(e.response, dict):
-                error_info = e.response.get("Error", {})
-                error_code = error_info.get("Code")
-                error_msg = error_info.get("Message", str(e))
+    async def save_file_stream(
+        self, flow_id: str, file_name: str, chunks: AsyncIterable[bytes], *, append: bool = False
+    ) -> None:
+        """Save a file to S3 from its chunks, with a multipart upload.
 
-            logger.exception(f"Error saving file {file_name} to S3 in flow {flow_id}: {error_msg}")
+        Chunks are buffered up to MULTIPART_PART_SIZE bytes, then uploaded as a part, so at most one part is held in
+        memory. Files smaller than a part are saved with a single put_object.
 
-            if error_code == "NoSuchBucket":
-                msg = f"S3 bucket '{self.bucket_name}' does not exist"
-                raise FileNotFoundError(msg) from e
-            if error_code == "AccessDenied":
-                msg = "Access denied to S3 bucket. Please check your AWS credentials and bucket permissions"
-                raise PermissionError(msg) from e
-            if error_code == "InvalidAccessKeyId":
-                msg = "Invalid AWS credentials. Please check your AWS access key and secret key"
-                raise PermissionError(msg) from e
-            msg = f"Failed to save file to S3: {error_msg}"
-            raise RuntimeError(msg) from e
+        Raises:
+            NotImplementedError: If append=True (not supported in S3)
+        """
+        if append:
+            msg = "Append mode is not supported for S3 storage"
+            raise NotImplementedError(msg)
+
+        key = self.build_full_path(flow_id, file_name)
+        upload_id = None
+
+        try:
+            async with self._get_client() as s3_client:
+                buffer = bytearray()
+                parts: list[dict[str, Any]] = []
+                try:
+                    async for chunk in chunks:
+                        buffer += chunk
+                        if len(buffer) < MULTIPART_PART_SIZE:
+                            continue
+                        if upload_id is None:
+                            upload_params: dict[str, Any] = {"Bucket": self.bucket_name, "Key": key}
+                            if self.tags:
+                                upload_params["Tagging"] = self._tagging()
+                            upload_id = (await s3_client.create_multipart_upload(**upload_params))["UploadId"]
+                        parts.append(await self._upload_part(s3_client, key, upload_id, len(parts) + 1, buffer))
+                        buffer = bytearray()
+
+                    if upload_id is None:
+                        put_params: dict[str, Any] = {"Bucket": self.bucket_name, "Key": key, "Body": bytes(buffer)}
+                        if self.tags:
+                            put_params["Tagging"] = self._tagging()
+                        await s3_client.put_object(**put_params)
+                    else:
+                        if buffer:
+                            parts.append(await self._upload_part(s3_client, key, upload_id, len(parts) + 1, buffer))
+                        await s3_client.complete_multipart_upload(
+                            Bucket=self.bucket_name, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+                        )
+                except BaseException:
+                    if upload_id is not None:
+                        with contextlib.suppress(Exception):
+                            await s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+                    raise
+
+            await logger.ainfo(f"File {file_name} saved successfully to S3: s3://{self.bucket_name}/{key}")
+
+        except Exception as e:
+            raise self._save_error(e, flow_id, file_name) from e
+
+    async def _upload_part(self, s3_client, key: str, upload_id: str, part_number: int, data: bytearray) -> dict:
+        response = await s3_client.upload_part(
+            Bucket=self.bucket_name, Key=key, UploadId=upload_id, PartNumber=part_number, Body=bytes(data)
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    def _tagging(self) -> str:
+        return "&".join([f"{k}={v}" for k, v in self.tags.items()])
+
+    def _save_error(self, e: Exception, flow_id: str, file_name: str) -> Exception:
+        """Log an error saving a file and return the exception to raise for it."""
+        error_msg = str(e)
+        error_code = None
+
+        if hasattr(e, "response") and isinstance(e.response, dict):
+            error_info = e.response.get("Error", {})
+            error_code = error_info.get("Code")
+            error_msg = error_info.get("Message", str(e))
+
+        logger.exception(f"Error saving file {file_name} to S3 in flow {flow_id}: {error_msg}")
+
+        if error_code == "NoSuchBucket":
+            return FileNotFoundError(f"S3 bucket '{self.bucket_name}' does not exist")
+        if error_code == "AccessDenied":
+            return PermissionError(
+                "Access denied to S3 bucket. Please check your AWS credentials and bucket permissions"
+            )
+        if error_code == "InvalidAccessKeyId":
+            return PermissionError("Invalid AWS credentials. Please check your AWS access key and secret key")
+        return RuntimeError(f"Failed to save file to S3: {error_msg}")
 
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
         """Retrieve a file from S3.
@@ -182,13 +294,17 @@ class S3StorageService(StorageService):
         else:
             return content
 
-    async def get_file_stream(self, flow_id: str, file_name: str, chunk_size: int = 8192) -> AsyncIterator[bytes]:
+    async def get_file_stream(
+        self, flow_id: str, file_name: str, chunk_size: int = 8192, *, start: int = 0, end: int | None = None
+    ) -> AsyncIterator[bytes]:
         """Retrieve a file from S3 as a stream.
 
         Args:
             flow_id: The flow/user identifier for namespacing
             file_name: The name of the file to retrieve
             chunk_size: Size of chunks to yield (default: 8192 bytes)
+            start: Offset of the first byte to retrieve
+            end: Offset after the last byte to retrieve, None to read to the end of the file
 
         Yields:
             bytes: Chunks of the file content
@@ -200,7 +316,13 @@ class S3StorageService(StorageService):
 
         try:
             async with self._get_client() as s3_client:
-                response = await s3_client.get_object(Bucket=self.bucket_name, Key=key)
+                get_params: dict[str, Any] = {"Bucket": self.bucket_name, "Key": key}
+                if start or end is not None:
+                    if end is not None and end <= start:
+                        return
+                    # HTTP ranges include their last byte
+                    get_params["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+                response = await s3_client.get_object(**get_params)
                 body = response["Body"]
 
                 try:
@@ -316,10 +438,64 @@ class S3StorageService(StorageService):
         else:
             return file_size
 
-    async def teardown(self) -> None:
-        """Perform any cleanup operations when the service is being torn down.
+    async def delete_files(
+        self, flow_id: str, file_names: Sequence[str], *, max_concurrency: int = 10
+    ) -> dict[str, Exception]:
+        """Delete files from S3 with DeleteObjects requests of up to DELETE_OBJECTS_BATCH_SIZE keys.
 
-        For S3, we don't need to do anything as aioboto3 handles cleanup
-        via context managers.
+        Args:
+            flow_id: The flow/user identifier for namespacing
+            file_names: The names of the files to be deleted
+            max_concurrency: Maximum number of DeleteObjects requests sent at once
+
+        Returns:
+            dict[str, Exception]: The error of each file that could not be deleted
         """
+        keys = {self.build_full_path(flow_id, file_name): file_name for file_name in file_names}
+        key_list = list(keys)
+        batches = [
+            key_list[i : i + DELETE_OBJECTS_BATCH_SIZE] for i in range(0, len(key_list), DELETE_OBJECTS_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        failures: dict[str, Exception] = {}
+
+        async def delete_batch(batch: list[str]) -> None:
+            async with semaphore, self._get_client() as s3_client:
+                try:
+                    response = await s3_client.delete_objects(
+                        Bucket=self.bucket_name, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+                    )
+                except Exception as e:  # noqa: BLE001
+                    error_info = e.response.get("Error", {}) if isinstance(getattr(e, "response", None), dict) else {}
+                    error: Exception = e
+                    if error_info.get("Code") == "AccessDenied":
+                        error = PermissionError(f"AccessDenied: {error_info.get('Message')}")
+                    failures.update(dict.fromkeys((keys[key] for key in batch), error))
+                    return
+            # Errors of single keys are OSErrors, so callers can tell them apart from failed requests
+            for error in response.get("Errors", []):
+                message = f"{error.get('Code')}: {error.get('Message')}"
+                failures[keys[error["Key"]]] = (
+                    PermissionError(message) if error.get("Code") == "AccessDenied" else OSError(message)
+                )
+
+        await asyncio.gather(*(delete_batch(batch) for batch in batches))
+        await logger.ainfo(
+            f"Deleted {len(keys) - len(failures)} of {len(keys)} files from S3: s3://{self.bucket_name}/"
+            f"{self.build_full_path(flow_id, '')}"
+        )
+        return failures
+
+    async def teardown(self) -> None:
+        """Close the S3 client of the service, and its connections."""
+        with self._client_loop_lock:
+            client_stack, client_loop = self._client_stack, self._client_loop
+            self._client = None
+            self._client_stack = None
+            self._client_loop = None
+        if client_stack is not None:
+            if client_loop is asyncio.get_running_loop():
+                await client_stack.aclose()
+            else:
+                logger.warning("S3 client belongs to another event loop, dropping it without closing its connections")
         logger.info("S3 storage service teardown complete")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import abstractmethod
 from typing import TYPE_CHECKING
 
@@ -10,6 +11,8 @@ import anyio
 from langflow.services.base import Service
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Sequence
+
     from langflow.services.session.service import SessionService
     from langflow.services.settings.service import SettingsService
 
@@ -35,10 +38,33 @@ class StorageService(Service):
     async def save_file(self, flow_id: str, file_name: str, data: bytes, *, append: bool = False) -> None:
         raise NotImplementedError
 
+    async def save_file_stream(
+        self, flow_id: str, file_name: str, chunks: AsyncIterable[bytes], *, append: bool = False
+    ) -> None:
+        """Save a file from its chunks, as they arrive.
+
+        The default implementation joins the chunks and calls `save_file`. Subclasses override it to write the
+        chunks without holding the whole file in memory.
+        """
+        data = b"".join([chunk async for chunk in chunks])
+        await self.save_file(flow_id, file_name, data, append=append)
+
     @abstractmethod
     async def get_file(self, flow_id: str, file_name: str) -> bytes:
         raise NotImplementedError
 
+    async def get_file_stream(
+        self, flow_id: str, file_name: str, chunk_size: int = 8192, *, start: int = 0, end: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """Retrieve the bytes `start` to `end` of a file, excluding `end`, in chunks. `end` None reads to the end.
+
+        The default implementation reads the whole file with `get_file`. Subclasses override it to read only
+        the chunks requested.
+        """
+        content = (await self.get_file(flow_id, file_name))[start:end]
+        for i in range(0, len(content), chunk_size):
+            yield content[i : i + chunk_size]
+
     @abstractmethod
     async def list_files(self, flow_id: str) -> list[str]:
         raise NotImplementedError
@@ -51,5 +77,39 @@ class StorageService(Service):
     async def delete_file(self, flow_id: str, file_name: str) -> None:
         raise NotImplementedError
 
+    async def get_files(
+        self, flow_id: str, file_names: Sequence[str], *, max_concurrency: int = 10
+    ) -> dict[str, bytes]:
+        """Retrieve files, reading up to `max_concurrency` of them at once.
+
+        Raises:
+            FileNotFoundError: If one of the files does not exist.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def get_file(file_name: str) -> bytes:
+            async with semaphore:
+                return await self.get_file(flow_id, file_name)
+
+        contents = await asyncio.gather(*(get_file(file_name) for file_name in file_names))
+        return dict(zip(file_names, contents, strict=True))
+
+    async def delete_files(
+        self, flow_id: str, file_names: Sequence[str], *, max_concurrency: int = 10
+    ) -> dict[str, Exception]:
+        """Delete files, up to `max_concurrency` of them at once, and return the error of each file not deleted."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        failures: dict[str, Exception] = {}
+
+        async def delete_file(file_name: str) -> None:
+            async with semaphore:
+                try:
+                    await self.delete_file(flow_id=flow_id, file_name=file_name)
+                except Exception as e:  # noqa: BLE001
+                    failures[file_name] = e
+
+        await asyncio.gather(*(delete_file(file_name) for file_name in file_names))
+        return failures
+
     async def teardown(self) -> None:
         raise NotImplementedError
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 from typing import TYPE_CHECKING
 
+from lfx.base.data.docling_pool import close_docling_pool
 from lfx.log.logger import logger
 from lfx.services.settings.constants import DEFAULT_SUPERUSER, DEFAULT_SUPERUSER_PASSWORD
 from sqlalchemy import delete
@@ -12,6 +13,7 @@ from sqlmodel import col, select
 from langflow.services.auth.utils import create_super_user, verify_password
 from langflow.services.cache.base import ExternalAsyncBaseCacheService
 from langflow.services.cache.factory import CacheServiceFactory
+from langflow.services.database.models.api_key.crud import clear_api_key_cache, flush_api_key_usage
 from langflow.services.database.models.transactions.model import TransactionTable
 from langflow.services.database.models.vertex_builds.model import VertexBuildTable
 from langflow.services.database.utils import initialize_database
@@ -130,12 +132,17 @@ async def teardown_superuser(settings_service, session: AsyncSession) -> None:
 async def teardown_services() -> None:
     """Teardown all the services."""
     async with session_scope() as session:
+        await flush_api_key_usage(session)
         await teardown_superuser(get_settings_service(), session)
+    # Validated keys are only valid for the database they were read from
+    clear_api_key_cache()
 
     from lfx.services.manager import get_service_manager
 
     service_manager = get_service_manager()
     await service_manager.teardown()
+    # Workers are given some time to exit
+    await asyncio.to_thread(close_docling_pool)
 
 
 def initialize_settings_service() -> None:
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import os
+import threading
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
+from cachetools import TTLCache
 from lfx.log.logger import logger
-from sqlmodel import select
+from sqlmodel import col, select
 from typing_extensions import override
 
 from langflow.services.auth import utils as auth_utils
@@ -15,16 +17,39 @@ from langflow.services.variable.base import VariableService
 from langflow.services.variable.constants import CREDENTIAL_TYPE, GENERIC_TYPE
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
     from uuid import UUID
 
     from lfx.services.settings.service import SettingsService
     from sqlmodel.ext.asyncio.session import AsyncSession
 
 
+VARIABLE_CACHE_MAX_SIZE = 4096
+
+
+class VariableValue(NamedTuple):
+    """The decrypted value of a variable and its type."""
+
+    type: str | None
+    value: str
+
+
 class DatabaseVariableService(VariableService, Service):
     def __init__(self, settings_service: SettingsService):
         self.settings_service = settings_service
+        # Decrypted values keyed by (user_id, name), see `get_variables_by_names`
+        ttl = settings_service.settings.variable_cache_ttl
+        self._variable_cache: TTLCache[tuple[str, str], VariableValue] | None = (
+            TTLCache(maxsize=VARIABLE_CACHE_MAX_SIZE, ttl=ttl) if ttl > 0 else None
+        )
+        self._variable_cache_lock = threading.Lock()
+
+    def _invalidate_variables(self, user_id: UUID | str, *names: str) -> None:
+        if self._variable_cache is None:
+            return
+        with self._variable_cache_lock:
+            for name in names:
+                self._variable_cache.pop((str(user_id), name), None)
 
     async def initialize_user_variables(self, user_id: UUID | str, session: AsyncSession) -> None:
         if not self.settings_service.settings.store_environment_variables:
@@ -84,12 +109,55 @@ class DatabaseVariableService(VariableService, Service):
         field: str,
         session: AsyncSession,
     ) -> str:
-        # we get the credential from the database
-        # credential = session.query(Variable).filter(Variable.user_id == user_id, Variable.name == name).first()
-        stmt = select(Variable).where(Variable.user_id == user_id, Variable.name == name)
-        variable = (await session.exec(stmt)).first()
+        variables = await self.get_variables_by_names(user_id, [name], session)
+        return self.get_variable_value(name, field, variables.get(name))
+
+    async def get_variables_by_names(
+        self,
+        user_id: UUID | str,
+        names: Iterable[str],
+        session: AsyncSession,
+    ) -> dict[str, VariableValue]:
+        """Returns the decrypted values of the variables with the given names.
+
+        Variables that are not cached are fetched in a single query and decrypted once. Decrypted
+        values are cached per user for `variable_cache_ttl` seconds, and dropped when the variable
+        is updated or deleted. Names that do not match a variable are left out of the result.
+        """
+        key = str(user_id)
+        variables: dict[str, VariableValue] = {}
+        missing = set()
+        with self._variable_cache_lock:
+            for name in names:
+                if self._variable_cache is not None and (cached := self._variable_cache.get((key, name))):
+                    variables[name] = cached
+                else:
+                    missing.add(name)
+        if not missing:
+            return variables
+
+        stmt = select(Variable).where(Variable.user_id == user_id, col(Variable.name).in_(missing))
+        for variable in (await session.exec(stmt)).all():
+            if not variable.value:
+                continue
+            variables[variable.name] = VariableValue(
+                type=variable.type,
+                value=auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service),
+            )
+            if self._variable_cache is not None:
+                with self._variable_cache_lock:
+                    self._variable_cache[key, variable.name] = variables[variable.name]
+        return variables
+
+    @staticmethod
+    def get_variable_value(name: str, field: str, variable: VariableValue | None) -> str:
+        """Returns the value of a variable returned by `get_variables_by_names` for use in `field`.
 
-        if not variable or not variable.value:
+        Raises:
+            ValueError: If the variable was not found.
+            TypeError: If a credential is used in a Session ID field.
+        """
+        if variable is None:
             msg = f"{name} variable not found."
             raise ValueError(msg)
 
@@ -100,8 +168,7 @@ class DatabaseVariableService(VariableService, Service):
             )
             raise TypeError(msg)
 
-        # we decrypt the value
-        return auth_utils.decrypt_api_key(variable.value, settings_service=self.settings_service)
+        return variable.value
 
     async def get_all(self, user_id: UUID | str, session: AsyncSession) -> list[VariableRead]:
         stmt = select(Variable).where(Variable.user_id == user_id)
@@ -145,6 +212,7 @@ class DatabaseVariableService(VariableService, Service):
         session.add(variable)
         await session.flush()
         await session.refresh(variable)
+        self._invalidate_variables(user_id, name)
         return variable
 
     async def update_variable_fields(
@@ -156,6 +224,7 @@ class DatabaseVariableService(VariableService, Service):
     ):
         query = select(Variable).where(Variable.id == variable_id, Variable.user_id == user_id)
         db_variable = (await session.exec(query)).one()
+        previous_name = db_variable.name
         db_variable.updated_at = datetime.now(timezone.utc)
 
         variable.value = variable.value or ""
@@ -169,6 +238,7 @@ class DatabaseVariableService(VariableService, Service):
         session.add(db_variable)
         await session.flush()
         await session.refresh(db_variable)
+        self._invalidate_variables(user_id, previous_name, db_variable.name)
         return db_variable
 
     @override
@@ -184,6 +254,7 @@ class DatabaseVariableService(VariableService, Service):
             msg = f"{name} variable not found."
             raise ValueError(msg)
         await session.delete(variable)
+        self._invalidate_variables(user_id, name)
 
     @override
     async def delete_variable_by_id(self, user_id: UUID | str, variable_id: UUID, session: AsyncSession) -> None:
@@ -193,6 +264,7 @@ class DatabaseVariableService(VariableService, Service):
             msg = f"{variable_id} variable not found."
             raise ValueError(msg)
         await session.delete(variable)
+        self._invalidate_variables(user_id, variable.name)
 
     async def create_variable(
         self,
@@ -214,4 +286,5 @@ class DatabaseVariableService(VariableService, Service):
         session.add(variable)
         await session.flush()
         await session.refresh(variable)
+        self._invalidate_variables(user_id, name)
         return variable
@@ -369,6 +369,42 @@ class TestS3StorageServiceStreamOperations:
             with contextlib.suppress(Exception):
                 await s3_storage_service.delete_file(test_flow_id, file_name)
 
+    async def test_get_file_stream_range(self, s3_storage_service, test_flow_id):
+        """Test streaming a byte range of a file from S3."""
+        file_name = "range.bin"
+
+        try:
+            await s3_storage_service.save_file(test_flow_id, file_name, bytes(range(100)))
+
+            chunks = [
+                chunk async for chunk in s3_storage_service.get_file_stream(test_flow_id, file_name, start=10, end=50)
+            ]
+
+            assert b"".join(chunks) == bytes(range(10, 50))
+        finally:
+            with contextlib.suppress(Exception):
+                await s3_storage_service.delete_file(test_flow_id, file_name)
+
+    async def test_save_file_stream_multipart(self, s3_storage_service, test_flow_id):
+        """Test saving a file larger than a part from chunks, with a multipart upload."""
+        from langflow.services.storage.s3 import MULTIPART_PART_SIZE
+
+        file_name = "multipart.bin"
+        chunk = b"B" * (1024 * 1024)
+        chunk_count = MULTIPART_PART_SIZE // len(chunk) + 2
+
+        async def chunks():
+            for _ in range(chunk_count):
+                yield chunk
+
+        try:
+            await s3_storage_service.save_file_stream(test_flow_id, file_name, chunks())
+
+            assert await s3_storage_service.get_file_size(test_flow_id, file_name) == len(chunk) * chunk_count
+        finally:
+            with contextlib.suppress(Exception):
+                await s3_storage_service.delete_file(test_flow_id, file_name)
+
 
 @pytest.mark.asyncio
 class TestS3StorageServiceListOperations:
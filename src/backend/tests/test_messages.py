@@ -5,6 +5,7 @@ import pytest
 from langflow.memory import (
     aadd_messages,
     aadd_messagetables,
+    abuffer_messages,
     add_messages,
     adelete_messages,
     aget_messages,
@@ -23,6 +24,7 @@ from langflow.services.database.models.message import MessageCreate, MessageRead
 from langflow.services.database.models.message.model import MessageTable
 from langflow.services.deps import session_scope
 from langflow.services.tracing.utils import convert_to_langchain_type
+from sqlmodel import select
 
 
 @pytest.fixture
@@ -101,6 +103,44 @@ async def test_aadd_messagetables(async_session):
     assert added_messages[0].text == "New Test message"
 
 
+@pytest.mark.usefixtures("client")
+async def test_aadd_messagetables_returns_messages_without_refresh(async_session):
+    messages = [
+        MessageTable(
+            text=f"Message {i}",
+            sender="User",
+            sender_name="User",
+            session_id="bulk_session_id",
+            properties=Properties().model_dump_json(),
+        )
+        for i in range(3)
+    ]
+    added_messages = await aadd_messagetables(messages, async_session)
+    assert [message.id for message in added_messages] == [message.id for message in messages]
+    assert all(isinstance(message.properties, Properties) for message in added_messages)
+
+    rows = (await async_session.exec(select(MessageTable).where(MessageTable.session_id == "bulk_session_id"))).all()
+    assert sorted(row.text for row in rows) == ["Message 0", "Message 1", "Message 2"]
+
+
+@pytest.mark.usefixtures("client")
+async def test_abuffer_messages_coalesces_writes():
+    session_id = "buffered_session_id"
+    async with abuffer_messages():
+        stored = await astore_message(
+            Message(text="Partial", sender="Machine", sender_name="AI", session_id=session_id)
+        )
+        message = Message(**stored[0].model_dump())
+        message.text = "Complete"
+        await astore_message(message)
+        await aadd_messages(Message(text="Second", sender="Machine", sender_name="AI", session_id=session_id))
+        assert await aget_messages(session_id=session_id) == []
+
+    messages = await aget_messages(session_id=session_id)
+    assert [message.text for message in messages] == ["Complete", "Second"]
+    assert str(messages[0].id) == str(stored[0].id)
+
+
 @pytest.mark.usefixtures("client")
 def test_delete_messages():
     session_id = "new_session_id"
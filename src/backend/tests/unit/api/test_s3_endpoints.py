@@ -13,6 +13,7 @@ For actual S3 storage service testing, see:
 - tests/integration/storage/ - Integration tests with real AWS S3
 """
 
+import hashlib
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -33,6 +34,12 @@ class TestS3FileEndpoints:
         service.get_file = AsyncMock(return_value=b"test file content")
         service.get_file_stream = MagicMock(return_value=iter([b"chunk1", b"chunk2", b"chunk3"]))
         service.save_file = AsyncMock()
+        service.saved_chunks = []
+
+        async def save_file_stream(flow_id, file_name, chunks, *, append=False):  # noqa: ARG001
+            service.saved_chunks.extend([chunk async for chunk in chunks])
+
+        service.save_file_stream = AsyncMock(side_effect=save_file_stream)
         service.delete_file = AsyncMock()
         service.get_file_size = AsyncMock(return_value=1024)
         return service
@@ -43,6 +50,7 @@ class TestS3FileEndpoints:
         settings = MagicMock()
         settings.settings.storage_type = "s3"
         settings.settings.max_file_size_upload = 10  # 10MB
+        settings.settings.deduplicate_files = False
         return settings
 
     @pytest.mark.asyncio
@@ -229,14 +237,19 @@ class TestS3FileEndpoints:
             mock_file = MagicMock()
             mock_file.filename = "upload.txt"
             mock_file.size = 1024
-            mock_file.read = AsyncMock(return_value=b"file content")
+            mock_file.read = AsyncMock(side_effect=[b"file content", b""])
 
             with patch("langflow.api.v2.files.upload_user_file"):
                 from langflow.api.v2.files import save_file_routine
 
-                await save_file_routine(mock_file, mock_storage_service, mock_user, file_name="upload.txt")
-
-                # Verify storage service was called
-                mock_storage_service.save_file.assert_called_once_with(
-                    flow_id="user_123", file_name="upload.txt", data=b"file content", append=False
+                _, _, size, checksum = await save_file_routine(
+                    mock_file, mock_storage_service, mock_user, file_name="upload.txt"
                 )
+
+                # Verify the content was streamed to the storage service
+                mock_storage_service.save_file_stream.assert_called_once()
+                assert mock_storage_service.save_file_stream.call_args.kwargs["flow_id"] == "user_123"
+                assert mock_storage_service.save_file_stream.call_args.kwargs["file_name"] == "upload.txt"
+                assert b"".join(mock_storage_service.saved_chunks) == b"file content"
+                assert size == len(b"file content")
+                assert checksum == hashlib.sha256(b"file content").hexdigest()
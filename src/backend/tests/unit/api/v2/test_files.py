@@ -1,10 +1,14 @@
 import asyncio
 import contextlib
+import hashlib
+import io
 import json
 import os
 import tempfile
 import uuid
+import zipfile
 from contextlib import suppress
+from functools import partial
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
@@ -14,6 +18,7 @@ import pytest
 from asgi_lifespan import LifespanManager
 from httpx import ASGITransport, AsyncClient
 from langflow.api.v2.files import (
+    BLOB_FLOW_ID,
     delete_all_files,
     delete_file,
     delete_files_batch,
@@ -23,7 +28,11 @@ from langflow.api.v2.mcp import get_mcp_file
 from langflow.main import create_app
 from langflow.services.auth.utils import get_password_hash
 from langflow.services.database.models.api_key.model import ApiKey, UnmaskedApiKeyRead
+from langflow.services.database.models.file.model import File as UserFile
+from langflow.services.database.models.file.model import FileBlob
 from langflow.services.database.models.user.model import User, UserRead
+from langflow.services.deps import get_storage_service
+from langflow.services.storage.service import StorageService
 from lfx.services.deps import session_scope
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
@@ -99,6 +108,13 @@ def max_file_size_upload_10mb_fixture(monkeypatch):
     monkeypatch.undo()
 
 
+@pytest.fixture
+def deduplicate_files_fixture(monkeypatch):
+    monkeypatch.setenv("LANGFLOW_DEDUPLICATE_FILES", "true")
+    yield
+    monkeypatch.undo()
+
+
 @pytest.fixture(name="files_client")
 async def files_client_fixture(
     monkeypatch,
@@ -147,6 +163,27 @@ async def test_upload_file(files_client, files_created_api_key):
 
     response_json = response.json()
     assert "id" in response_json
+    assert response_json["size"] == len(b"test content")
+    assert response_json["sha256"] == hashlib.sha256(b"test content").hexdigest()
+
+
+async def test_download_files_batch(files_client, files_created_api_key):
+    headers = {"x-api-key": files_created_api_key.api_key}
+    contents = {"first.txt": b"first content", "second.bin": bytes(range(256)) * 1024}
+    file_ids = []
+    for name, content in contents.items():
+        response = await files_client.post("api/v2/files", files={"file": (name, content)}, headers=headers)
+        assert response.status_code == 201
+        file_ids.append(response.json()["id"])
+
+    response = await files_client.post("api/v2/files/batch/", json=file_ids, headers=headers)
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+        assert {name: zip_file.read(name) for name in zip_file.namelist()} == {
+            "first.txt": contents["first.txt"],
+            "second.bin": contents["second.bin"],
+        }
 
 
 async def test_download_file(files_client, files_created_api_key):
@@ -202,6 +239,115 @@ async def test_delete_file(files_client, files_created_api_key):
     assert response.json() == {"detail": "File test deleted successfully"}
 
 
+async def _blob_exists(path: str) -> bool:
+    async with session_scope() as session:
+        return await session.get(FileBlob, path) is not None
+
+
+@pytest.mark.usefixtures("deduplicate_files_fixture")
+async def test_deduplicated_files_share_blob(files_client, files_created_api_key):
+    headers = {"x-api-key": files_created_api_key.api_key}
+    content = b"shared content"
+    sha256 = hashlib.sha256(content).hexdigest()
+    storage_service = get_storage_service()
+
+    file_ids = []
+    for name in ("first.txt", "second.txt"):
+        response = await files_client.post("api/v2/files", files={"file": (name, content)}, headers=headers)
+        assert response.status_code == 201
+        assert response.json()["path"] == f"{BLOB_FLOW_ID}/{sha256}.txt"
+        file_ids.append(response.json()["id"])
+    assert f"{sha256}.txt" in await storage_service.list_files(BLOB_FLOW_ID)
+    assert await _blob_exists(f"{BLOB_FLOW_ID}/{sha256}.txt")
+
+    # The blob is kept while a file uses it
+    response = await files_client.delete(f"api/v2/files/{file_ids[0]}", headers=headers)
+    assert response.status_code == 200
+    response = await files_client.get(f"api/v2/files/{file_ids[1]}", headers=headers)
+    assert response.content == content
+
+    response = await files_client.delete(f"api/v2/files/{file_ids[1]}", headers=headers)
+    assert response.status_code == 200
+    assert f"{sha256}.txt" not in await storage_service.list_files(BLOB_FLOW_ID)
+    assert not await _blob_exists(f"{BLOB_FLOW_ID}/{sha256}.txt")
+
+
+@pytest.mark.usefixtures("deduplicate_files_fixture")
+async def test_failed_blob_save_adds_no_file(files_client, files_created_api_key, monkeypatch):
+    headers = {"x-api-key": files_created_api_key.api_key}
+    content = b"unsaved content"
+    path = f"{BLOB_FLOW_ID}/{hashlib.sha256(content).hexdigest()}.txt"
+    storage_service = get_storage_service()
+    monkeypatch.setattr(storage_service, "save_file_stream", AsyncMock(side_effect=PermissionError("denied")))
+
+    response = await files_client.post("api/v2/files", files={"file": ("unsaved.txt", content)}, headers=headers)
+
+    assert response.status_code == 403
+    assert not await _blob_exists(path)
+    async with session_scope() as session:
+        assert (await session.exec(select(UserFile).where(UserFile.path == path))).first() is None
+
+
+@pytest.mark.usefixtures("deduplicate_files_fixture")
+async def test_upload_during_delete_of_same_content_keeps_blob(files_client, files_created_api_key, monkeypatch):
+    headers = {"x-api-key": files_created_api_key.api_key}
+    content = b"shared content"
+    storage_service = get_storage_service()
+    response = await files_client.post("api/v2/files", files={"file": ("first.txt", content)}, headers=headers)
+    first_id = response.json()["id"]
+
+    # Pause the delete of the blob, once it was found unused
+    deleting, resume = asyncio.Event(), asyncio.Event()
+
+    def pause(delete):
+        async def paused_delete(*args, **kwargs):
+            deleting.set()
+            await resume.wait()
+            return await delete(*args, **kwargs)
+
+        return paused_delete
+
+    monkeypatch.setattr(storage_service, "delete_file", pause(storage_service.delete_file))
+    monkeypatch.setattr(storage_service, "delete_files", pause(storage_service.delete_files))
+    delete_task = asyncio.create_task(files_client.delete(f"api/v2/files/{first_id}", headers=headers))
+    await deleting.wait()
+    upload_task = asyncio.create_task(
+        files_client.post("api/v2/files", files={"file": ("second.txt", content)}, headers=headers)
+    )
+    # Let the upload run as far as it can while the blob is being deleted
+    await asyncio.wait({upload_task}, timeout=0.5)
+    resume.set()
+    delete_response, upload_response = await asyncio.gather(delete_task, upload_task)
+
+    assert delete_response.status_code == 200
+    assert upload_response.status_code == 201
+    response = await files_client.get(f"api/v2/files/{upload_response.json()['id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.content == content
+    await files_client.delete(f"api/v2/files/{upload_response.json()['id']}", headers=headers)
+
+
+@pytest.mark.usefixtures("deduplicate_files_fixture")
+async def test_append_to_deduplicated_file_copies_blob(files_client, files_created_api_key):
+    headers = {"x-api-key": files_created_api_key.api_key}
+    storage_service = get_storage_service()
+    for name in ("log.txt", "copy.txt"):
+        response = await files_client.post("api/v2/files", files={"file": (name, b"line 1\n")}, headers=headers)
+        assert response.status_code == 201
+
+    response = await files_client.post(
+        "api/v2/files", params={"append": True}, files={"file": ("log.txt", b"line 2\n")}, headers=headers
+    )
+
+    assert response.status_code == 201
+    assert response.json()["path"] == f"{files_created_api_key.user_id}/log.txt"
+    response = await files_client.get(f"api/v2/files/{response.json()['id']}", headers=headers)
+    assert response.content == b"line 1\nline 2\n"
+    # The blob is still used by the other file
+    sha256 = hashlib.sha256(b"line 1\n").hexdigest()
+    assert f"{sha256}.txt" in await storage_service.list_files(BLOB_FLOW_ID)
+
+
 async def test_edit_file(files_client, files_created_api_key):
     headers = {"x-api-key": files_created_api_key.api_key}
 
@@ -1078,6 +1224,7 @@ class TestStorageFailureHandling:
 
         mock_storage_service = AsyncMock()
         mock_storage_service.delete_file = AsyncMock(side_effect=mock_delete_file)
+        mock_storage_service.delete_files = partial(StorageService.delete_files, mock_storage_service)
 
         result = await delete_files_batch(
             file_ids=file_ids,
@@ -1126,6 +1273,7 @@ class TestStorageFailureHandling:
 
         mock_storage_service = AsyncMock()
         mock_storage_service.delete_file = AsyncMock()
+        mock_storage_service.delete_files = partial(StorageService.delete_files, mock_storage_service)
 
         result = await delete_all_files(
             current_user=mock_current_user,
@@ -1171,6 +1319,7 @@ class TestStorageFailureHandling:
 
         mock_storage_service = AsyncMock()
         mock_storage_service.delete_file = AsyncMock(side_effect=mock_delete_file)
+        mock_storage_service.delete_files = partial(StorageService.delete_files, mock_storage_service)
 
         result = await delete_all_files(
             current_user=mock_current_user,
@@ -1208,6 +1357,7 @@ class TestStorageFailureHandling:
 
         mock_storage_service = AsyncMock()
         mock_storage_service.delete_file = AsyncMock()
+        mock_storage_service.delete_files = partial(StorageService.delete_files, mock_storage_service)
 
         result = await delete_files_batch(
             file_ids=file_ids,
@@ -1255,6 +1405,7 @@ class TestStorageFailureHandling:
 
         mock_storage_service = AsyncMock()
         mock_storage_service.delete_file = AsyncMock(side_effect=mock_delete_file)
+        mock_storage_service.delete_files = partial(StorageService.delete_files, mock_storage_service)
 
         result = await delete_files_batch(
             file_ids=file_ids,
@@ -26,6 +26,9 @@ class FakeStorageService:  # Minimal stub for storage interactions
         else:
             self._store[key] = data
 
+    async def save_file_stream(self, flow_id: str, file_name: str, chunks, *, append: bool = False):
+        await self.save_file(flow_id, file_name, b"".join([chunk async for chunk in chunks]), append=append)
+
     async def get_file_size(self, flow_id: str, file_name: str):
         return len(self._store.get(f"{flow_id}/{file_name}", b""))
 
@@ -81,6 +84,7 @@ class FakeSession:  # Minimal async session stub
 
 class FakeSettings:
     max_file_size_upload: int = 10  # MB
+    deduplicate_files: bool = False
 
 
 @pytest.fixture
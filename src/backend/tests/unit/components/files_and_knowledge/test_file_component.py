@@ -115,7 +115,7 @@ class TestFileComponentDynamicOutputs:
         assert result["advanced_mode"]["show"] is False
         assert result["advanced_mode"]["value"] is False
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_process_docling_subprocess_success(self, mock_subprocess):
         """Test successful Docling subprocess execution."""
         component = FileComponent()
@@ -20,7 +20,7 @@ from lfx.schema.dataframe import DataFrame
 class TestDoclingEmptyTextExtraction:
     """Tests for handling images/documents with no extractable text."""
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_process_docling_empty_doc_rows_returns_placeholder(self, mock_subprocess, tmp_path):
         """Test that empty doc_rows from Docling creates placeholder data instead of error."""
         # Use tmp_path for secure temporary file references
@@ -52,7 +52,7 @@ class TestDoclingEmptyTextExtraction:
         assert result.data["doc"] == []
         # The subprocess returns the raw result; processing happens in process_files
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_process_files_handles_empty_doc_rows(self, mock_subprocess, tmp_path):
         """Test that process_files correctly handles empty doc_rows from Docling."""
         # Create a test image file
@@ -101,7 +101,7 @@ class TestDoclingEmptyTextExtraction:
         data_item = result[0].data[0]
         assert "text" in data_item.data or "info" in data_item.data
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_load_files_dataframe_with_empty_text_image(self, mock_subprocess, tmp_path):
         """Test that load_files_dataframe doesn't error on images with no text."""
         test_image = tmp_path / "profile.png"
@@ -142,7 +142,7 @@ class TestDoclingEmptyTextExtraction:
         # DataFrame should not be empty - it should have placeholder data
         assert not result.empty, "DataFrame should contain placeholder data for image without text"
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_load_files_markdown_with_empty_text_image(self, mock_subprocess, tmp_path):
         """Test that load_files_markdown returns placeholder message for images with no text."""
         test_image = tmp_path / "profile.png"
@@ -187,7 +187,7 @@ class TestDoclingEmptyTextExtraction:
 class TestDoclingSubprocessErrors:
     """Tests for error handling in Docling subprocess."""
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_docling_conversion_failure(self, mock_subprocess, tmp_path):
         """Test handling of Docling conversion failure."""
         test_file = tmp_path / "bad_file.xyz"
@@ -216,7 +216,7 @@ class TestDoclingSubprocessErrors:
         assert "error" in result.data
         assert "Docling conversion failed" in result.data["error"]
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_docling_subprocess_crash(self, mock_subprocess, tmp_path):
         """Test handling of Docling subprocess crash (no output)."""
         test_file = tmp_path / "crash.pdf"
@@ -240,7 +240,7 @@ class TestDoclingSubprocessErrors:
         assert "error" in result.data
         assert "Segmentation fault" in result.data["error"] or "no output" in result.data["error"].lower()
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_docling_invalid_json_output(self, mock_subprocess, tmp_path):
         """Test handling of invalid JSON from Docling subprocess."""
         test_file = tmp_path / "test.pdf"
@@ -631,7 +631,7 @@ class TestImageContentTypeValidation:
         with pytest.raises(ValueError, match=r"\.png.*JPEG"):
             component.process_files([base_file])
 
-    @patch("subprocess.run")
+    @patch("lfx.base.data.docling_pool.DoclingWorkerPool.run")
     def test_process_files_silent_mode_skips_mismatched_image(self, mock_subprocess, tmp_path):
         """Test that process_files in silent mode logs but doesn't raise for mismatched images."""
         # Create a JPEG file but with .png extension
@@ -1,8 +1,12 @@
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+from fastapi import HTTPException
 from langflow.helpers.flow import (
+    clear_flow_cache,
+    get_flow_by_id_or_endpoint_name,
     get_flow_by_id_or_name,
     list_flows,
     list_flows_by_flow_folder,
@@ -10,6 +14,7 @@ from langflow.helpers.flow import (
 )
 from langflow.schema.data import Data
 from langflow.services.database.models.flow.model import Flow
+from langflow.services.deps import session_scope
 
 
 class TestListFlows:
@@ -230,3 +235,52 @@ class TestGetFlowByIdOrName:
             assert isinstance(result, Data)
             # The query should have been made with flow_id (checking it was called)
             mock_session.exec.assert_called_once()
+
+
+class TestGetFlowByIdOrEndpointName:
+    """Test get_flow_by_id_or_endpoint_name and its flow cache."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_flow_cache(self):
+        clear_flow_cache()
+        yield
+        clear_flow_cache()
+
+    async def test_cached_flow_is_reloaded_when_updated(self, flow):
+        first = await get_flow_by_id_or_endpoint_name(str(flow.id))
+        first.data["nodes"].clear()
+
+        with patch("langflow.helpers.flow.FlowRead.model_validate") as mock_validate:
+            cached = await get_flow_by_id_or_endpoint_name(str(flow.id))
+            mock_validate.assert_not_called()
+        assert cached.data["nodes"]  # Changes made by callers don't reach the cache
+
+        async with session_scope() as session:
+            db_flow = await session.get(Flow, flow.id)
+            db_flow.name = "renamed_flow"
+            db_flow.updated_at = datetime.now(timezone.utc)
+            session.add(db_flow)
+
+        updated = await get_flow_by_id_or_endpoint_name(str(flow.id))
+        assert updated.name == "renamed_flow"
+
+    async def test_endpoint_name_is_resolved_per_user(self, flow, active_user):
+        async with session_scope() as session:
+            db_flow = await session.get(Flow, flow.id)
+            db_flow.endpoint_name = "cached-endpoint"
+            db_flow.updated_at = datetime.now(timezone.utc)
+            session.add(db_flow)
+
+        result = await get_flow_by_id_or_endpoint_name("cached-endpoint", active_user.id)
+        assert result.id == flow.id
+
+        with pytest.raises(HTTPException):
+            await get_flow_by_id_or_endpoint_name("cached-endpoint", uuid4())
+
+    async def test_deleted_flow_is_not_found(self, flow):
+        await get_flow_by_id_or_endpoint_name(str(flow.id))
+        async with session_scope() as session:
+            await session.delete(await session.get(Flow, flow.id))
+
+        with pytest.raises(HTTPException):
+            await get_flow_by_id_or_endpoint_name(str(flow.id))
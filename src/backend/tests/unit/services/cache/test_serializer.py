@@ -0,0 +1,68 @@
+import pickle
+
+import dill
+import pytest
+from langflow.schema.data import Data
+from langflow.schema.message import Message
+from langflow.services.cache.disk import AsyncDiskCache
+from langflow.services.cache.serializer import CacheSerializer
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"a": 1, "b": [1, 2, 3]},
+        Data(data={"text": "hello"}),
+        Message(text="hello", sender="User", sender_name="User"),
+        "text",
+        b"bytes",
+    ],
+)
+def test_serializer_round_trip(value):
+    serializer = CacheSerializer()
+
+    data = serializer.dumps(value)
+
+    assert serializer.loads(data) == value
+    stats = serializer.get_stats()[type(value).__name__]
+    assert stats.dumps == 1
+    assert stats.loads == 1
+    assert stats.dill_fallbacks == 0
+
+
+def test_serializer_falls_back_to_dill():
+    serializer = CacheSerializer()
+
+    value = serializer.loads(serializer.dumps({"function": lambda x: x + 1}))
+
+    assert value["function"](1) == 2
+    assert serializer.get_stats()["dict"].dill_fallbacks == 1
+
+
+def test_serializer_compresses_large_values():
+    serializer = CacheSerializer(compression_threshold=1024)
+    value = {"text": "a" * 100_000}
+
+    data = serializer.dumps(value)
+
+    assert len(data) < 1024
+    assert serializer.loads(data) == value
+    assert serializer.get_stats()["dict"].compressed == 1
+
+
+@pytest.mark.parametrize("dumps", [pickle.dumps, dill.dumps])
+def test_serializer_loads_values_without_format_byte(dumps):
+    assert CacheSerializer().loads(dumps({"a": 1})) == {"a": 1}
+
+
+async def test_disk_cache_uses_serializer(tmp_path):
+    serializer = CacheSerializer()
+    cache = AsyncDiskCache(cache_dir=tmp_path, serializer=serializer)
+
+    await cache.set("key", b"bytes")
+    await cache.set("message", Message(text="hello", sender="User", sender_name="User"))
+
+    assert await cache.get("key") == b"bytes"
+    assert (await cache.get("message")).text == "hello"
+    assert serializer.get_stats()["Message"].loads == 1
+    await cache.teardown()
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from langflow.services.cache.service import AsyncInMemoryCache, ThreadingInMemoryCache
+from lfx.services.cache.utils import CACHE_MISS, approximate_size
+
+
+def test_approximate_size_follows_references():
+    small = approximate_size({"text": "a"})
+    large = approximate_size({"text": "a" * 10_000, "nested": [{"text": "b" * 10_000}]})
+
+    assert large - small > 20_000
+
+
+def test_threading_cache_evicts_by_bytes():
+    cache = ThreadingInMemoryCache(max_bytes=30_000)
+
+    cache.set("a", "a" * 10_000)
+    cache.set("b", "b" * 10_000)
+    assert cache.get("a") == "a" * 10_000
+    cache.set("c", "c" * 10_000)
+
+    # "b" is the least recently used item
+    assert cache.get("b") is CACHE_MISS
+    assert cache.get("a") is not CACHE_MISS
+    stats = cache.get_stats()
+    assert stats.evictions == 1
+    assert stats.items == 2
+    assert 20_000 < stats.bytes <= 30_000
+    assert stats.hits == 2
+    assert stats.misses == 1
+
+    cache.delete("a")
+    cache.delete("c")
+    assert cache.get_stats().bytes == 0
+
+
+def test_threading_cache_sweeps_expired_items():
+    cache = ThreadingInMemoryCache(expiration_time=0.05, sweep_interval=0.05)
+    cache.set("a", 1)
+
+    deadline = time.monotonic() + 2
+    while len(cache) and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert len(cache) == 0
+    assert cache.get_stats().expirations == 1
+    asyncio.run(cache.teardown())
+
+
+async def test_async_cache_evicts_by_bytes_and_sweeps_expired_items():
+    cache = AsyncInMemoryCache(expiration_time=0.05, max_bytes=15_000, sweep_interval=0.05)
+
+    await cache.set("a", "a" * 10_000)
+    await cache.set("b", "b" * 10_000)
+    assert await cache.get("a") is CACHE_MISS
+    assert cache.get_stats().evictions == 1
+
+    await asyncio.sleep(0.2)
+
+    assert not await cache.contains("b")
+    stats = cache.get_stats()
+    assert stats.expirations == 1
+    assert stats.items == 0
+    assert stats.bytes == 0
+    await cache.teardown()
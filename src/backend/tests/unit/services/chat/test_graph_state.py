@@ -0,0 +1,93 @@
+import pytest
+from langflow.services.cache.disk import AsyncDiskCache
+from langflow.services.cache.service import AsyncInMemoryCache
+from langflow.services.chat import service as chat_service_module
+from langflow.services.chat.service import ChatService
+from lfx.components.input_output import TextInputComponent, TextOutputComponent
+from lfx.graph import Graph
+from lfx.services.cache.utils import CacheMiss
+
+
+def _text_graph() -> Graph:
+    text_input = TextInputComponent(_id="text_input")
+    text_input.set(input_value="hello")
+    text_output = TextOutputComponent(_id="text_output")
+    text_output.set(input_value=text_input.text_response)
+    payload = Graph(text_input, text_output).dump()
+    graph = Graph.from_payload(payload, flow_id="flow")
+    graph.prepare()
+    graph.set_run_id("run")
+    return graph
+
+
+@pytest.fixture
+def chat_service(monkeypatch, tmp_path):
+    monkeypatch.setattr(chat_service_module, "get_cache_service", lambda: AsyncDiskCache(cache_dir=tmp_path))
+    return ChatService()
+
+
+@pytest.fixture
+def set_cache_keys(chat_service, monkeypatch):
+    keys = []
+    set_cache = chat_service.set_cache
+
+    async def recording_set_cache(key, data, lock=None):
+        keys.append(key)
+        return await set_cache(key, data, lock=lock)
+
+    monkeypatch.setattr(chat_service, "set_cache", recording_set_cache)
+    return keys
+
+
+async def test_graph_state_only_writes_built_vertex_and_run_state(chat_service, set_cache_keys):
+    graph = _text_graph()
+    await chat_service.set_graph_state(graph)
+    assert set_cache_keys == ["graph_state:flow:run:topology", "graph_state:flow"]
+
+    set_cache_keys.clear()
+    await graph.build_vertex("text_input")
+    await graph.get_next_runnable_vertices(graph.lock, graph.get_vertex("text_input"), cache=False)
+    await chat_service.set_graph_state(graph, vertex_ids=["text_input"])
+    assert set_cache_keys == ["graph_state:flow:run:text_input", "graph_state:flow"]
+
+
+async def test_graph_state_rebuilds_graph(chat_service):
+    graph = _text_graph()
+    await chat_service.set_graph_state(graph)
+    await graph.build_vertex("text_input")
+    next_vertices = await graph.get_next_runnable_vertices(graph.lock, graph.get_vertex("text_input"), cache=False)
+    await chat_service.set_graph_state(graph, vertex_ids=["text_input"])
+
+    cached_graph = await chat_service.get_graph_state("flow")
+
+    assert cached_graph is not graph
+    assert cached_graph.run_id == "run"
+    assert cached_graph.run_manager.to_dict() == graph.run_manager.to_dict()
+    assert cached_graph.vertices_to_run == graph.vertices_to_run
+    text_input = cached_graph.get_vertex("text_input")
+    assert text_input.built
+    assert text_input.results == graph.get_vertex("text_input").results
+
+    # The successor builds from the cached result of its predecessor
+    assert next_vertices == ["text_output"]
+    await cached_graph.build_vertex("text_output")
+    assert cached_graph.get_vertex("text_output").results["text"].text == "hello"
+
+
+async def test_clear_graph_state(chat_service):
+    graph = _text_graph()
+    await chat_service.set_graph_state(graph)
+    await chat_service.clear_graph_state("flow")
+
+    assert isinstance(await chat_service.get_graph_state("flow"), CacheMiss)
+    assert isinstance(await chat_service.get_cache("graph_state:flow:run:topology"), CacheMiss)
+
+
+async def test_in_memory_cache_stores_the_graph(monkeypatch):
+    monkeypatch.setattr(chat_service_module, "get_cache_service", AsyncInMemoryCache)
+    chat_service = ChatService()
+    graph = _text_graph()
+
+    await chat_service.set_graph_state(graph, vertex_ids=[])
+
+    assert await chat_service.get_graph_state("flow") is graph
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from langflow.services.database.log_buffer import DatabaseLogBuffer
+from langflow.services.database.models.transactions.model import TransactionBase, TransactionTable
+from langflow.services.database.models.vertex_builds.model import VertexBuildBase, VertexBuildTable
+from langflow.services.deps import session_scope
+from sqlmodel import select
+
+
+def _vertex_build(flow_id, vertex_id="vertex", offset=0):
+    return VertexBuildBase(
+        id=vertex_id,
+        flow_id=flow_id,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=offset),
+        valid=True,
+    )
+
+
+def _transaction(flow_id, offset=0):
+    return TransactionBase(
+        vertex_id="vertex",
+        flow_id=flow_id,
+        status="success",
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=offset),
+    )
+
+
+async def _vertex_builds(flow_id):
+    async with session_scope() as session:
+        return list(await session.exec(select(VertexBuildTable).where(VertexBuildTable.flow_id == flow_id)))
+
+
+async def _transactions(flow_id):
+    async with session_scope() as session:
+        return list(await session.exec(select(TransactionTable).where(TransactionTable.flow_id == flow_id)))
+
+
+@pytest.mark.usefixtures("client")
+async def test_flushes_when_batch_is_full():
+    buffer = DatabaseLogBuffer(batch_size=2, flush_interval=60, retention_interval=3600)
+    flow_id = uuid4()
+
+    buffer.add_vertex_build(_vertex_build(flow_id))
+    await asyncio.sleep(0.1)
+    assert len(buffer) == 1
+    assert await _vertex_builds(flow_id) == []
+
+    buffer.add_transaction(_transaction(flow_id))
+    for _ in range(50):
+        if not len(buffer):
+            break
+        await asyncio.sleep(0.05)
+
+    assert len(await _vertex_builds(flow_id)) == 1
+    assert len(await _transactions(flow_id)) == 1
+    await buffer.stop()
+
+
+@pytest.mark.usefixtures("client")
+async def test_stop_writes_remaining_records_and_deletes_old_ones(monkeypatch):
+    from langflow.services.deps import get_settings_service
+
+    settings = get_settings_service().settings
+    monkeypatch.setattr(settings, "max_vertex_builds_per_vertex", 2)
+    monkeypatch.setattr(settings, "max_transactions_to_keep", 3)
+    buffer = DatabaseLogBuffer(batch_size=100, flush_interval=60, retention_interval=3600)
+    flow_id = uuid4()
+
+    for offset in range(5):
+        buffer.add_vertex_build(_vertex_build(flow_id, offset=offset))
+        buffer.add_transaction(_transaction(flow_id, offset=offset))
+    await buffer.stop()
+
+    assert len(buffer) == 0
+    builds = await _vertex_builds(flow_id)
+    assert sorted(build.timestamp.second for build in builds) == [3, 4]
+    transactions = await _transactions(flow_id)
+    assert sorted(transaction.timestamp.second for transaction in transactions) == [2, 3, 4]
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+
+import pytest
+from langflow.services.job_queue.backends import (
+    InMemoryJobEventBackend,
+    JobEventsExpiredError,
+    RedisJobEventBackend,
+)
+from langflow.services.job_queue.event_queue import JobEventQueue
+from langflow.services.job_queue.service import JobQueueNotFoundError, JobQueueService
+
+
+class FakeRedisStreams:
+    """Local stand-in for the Redis stream commands used by RedisJobEventBackend."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[bytes, dict]]] = {}
+        self.group_positions: dict[str, int] = {}
+        self.expirations: dict[str, int] = {}
+        self._changed = asyncio.Event()
+
+    async def xgroup_create(self, name, groupname, id="$", *, mkstream=False):  # noqa: A002, ARG002
+        from redis.exceptions import ResponseError
+
+        if name in self.group_positions:
+            msg = "BUSYGROUP Consumer Group name already exists"
+            raise ResponseError(msg)
+        self.streams.setdefault(name, [])
+        self.group_positions[name] = 0
+
+    async def expire(self, name, seconds):
+        self.expirations[name] = seconds
+        return True
+
+    def pipeline(self, *, transaction=True):  # noqa: ARG002
+        return FakePipeline(self)
+
+    async def xadd(self, name, fields):
+        stream = self.streams.setdefault(name, [])
+        event_id = f"{len(stream) + 1}-0".encode()
+        stream.append((event_id, fields))
+        self._changed.set()
+        return event_id
+
+    async def _wait(self, block):
+        if block:
+            self._changed.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._changed.wait(), block / 1000)
+
+    async def xreadgroup(self, groupname, consumername, streams, count=None, block=None, *, noack=False):  # noqa: ARG002
+        ((name, _),) = streams.items()
+        if len(self.streams.get(name, [])) <= self.group_positions[name]:
+            await self._wait(block)
+        entries = self.streams.get(name, [])[self.group_positions[name] :]
+        self.group_positions[name] += len(entries)
+        return [[name.encode(), entries]] if entries else []
+
+    async def xread(self, streams, count=None, block=None):  # noqa: ARG002
+        ((name, offset),) = streams.items()
+        position = int(offset.split("-")[0])
+        if len(self.streams.get(name, [])) <= position:
+            await self._wait(block)
+        entries = self.streams.get(name, [])[position:]
+        return [[name.encode(), entries]] if entries else []
+
+    async def xinfo_stream(self, name):
+        from redis.exceptions import ResponseError
+
+        if name not in self.streams:
+            msg = "ERR no such key"
+            raise ResponseError(msg)
+        stream = self.streams[name]
+        return {"first-entry": stream[0] if stream else None, "max-deleted-entry-id": "0-0"}
+
+    async def exists(self, *names):
+        return sum(name in self.streams for name in names)
+
+    async def delete(self, *names):
+        for name in names:
+            self.streams.pop(name, None)
+            self.group_positions.pop(name, None)
+
+    async def aclose(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedisStreams) -> None:
+        self.client = client
+        self.commands: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def xadd(self, name, fields, maxlen=None, *, approximate=True):  # noqa: ARG002
+        self.commands.append(self.client.xadd(name, fields))
+        return self
+
+    def expire(self, name, seconds):
+        self.commands.append(self.client.expire(name, seconds))
+        return self
+
+    async def execute(self):
+        return [await command for command in self.commands]
+
+
+async def _build(event_manager, *, fail: bool = False):
+    event_manager.on_build_start(data={"id": "a"})
+    event_manager.on_build_end(data={"id": "a"})
+    if fail:
+        msg = "build failed"
+        raise ValueError(msg)
+    event_manager.on_end(data={})
+    await event_manager.queue.put((None, None, 0))
+
+
+async def _read_all(service: JobQueueService, job_id: str, offset: str | None = None) -> list:
+    events: list = []
+    while not events or events[-1].data is not None:
+        new_events = await service.get_events(job_id, offset)
+        events.extend(new_events)
+        offset = new_events[-1].id if offset is not None else None
+    return events
+
+
+@pytest.fixture
+async def service():
+    service = JobQueueService()
+    service.start()
+    yield service
+    await service.stop()
+
+
+async def test_events_are_consumed_once(service):
+    _, event_manager = service.create_queue("job")
+    service.start_job("job", _build(event_manager))
+
+    events = await _read_all(service, "job")
+
+    assert [json.loads(event.data)["event"] for event in events[:-1]] == ["build_start", "build_end", "end"]
+    assert [event.type for event in events[:-1]] == ["build_start", "build_end", "end"]
+    assert events[-1].data is None
+    assert await service.get_events("job", wait=False) == []
+
+
+async def test_events_are_replayed_from_offset(service):
+    _, event_manager = service.create_queue("job")
+    service.start_job("job", _build(event_manager))
+    events = await _read_all(service, "job")
+
+    replayed = await service.get_events("job", events[0].id)
+
+    assert replayed == events[1:]
+
+
+async def test_replay_keeps_the_last_events():
+    backend = InMemoryJobEventBackend(max_events=2)
+    await backend.append("job", [("token", b"a"), ("token", b"b"), ("end", b"c")])
+
+    assert [event.data for event in await backend.read("job", "0")] == [b"b", b"c"]
+    assert [event.id for event in await backend.read("job")] == ["1", "2"]
+    # Resuming from an event whose next event was dropped would skip it
+    await backend.append("job", [("end", b"d")])
+    with pytest.raises(JobEventsExpiredError):
+        await backend.read("job", "0")
+    assert [event.data for event in await backend.read("job", "1")] == [b"c", b"d"]
+
+
+async def test_invalid_offset_is_rejected(service):
+    service.create_queue("job")
+
+    with pytest.raises(ValueError, match="Invalid event ID"):
+        await service.get_events("job", "not-an-id")
+
+
+async def test_failed_job_ends_its_stream(service):
+    _, event_manager = service.create_queue("job")
+    service.start_job("job", _build(event_manager, fail=True))
+
+    events = await _read_all(service, "job")
+
+    assert len(events) == 3
+    assert events[-1].data is None
+    with pytest.raises(ValueError, match="build failed"):
+        await service.get_job_task("job")
+
+
+async def test_cleaned_up_job_is_not_found(service):
+    _, event_manager = service.create_queue("job")
+    service.start_job("job", _build(event_manager))
+    await _read_all(service, "job")
+
+    await service.cleanup_job("job")
+
+    assert not await service.job_exists("job")
+    with pytest.raises(JobQueueNotFoundError):
+        await service.get_events("job")
+
+
+async def _stream_message(event_manager, chunks: int):
+    event_manager.on_build_start(data={"id": "a"})
+    for index in range(chunks):
+        event_manager.on_token(data={"chunk": str(index), "id": "message"})
+    event_manager.on_end(data={})
+    await event_manager.queue.put((None, None, 0))
+
+
+async def test_tokens_are_coalesced_when_readers_fall_behind():
+    service = JobQueueService(max_queue_size=3, overflow_policy="coalesce_tokens")
+    queue, event_manager = service.create_queue("job")
+    service.start_job("job", _stream_message(event_manager, 10))
+    await service.get_job_task("job")
+
+    events = await _read_all(service, "job")
+
+    payloads = [json.loads(event.data) for event in events[:-1]]
+    assert payloads[0]["event"] == "build_start"
+    assert payloads[-1]["event"] == "end"
+    assert "".join(payload["data"]["chunk"] for payload in payloads if payload["event"] == "token") == "0123456789"
+    assert len(events) < 13
+    assert service.get_queue_metrics("job")["coalesced_events"] == queue.coalesced_events > 0
+    await service.stop()
+
+
+def _token(chunk: str, message_id: str = "message") -> bytes:
+    return json.dumps({"event": "token", "data": {"chunk": chunk, "id": message_id}}).encode() + b"\n\n"
+
+
+async def test_coalesced_tokens_are_merged_when_dequeued():
+    queue = JobEventQueue(max_size=1, overflow_policy="coalesce_tokens")
+    for index in range(5):
+        queue.put_nowait((f"token-{index}", _token(str(index)), 0))
+    queue.put_nowait(("token-5", _token("x", "other"), 0))
+
+    assert queue.qsize() == 2
+    assert queue.coalesced_events == 4
+    event_id, data, _ = queue.get_nowait()
+    assert event_id == "token-0"
+    assert json.loads(data)["data"] == {"chunk": "01234", "id": "message"}
+    assert queue.get_nowait()[1] == _token("x", "other")
+    assert queue.pending_bytes == 0
+
+
+async def test_tokens_are_dropped_but_other_events_kept():
+    queue = JobEventQueue(max_size=2, overflow_policy="drop_tokens")
+    queue.put_nowait(("token-0", b"a", 0))
+    queue.put_nowait(("build_end-0", b"bb", 0))
+    queue.put_nowait(("token-1", b"c", 0))
+    queue.put_nowait(("end-0", b"d", 0))
+
+    assert [queue.get_nowait()[0] for _ in range(queue.qsize())] == ["token-0", "build_end-0", "end-0"]
+    assert queue.metrics == {
+        "pending_events": 0,
+        "pending_bytes": 0,
+        "max_pending_bytes": 4,
+        "dropped_events": 1,
+        "coalesced_events": 0,
+    }
+
+
+async def test_block_policy_waits_for_space():
+    queue = JobEventQueue(max_size=1, overflow_policy="block", block_timeout=0.01)
+    queue.put_nowait(("token-0", b"a", 0))
+    queue.put_nowait(("token-1", b"b", 0))
+
+    with pytest.raises(TimeoutError):
+        await queue.wait_for_space()
+    queue.get_nowait()
+    queue.get_nowait()
+    await queue.wait_for_space()
+
+
+async def test_redis_backend_shares_events_between_workers():
+    pytest.importorskip("redis")
+    client = FakeRedisStreams()
+    worker = JobQueueService(backend=RedisJobEventBackend(client=client, expiration_time=60))
+    other_worker = JobQueueService(backend=RedisJobEventBackend(client=client, expiration_time=60))
+    _, event_manager = worker.create_queue("job")
+    worker.start_job("job", _build(event_manager))
+    # Let the worker create the stream of the job
+    await asyncio.sleep(0)
+
+    events = await _read_all(other_worker, "job")
+
+    assert len(events) == 4
+    assert [event.type for event in events] == ["build_start", "build_end", "end", None]
+    assert await worker.get_events("job", wait=False) == []
+    assert await other_worker.get_events("job", events[1].id) == events[2:]
+    assert client.expirations["langflow:job_events:job"] == 60
+    await worker.stop()
@@ -142,6 +142,55 @@ class TestLocalStorageServiceFileOperations:
         assert retrieved == data
 
 
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+class TestLocalStorageServiceStreaming:
+    """Test streaming files in and out of LocalStorageService."""
+
+    async def test_save_file_stream(self, local_storage_service):
+        """Test saving a file from chunks, then appending to it."""
+        await local_storage_service.save_file("stream_flow", "stream.txt", b"original")
+        await local_storage_service.save_file_stream("stream_flow", "stream.txt", _chunks(b"Hello, ", b"World"))
+        await local_storage_service.save_file_stream("stream_flow", "stream.txt", _chunks(b"!"), append=True)
+
+        assert await local_storage_service.get_file("stream_flow", "stream.txt") == b"Hello, World!"
+        assert await local_storage_service.list_files("stream_flow") == ["stream.txt"]
+
+    async def test_failed_save_file_stream_keeps_the_existing_file(self, local_storage_service):
+        """Test that a failed upload leaves neither a partial file nor a temporary file."""
+
+        async def failing_chunks():
+            yield b"partial"
+            msg = "connection lost"
+            raise ConnectionError(msg)
+
+        await local_storage_service.save_file("stream_flow", "stream.txt", b"original")
+
+        with pytest.raises(ConnectionError):
+            await local_storage_service.save_file_stream("stream_flow", "stream.txt", failing_chunks())
+
+        assert await local_storage_service.get_file("stream_flow", "stream.txt") == b"original"
+        assert await local_storage_service.list_files("stream_flow") == ["stream.txt"]
+
+    async def test_get_file_stream_range(self, local_storage_service):
+        """Test streaming a byte range of a file."""
+        await local_storage_service.save_file("stream_flow", "range.bin", bytes(range(100)))
+
+        chunks = [
+            chunk
+            async for chunk in local_storage_service.get_file_stream(
+                "stream_flow", "range.bin", chunk_size=16, start=10, end=50
+            )
+        ]
+
+        assert b"".join(chunks) == bytes(range(10, 50))
+        assert max(len(chunk) for chunk in chunks) == 16
+
+
 @pytest.mark.asyncio
 class TestLocalStorageServiceListOperations:
     """Test list operations in LocalStorageService."""
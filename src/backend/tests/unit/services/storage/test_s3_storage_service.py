@@ -0,0 +1,248 @@
+"""Tests for S3StorageService against an in-memory S3 stand-in."""
+
+import asyncio
+import sys
+from types import ModuleType
+from unittest.mock import Mock
+
+import pytest
+from langflow.services.storage import s3
+from langflow.services.storage.s3 import S3StorageService
+from lfx.utils.async_helpers import run_until_complete
+
+
+class FakeClientError(Exception):
+    """Mimics botocore's ClientError, which carries the S3 error in `response`."""
+
+    def __init__(self, code: str, message: str = ""):
+        super().__init__(f"{code}: {message}")
+        self.response = {"Error": {"Code": code, "Message": message}}
+
+
+class FakeBody:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def read(self) -> bytes:
+        return self._data
+
+
+class FakeS3Client:
+    """In-memory S3 client implementing the operations used by S3StorageService."""
+
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = objects
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.delete_requests: list[list[str]] = []
+        self.denied_keys: set[str] = set()
+        self.closed = False
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    def _check_loop(self) -> None:
+        # Like aiohttp connections, the client only works on the event loop it was opened on
+        if asyncio.get_running_loop() is not self.loop:
+            msg = "client used on another event loop"
+            raise RuntimeError(msg)
+
+    async def put_object(self, *, Bucket, Key, Body, **_):  # noqa: N803, ARG002
+        self._check_loop()
+        self.objects[Key] = Body
+
+    async def get_object(self, *, Bucket, Key, **_):  # noqa: N803, ARG002
+        self._check_loop()
+        if Key not in self.objects:
+            code = "NoSuchKey"
+            raise FakeClientError(code)
+        return {"Body": FakeBody(self.objects[Key])}
+
+    async def delete_object(self, *, Bucket, Key):  # noqa: N803, ARG002
+        self.objects.pop(Key, None)
+
+    async def delete_objects(self, *, Bucket, Delete):  # noqa: N803, ARG002
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        self.delete_requests.append(keys)
+        errors = []
+        for key in keys:
+            if key in self.denied_keys:
+                errors.append({"Key": key, "Code": "AccessDenied", "Message": "Access Denied"})
+            else:
+                self.objects.pop(key, None)
+        return {"Errors": errors} if errors else {}
+
+    async def create_multipart_upload(self, *, Bucket, Key, **_):  # noqa: N803, ARG002
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    async def upload_part(self, *, Bucket, Key, UploadId, PartNumber, Body):  # noqa: N803, ARG002
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    async def complete_multipart_upload(self, *, Bucket, Key, UploadId, MultipartUpload):  # noqa: N803, ARG002
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(parts[part["PartNumber"]] for part in MultipartUpload["Parts"])
+
+    async def abort_multipart_upload(self, *, Bucket, Key, UploadId):  # noqa: N803, ARG002
+        self.uploads.pop(UploadId, None)
+
+
+class FakeClientContext:
+    def __init__(self, client: FakeS3Client):
+        self.client = client
+
+    async def __aenter__(self) -> FakeS3Client:
+        self.client.loop = asyncio.get_running_loop()
+        return self.client
+
+    async def __aexit__(self, *exc) -> None:
+        self.client.closed = True
+
+
+class FakeSession:
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.clients: list[FakeS3Client] = []
+
+    def client(self, service_name: str) -> FakeClientContext:
+        assert service_name == "s3"
+        client = FakeS3Client(self.objects)
+        self.clients.append(client)
+        return FakeClientContext(client)
+
+
+@pytest.fixture
+def fake_aioboto3(monkeypatch):
+    module = ModuleType("aioboto3")
+    module.Session = FakeSession
+    monkeypatch.setitem(sys.modules, "aioboto3", module)
+    return module
+
+
+@pytest.fixture
+async def s3_storage_service(fake_aioboto3, tmp_path):  # noqa: ARG001
+    settings_service = Mock()
+    settings_service.settings.config_dir = str(tmp_path)
+    settings_service.settings.object_storage_bucket_name = "test-bucket"
+    settings_service.settings.object_storage_prefix = "files"
+    settings_service.settings.object_storage_tags = {}
+    service = S3StorageService(Mock(), settings_service)
+    yield service
+    await service.teardown()
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+class TestS3StorageServiceClient:
+    """Test the lifecycle of the S3 client."""
+
+    async def test_client_is_shared_by_operations(self, s3_storage_service):
+        await s3_storage_service.save_file("flow", "a.txt", b"a")
+        await s3_storage_service.save_file("flow", "b.txt", b"b")
+        assert await s3_storage_service.get_file("flow", "a.txt") == b"a"
+        await s3_storage_service.delete_file("flow", "b.txt")
+
+        assert len(s3_storage_service.session.clients) == 1
+        assert s3_storage_service.session.objects == {"files/flow/a.txt": b"a"}
+
+    async def test_teardown_closes_client(self, s3_storage_service):
+        await s3_storage_service.save_file("flow", "a.txt", b"a")
+        client = s3_storage_service.session.clients[0]
+
+        await s3_storage_service.teardown()
+
+        assert client.closed is True
+        # A new client is created if the service is used after teardown
+        assert await s3_storage_service.get_file("flow", "a.txt") == b"a"
+        assert len(s3_storage_service.session.clients) == 2
+
+    async def test_get_file_from_another_event_loop(self, s3_storage_service):
+        await s3_storage_service.save_file("flow", "a.txt", b"a")
+        shared_client = s3_storage_service.session.clients[0]
+
+        # Sync callers run the coroutine on a new event loop in a worker thread
+        assert run_until_complete(s3_storage_service.get_file("flow", "a.txt")) == b"a"
+        assert run_until_complete(s3_storage_service.get_file("flow", "a.txt")) == b"a"
+
+        per_call_clients = s3_storage_service.session.clients[1:]
+        assert len(per_call_clients) == 2
+        assert all(client.closed for client in per_call_clients)
+        assert shared_client.closed is False
+        assert await s3_storage_service.get_file("flow", "a.txt") == b"a"
+        assert len(s3_storage_service.session.clients) == 3
+
+    async def test_client_of_closed_event_loop_is_replaced(self, s3_storage_service):
+        # The first operation runs on the temporary loop of a sync caller, which then closes
+        await asyncio.to_thread(asyncio.run, s3_storage_service.save_file("flow", "a.txt", b"a"))
+
+        assert await s3_storage_service.get_file("flow", "a.txt") == b"a"
+        assert await s3_storage_service.get_file("flow", "a.txt") == b"a"
+        assert len(s3_storage_service.session.clients) == 2
+
+    async def test_teardown_without_client(self, s3_storage_service):
+        await s3_storage_service.teardown()
+        assert s3_storage_service.session.clients == []
+
+
+@pytest.mark.asyncio
+class TestS3StorageServiceBulkOperations:
+    """Test the bulk operations of S3StorageService."""
+
+    async def test_delete_files_in_batches(self, s3_storage_service):
+        file_names = [f"{i}.txt" for i in range(s3.DELETE_OBJECTS_BATCH_SIZE + 5)]
+        for file_name in file_names:
+            s3_storage_service.session.objects[f"files/flow/{file_name}"] = b"x"
+
+        failures = await s3_storage_service.delete_files("flow", file_names)
+
+        assert failures == {}
+        assert s3_storage_service.session.objects == {}
+        client = s3_storage_service.session.clients[0]
+        assert sorted(len(request) for request in client.delete_requests) == [5, s3.DELETE_OBJECTS_BATCH_SIZE]
+
+    async def test_delete_files_reports_errors_per_file(self, s3_storage_service):
+        await s3_storage_service.save_file("flow", "kept.txt", b"k")
+        await s3_storage_service.save_file("flow", "gone.txt", b"g")
+        s3_storage_service.session.clients[0].denied_keys.add("files/flow/kept.txt")
+
+        failures = await s3_storage_service.delete_files("flow", ["kept.txt", "gone.txt"])
+
+        assert list(failures) == ["kept.txt"]
+        assert isinstance(failures["kept.txt"], PermissionError)
+        assert s3_storage_service.session.objects == {"files/flow/kept.txt": b"k"}
+
+    async def test_delete_files_failed_request(self, s3_storage_service, monkeypatch):
+        await s3_storage_service.save_file("flow", "a.txt", b"a")
+        client = s3_storage_service.session.clients[0]
+
+        async def denied(**_):
+            code = "AccessDenied"
+            raise FakeClientError(code, "Access Denied")
+
+        monkeypatch.setattr(client, "delete_objects", denied)
+
+        failures = await s3_storage_service.delete_files("flow", ["a.txt"])
+
+        assert isinstance(failures["a.txt"], PermissionError)
+
+    async def test_get_files(self, s3_storage_service):
+        await s3_storage_service.save_file("flow", "a.txt", b"a")
+        await s3_storage_service.save_file("flow", "b.txt", b"b")
+
+        assert await s3_storage_service.get_files("flow", ["a.txt", "b.txt"], max_concurrency=1) == {
+            "a.txt": b"a",
+            "b.txt": b"b",
+        }
+        with pytest.raises(FileNotFoundError):
+            await s3_storage_service.get_files("flow", ["a.txt", "missing.txt"])
+
+    async def test_save_file_stream_multipart(self, s3_storage_service, monkeypatch):
+        monkeypatch.setattr(s3, "MULTIPART_PART_SIZE", 4)
+
+        await s3_storage_service.save_file_stream("flow", "big.bin", _chunks(b"abc", b"def", b"ghij", b"k"))
+
+        assert s3_storage_service.session.objects == {"files/flow/big.bin": b"abcdefghijk"}
+        assert s3_storage_service.session.clients[0].uploads == {}
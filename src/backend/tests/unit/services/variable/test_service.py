@@ -3,10 +3,11 @@ from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
+from langflow.services.auth.utils import decrypt_api_key
 from langflow.services.database.models.variable.model import VariableUpdate
 from langflow.services.deps import get_settings_service
 from langflow.services.variable.constants import CREDENTIAL_TYPE
-from langflow.services.variable.service import DatabaseVariableService
+from langflow.services.variable.service import DatabaseVariableService, VariableValue
 from lfx.services.settings.constants import VARIABLES_TO_GET_FROM_ENVIRONMENT
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import SQLModel
@@ -240,3 +241,29 @@ async def test_create_variable(service, session: AsyncSession):
     assert result.type == CREDENTIAL_TYPE
     assert isinstance(result.created_at, datetime)
     assert isinstance(result.updated_at, datetime)
+
+
+async def test_get_variables_by_names(service, session: AsyncSession):
+    user_id = uuid4()
+    await service.create_variable(user_id, "name1", "value1", session=session)
+    await service.create_variable(user_id, "name2", "value2", type_="Generic", session=session)
+
+    with patch("langflow.services.variable.service.auth_utils.decrypt_api_key", wraps=decrypt_api_key) as decrypt:
+        variables = await service.get_variables_by_names(user_id, ["name1", "name2", "missing"], session=session)
+        assert await service.get_variable(user_id, "name1", "", session=session) == "value1"
+
+    assert variables == {
+        "name1": VariableValue(type=CREDENTIAL_TYPE, value="value1"),
+        "name2": VariableValue(type="Generic", value="value2"),
+    }
+    assert decrypt.call_count == 2
+
+
+async def test_get_variable__cache_invalidated_on_update(service, session: AsyncSession):
+    user_id = uuid4()
+    await service.create_variable(user_id, "name", "value", session=session)
+    assert await service.get_variable(user_id, "name", "", session=session) == "value"
+
+    await service.update_variable(user_id, "name", "new_value", session=session)
+
+    assert await service.get_variable(user_id, "name", "", session=session) == "new_value"
@@ -5,18 +5,34 @@ This module tests the check_key function behavior when:
 - API_KEY_SOURCE='env': Validates against LANGFLOW_API_KEY environment variable
 """
 
+import time
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+from langflow.services.database.models.api_key import crud
 from langflow.services.database.models.api_key.crud import (
     _check_key_from_db,
     _check_key_from_env,
     check_key,
+    clear_api_key_cache,
+    flush_api_key_usage,
+    invalidate_api_key_cache,
 )
 from langflow.services.database.models.user.model import User
 
 
+@pytest.fixture(autouse=True)
+def reset_api_key_state():
+    """Start every test with an empty API key cache and no pending usage."""
+    clear_api_key_cache()
+    crud._api_key_usage.clear()
+    yield
+    clear_api_key_cache()
+    crud._api_key_usage.clear()
+
+
 @pytest.fixture
 def mock_user():
     """Create a mock active user."""
@@ -63,6 +79,8 @@ def mock_settings_service_db():
     settings_service.auth_settings.API_KEY_SOURCE = "db"
     settings_service.auth_settings.SUPERUSER = "langflow"
     settings_service.settings.disable_track_apikey_usage = False
+    settings_service.settings.api_key_cache_ttl = 0.0
+    settings_service.settings.api_key_usage_flush_interval = 0.0
     return settings_service
 
 
@@ -73,6 +91,8 @@ def mock_settings_service_env():
     settings_service.auth_settings.API_KEY_SOURCE = "env"
     settings_service.auth_settings.SUPERUSER = "langflow"
     settings_service.settings.disable_track_apikey_usage = False
+    settings_service.settings.api_key_cache_ttl = 0.0
+    settings_service.settings.api_key_usage_flush_interval = 0.0
     return settings_service
 
 
@@ -210,7 +230,6 @@ class TestCheckKeyFromDb:
         result = await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
 
         assert result == mock_user
-        assert mock_api_key.total_uses == 1
 
     @pytest.mark.asyncio
     async def test_invalid_key_returns_none(self, mock_session, mock_settings_service_db):
@@ -225,10 +244,10 @@ class TestCheckKeyFromDb:
 
     @pytest.mark.asyncio
     async def test_usage_tracking_increments(self, mock_session, mock_user, mock_settings_service_db):
-        """API key usage should be tracked when not disabled."""
+        """API key usage should be written with a batched UPDATE when not disabled."""
         mock_api_key = MagicMock()
+        mock_api_key.id = uuid4()
         mock_api_key.user = mock_user
-        mock_api_key.total_uses = 5
 
         mock_result = MagicMock()
         mock_result.first.return_value = mock_api_key
@@ -236,9 +255,50 @@ class TestCheckKeyFromDb:
 
         await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
 
-        assert mock_api_key.total_uses == 6
-        mock_session.add.assert_called_once_with(mock_api_key)
-        mock_session.flush.assert_called_once()
+        assert mock_session.exec.call_count == 2
+        params = mock_session.exec.call_args.kwargs["params"]
+        assert [(p["key_id"], p["uses"]) for p in params] == [(mock_api_key.id, 1)]
+        mock_session.add.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_usage_tracking_is_batched(self, mock_session, mock_user, mock_settings_service_db, monkeypatch):
+        """Uses within the flush interval are counted and written together."""
+        mock_settings_service_db.settings.api_key_usage_flush_interval = 3600.0
+        mock_api_key = MagicMock()
+        mock_api_key.id = uuid4()
+        mock_api_key.user = mock_user
+
+        mock_result = MagicMock()
+        mock_result.first.return_value = mock_api_key
+        mock_session.exec.return_value = mock_result
+
+        monkeypatch.setattr(crud, "_api_key_usage_flushed_at", time.monotonic())
+        for _ in range(3):
+            await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
+        assert mock_session.exec.call_count == 3  # Lookups only
+
+        await flush_api_key_usage(mock_session)
+
+        params = mock_session.exec.call_args.kwargs["params"]
+        assert [(p["key_id"], p["uses"]) for p in params] == [(mock_api_key.id, 3)]
+
+    @pytest.mark.asyncio
+    async def test_usage_is_kept_when_flush_fails(self, mock_session):
+        """Uses are written by the next flush if a flush fails."""
+        key_id = uuid4()
+        crud._api_key_usage[key_id] = (2, datetime.now(timezone.utc))
+        mock_session.exec.side_effect = RuntimeError("database is locked")
+
+        with pytest.raises(RuntimeError, match="database is locked"):
+            await flush_api_key_usage(mock_session)
+        # A use counted after the failed flush is added to the ones not written
+        crud._api_key_usage[key_id] = (crud._api_key_usage[key_id][0] + 1, datetime.now(timezone.utc))
+        mock_session.exec.side_effect = None
+        await flush_api_key_usage(mock_session)
+
+        params = mock_session.exec.call_args.kwargs["params"]
+        assert [(p["key_id"], p["uses"]) for p in params] == [(key_id, 3)]
+        assert crud._api_key_usage == {}
 
     @pytest.mark.asyncio
     async def test_usage_tracking_disabled(self, mock_session, mock_user, mock_settings_service_db):
@@ -256,7 +316,8 @@ class TestCheckKeyFromDb:
         await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
 
         assert mock_api_key.total_uses == 5  # Not incremented
-        mock_session.add.assert_not_called()
+        assert mock_session.exec.call_count == 1
+        assert not crud._api_key_usage
 
     @pytest.mark.asyncio
     async def test_empty_key_returns_none(self, mock_session, mock_settings_service_db):
@@ -269,6 +330,33 @@ class TestCheckKeyFromDb:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_validated_key_is_cached(self, mock_session, mock_settings_service_db):
+        """A validated key should be served from the cache until it is invalidated."""
+        mock_settings_service_db.settings.api_key_cache_ttl = 60.0
+        mock_settings_service_db.settings.disable_track_apikey_usage = True
+        user = User(id=uuid4(), username="cached", password="hashed", is_active=True, optins={})  # noqa: S106
+        mock_api_key = MagicMock()
+        mock_api_key.id = uuid4()
+        mock_api_key.user_id = user.id
+        mock_api_key.user = user
+
+        mock_result = MagicMock()
+        mock_result.first.return_value = mock_api_key
+        mock_session.exec.return_value = mock_result
+
+        first = await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
+        second = await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
+
+        assert mock_session.exec.call_count == 1
+        assert first.id == second.id == user.id
+        assert second.username == "cached"
+
+        invalidate_api_key_cache(user_id=user.id)
+        await _check_key_from_db(mock_session, "sk-valid-key", mock_settings_service_db)
+
+        assert mock_session.exec.call_count == 2
+
 
 # ============================================================================
 # _check_key_from_env tests
@@ -490,6 +578,8 @@ class TestCheckKeyIntegration:
         mock_settings = MagicMock()
         mock_settings.auth_settings.API_KEY_SOURCE = "db"
         mock_settings.settings.disable_track_apikey_usage = False
+        mock_settings.settings.api_key_cache_ttl = 0.0
+        mock_settings.settings.api_key_usage_flush_interval = 0.0
 
         with patch(
             "langflow.services.database.models.api_key.crud.get_settings_service",
@@ -542,6 +632,8 @@ class TestCheckKeyIntegration:
         mock_settings.auth_settings.API_KEY_SOURCE = "env"
         mock_settings.auth_settings.SUPERUSER = "langflow"
         mock_settings.settings.disable_track_apikey_usage = False
+        mock_settings.settings.api_key_cache_ttl = 0.0
+        mock_settings.settings.api_key_usage_flush_interval = 0.0
 
         with patch(
             "langflow.services.database.models.api_key.crud.get_settings_service",
@@ -567,6 +659,8 @@ class TestCheckKeyIntegration:
         mock_settings.auth_settings.API_KEY_SOURCE = "env"
         mock_settings.auth_settings.SUPERUSER = "langflow"
         mock_settings.settings.disable_track_apikey_usage = False
+        mock_settings.settings.api_key_cache_ttl = 0.0
+        mock_settings.settings.api_key_usage_flush_interval = 0.0
 
         with patch(
             "langflow.services.database.models.api_key.crud.get_settings_service",
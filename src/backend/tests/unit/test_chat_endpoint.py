@@ -104,6 +104,61 @@ async def test_build_flow_invalid_job_id(client, logged_in_headers):
     assert "Job not found" in response.json()["detail"]
 
 
+async def test_build_flow_events_resume_from_last_event_id(client, json_memory_chatbot_no_llm, logged_in_headers):
+    """Test resuming the events of a build after the last event received."""
+    flow_id = await create_flow(client, json_memory_chatbot_no_llm, logged_in_headers)
+    job_id = (await build_flow(client, flow_id, logged_in_headers))["job_id"]
+
+    events_response = await get_build_events(client, job_id, logged_in_headers)
+    events = [json.loads(line) for line in events_response.text.splitlines() if line]
+    assert events[-1]["event"] == "end"
+    assert all("id" in event for event in events)
+
+    response = await client.get(
+        f"api/v1/build/{job_id}/events?last_event_id={events[0]['id']}",
+        headers={**logged_in_headers, "Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == codes.OK
+    assert [json.loads(line) for line in response.text.splitlines() if line] == events[1:]
+
+    response = await client.get(
+        f"api/v1/build/{job_id}/events?event_delivery=polling",
+        headers={**logged_in_headers, "Last-Event-ID": events[-2]["id"]},
+    )
+    assert [json.loads(line) for line in response.text.splitlines() if line] == events[-1:]
+
+    response = await client.get(f"api/v1/build/{job_id}/events?last_event_id=invalid", headers=logged_in_headers)
+    assert response.status_code == codes.BAD_REQUEST
+
+
+async def test_build_flow_events_formats(client, json_memory_chatbot_no_llm, logged_in_headers):
+    """Test getting the events of a build as server-sent events and as length-prefixed frames."""
+    flow_id = await create_flow(client, json_memory_chatbot_no_llm, logged_in_headers)
+    job_id = (await build_flow(client, flow_id, logged_in_headers))["job_id"]
+    events_response = await get_build_events(client, job_id, logged_in_headers)
+    events = [json.loads(line) for line in events_response.text.splitlines() if line]
+    replay_url = f"api/v1/build/{job_id}/events?last_event_id={events[0]['id']}"
+
+    response = await client.get(replay_url, headers={**logged_in_headers, "Accept": "text/event-stream"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [dict(line.split(": ", 1) for line in message.splitlines()) for message in response.text.split("\n\n")]
+    assert [message["id"] for message in messages if message] == [event["id"] for event in events[1:]]
+    assert [message["event"] for message in messages if message] == [event["event"] for event in events[1:]]
+    assert [json.loads(message["data"]) for message in messages if message] == events[1:]
+
+    response = await client.get(
+        replay_url,
+        headers={**logged_in_headers, "Accept": "application/vnd.langflow.event-frames, application/x-ndjson;q=0.5"},
+    )
+    assert response.headers["content-type"] == "application/vnd.langflow.event-frames"
+    frames, content = [], response.content
+    while content:
+        length = int.from_bytes(content[:4], "big")
+        frames.append(json.loads(content[4 : 4 + length]))
+        content = content[4 + length :]
+    assert frames == events[1:]
+
+
 @pytest.mark.benchmark
 async def test_build_flow_invalid_flow_id(client, logged_in_headers):
     """Test starting a build with an invalid flow ID."""
@@ -1,3 +1,7 @@
+import json
+from datetime import datetime, timezone
+
+from langflow.processing import process
 from langflow.processing.process import process_tweaks
 from langflow.services.deps import get_session_service
 from langflow.services.utils import register_all_service_factories
@@ -473,3 +477,31 @@ def test_apply_tweaks_field_type_extraction():
     # Verify both fields were modified
     assert node["data"]["node"]["template"]["param_no_type"]["value"] == "new_value_1"
     assert node["data"]["node"]["template"]["param_with_type"]["value"] == "new_value_2"
+
+
+def test_build_graph_from_flow_data_reuses_compiled_flow(json_memory_chatbot_no_llm, monkeypatch):
+    register_all_service_factories()
+    process.clear_compiled_flows_cache()
+    compile_calls = []
+    compile_flow_with_tweaks = process.compile_flow_with_tweaks
+
+    def counting_compile(*args, **kwargs):
+        compile_calls.append(args)
+        return compile_flow_with_tweaks(*args, **kwargs)
+
+    monkeypatch.setattr(process, "compile_flow_with_tweaks", counting_compile)
+    flow_data = json.loads(json_memory_chatbot_no_llm)["data"]
+    updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    kwargs = {"flow_id": "flow", "updated_at": updated_at}
+
+    graph1 = process.build_graph_from_flow_data(flow_data, {}, **kwargs)
+    graph2 = process.build_graph_from_flow_data(flow_data, {}, **kwargs)
+    assert len(compile_calls) == 1
+    assert graph1 is not graph2
+    assert [v.id for v in graph1.vertices] == [v.id for v in graph2.vertices]
+
+    # A different flow version or different tweaks compile the flow again
+    process.build_graph_from_flow_data(flow_data, {}, flow_id="flow", updated_at=datetime.now(timezone.utc))
+    process.build_graph_from_flow_data(flow_data, {"stream": True}, **kwargs)
+    assert len(compile_calls) == 3
+    process.clear_compiled_flows_cache()
@@ -13,6 +13,7 @@ from lfx.base.agents.callback import AgentAsyncHandler
 from lfx.base.agents.events import ExceptionWithMessageError, process_agent_events
 from lfx.base.agents.utils import get_chat_output_sender_name
 from lfx.custom.custom_component.component import Component, _get_component_toolkit
+from lfx.events.event_manager import TokenBuffer
 from lfx.field_typing import Tool
 from lfx.inputs.inputs import InputTypes, MultilineInput
 from lfx.io import BoolInput, HandleInput, IntInput, MessageInput
@@ -20,13 +21,12 @@ from lfx.log.logger import logger
 from lfx.memory import delete_message
 from lfx.schema.content_block import ContentBlock
 from lfx.schema.data import Data
-from lfx.schema.log import OnTokenFunctionType
 from lfx.schema.message import Message
 from lfx.template.field.base import Output
 from lfx.utils.constants import MESSAGE_SENDER_AI
 
 if TYPE_CHECKING:
-    from lfx.schema.log import OnTokenFunctionType, SendMessageFunctionType
+    from lfx.schema.log import SendMessageFunctionType
 
 
 DEFAULT_TOOLS_DESCRIPTION = "A helpful assistant with access to the following tools:"
@@ -250,10 +250,7 @@ class LCAgentComponent(Component):
         )
 
         # Create token callback if event_manager is available
-        # This wraps the event_manager's on_token method to match OnTokenFunctionType Protocol
-        on_token_callback: OnTokenFunctionType | None = None
-        if self._event_manager:
-            on_token_callback = cast("OnTokenFunctionType", self._event_manager.on_token)
+        on_token_callback = self._get_token_callback()
 
         try:
             result = await process_agent_events(
@@ -278,6 +275,9 @@ class LCAgentComponent(Component):
             # Log or handle any other exceptions
             logger.error(f"Error: {e}")
             raise
+        finally:
+            if isinstance(on_token_callback, TokenBuffer):
+                on_token_callback.flush()
 
         self.status = result
         return result
@@ -1,5 +1,5 @@
 # Add helper functions for each event type
-import asyncio
+import inspect
 from collections.abc import AsyncIterator
 from time import perf_counter
 from typing import Any, Protocol
@@ -316,13 +316,14 @@ async def handle_on_chain_stream(
         # Note: we should expect the callback, but we keep it optional for backwards compatibility
         # as of v1.6.5
         if output_text and output_text.strip() and send_token_callback and message_id:
-            await asyncio.to_thread(
-                send_token_callback,
+            result = send_token_callback(
                 data={
                     "chunk": output_text,
                     "id": str(message_id),
                 },
             )
+            if inspect.isawaitable(result):
+                await result
 
         if not agent_message.text:
             # Starts the timer when the first message is starting to be generated
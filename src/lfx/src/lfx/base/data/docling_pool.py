@@ -0,0 +1,417 @@
+"""Pool of long-lived Docling worker processes.
+
+Each worker is a Python interpreter running `WORKER_SCRIPT`: it imports Docling once and keeps a `DocumentConverter`
+per pipeline and OCR engine, so models are loaded once per worker instead of once per file. Jobs are sent to a worker
+as JSON lines on its stdin, and the worker answers each of them with a JSON line on its stdout.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import queue
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import weakref
+from collections import deque
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from lfx.log.logger import logger
+from lfx.services.deps import get_settings_service
+
+# Number of lines of the stderr of a worker kept to report its errors
+STDERR_TAIL_LINES = 50
+# Time in seconds a worker is given to exit once its stdin is closed
+WORKER_EXIT_TIMEOUT = 5
+
+WORKER_SCRIPT = textwrap.dedent(
+    r"""
+    import json, os, sys
+
+    def try_imports():
+        from docling.datamodel.base_models import ConversionStatus, InputFormat  # type: ignore
+        from docling.document_converter import DocumentConverter  # type: ignore
+        from docling_core.types.doc import ImageRefMode  # type: ignore
+        return ConversionStatus, InputFormat, DocumentConverter, ImageRefMode
+
+    def create_converter(input_format, DocumentConverter, pipeline, ocr_engine):
+        # --- Standard PDF/IMAGE pipeline, with optional OCR ---
+        if pipeline == "standard":
+            try:
+                from docling.datamodel.pipeline_options import PdfPipelineOptions  # type: ignore
+                from docling.document_converter import PdfFormatOption  # type: ignore
+
+                pipe = PdfPipelineOptions()
+                pipe.do_ocr = False
+
+                if ocr_engine:
+                    try:
+                        from docling.models.factories import get_ocr_factory  # type: ignore
+                        pipe.do_ocr = True
+                        fac = get_ocr_factory(allow_external_plugins=False)
+                        pipe.ocr_options = fac.create_options(kind=ocr_engine)
+                    except Exception:
+                        # If OCR setup fails, disable it
+                        pipe.do_ocr = False
+
+                fmt = {}
+                if hasattr(input_format, "PDF"):
+                    fmt[getattr(input_format, "PDF")] = PdfFormatOption(pipeline_options=pipe)
+                if hasattr(input_format, "IMAGE"):
+                    fmt[getattr(input_format, "IMAGE")] = PdfFormatOption(pipeline_options=pipe)
+
+                return DocumentConverter(format_options=fmt)
+            except Exception:
+                return DocumentConverter()
+
+        # --- Vision-Language Model (VLM) pipeline ---
+        if pipeline == "vlm":
+            from docling.datamodel.pipeline_options import VlmPipelineOptions
+            from docling.datamodel.vlm_model_specs import GRANITEDOCLING_MLX, GRANITEDOCLING_TRANSFORMERS
+            from docling.document_converter import PdfFormatOption
+            from docling.pipeline.vlm_pipeline import VlmPipeline
+
+            vl_pipe = VlmPipelineOptions(
+                vlm_options=GRANITEDOCLING_TRANSFORMERS,
+            )
+
+            if sys.platform == "darwin":
+                import mlx_vlm
+                vl_pipe.vlm_options = GRANITEDOCLING_MLX
+
+            # VLM paths generally don't need OCR; keep OCR off by default here.
+            fmt = {}
+            if hasattr(input_format, "PDF"):
+                fmt[getattr(input_format, "PDF")] = PdfFormatOption(
+                    pipeline_cls=VlmPipeline,
+                    pipeline_options=vl_pipe
+                )
+            if hasattr(input_format, "IMAGE"):
+                fmt[getattr(input_format, "IMAGE")] = PdfFormatOption(
+                    pipeline_cls=VlmPipeline,
+                    pipeline_options=vl_pipe
+                )
+
+            return DocumentConverter(format_options=fmt)
+
+        # --- Fallback: default converter with no special options ---
+        return DocumentConverter()
+
+    def export_markdown(document, ImageRefMode, image_mode, img_ph, pg_ph):
+        try:
+            mode = getattr(ImageRefMode, image_mode.upper(), image_mode)
+            return document.export_to_markdown(
+                image_mode=mode,
+                image_placeholder=img_ph,
+                page_break_placeholder=pg_ph,
+            )
+        except Exception:
+            try:
+                return document.export_to_text()
+            except Exception:
+                return str(document)
+
+    def to_rows(doc_dict):
+        rows = []
+        for t in doc_dict.get("texts", []):
+            prov = t.get("prov") or []
+            page_no = None
+            if prov and isinstance(prov, list) and isinstance(prov[0], dict):
+                page_no = prov[0].get("page_no")
+            rows.append({
+                "page_no": page_no,
+                "label": t.get("label"),
+                "text": t.get("text"),
+                "level": t.get("level"),
+            })
+        return rows
+
+    def rss_mb():
+        # Current memory on Linux; ru_maxrss elsewhere, since Linux keeps the one of the parent across exec
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        except (OSError, ValueError, AttributeError):
+            pass
+        try:
+            import resource
+        except ImportError:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+    def process(cfg, converters):
+        file_path = cfg["file_path"]
+        pipeline = cfg["pipeline"]
+        ocr_engine = cfg.get("ocr_engine")
+        meta = {"file_path": file_path}
+
+        try:
+            ConversionStatus, InputFormat, DocumentConverter, ImageRefMode = try_imports()
+            key = (pipeline, ocr_engine)
+            if key not in converters:
+                converters[key] = create_converter(InputFormat, DocumentConverter, pipeline, ocr_engine)
+            try:
+                res = converters[key].convert(file_path)
+            except Exception as e:
+                return {"ok": False, "error": f"Docling conversion error: {e}", "meta": meta}
+
+            ok = False
+            if hasattr(res, "status"):
+                try:
+                    ok = (res.status == ConversionStatus.SUCCESS) or (str(res.status).lower() == "success")
+                except Exception:
+                    ok = (str(res.status).lower() == "success")
+            if not ok and hasattr(res, "document"):
+                ok = getattr(res, "document", None) is not None
+            if not ok:
+                return {"ok": False, "error": "Docling conversion failed", "meta": meta}
+
+            doc = getattr(res, "document", None)
+            if doc is None:
+                return {"ok": False, "error": "Docling produced no document", "meta": meta}
+
+            if cfg["markdown"]:
+                text = export_markdown(
+                    doc, ImageRefMode, cfg["image_mode"], cfg["md_image_placeholder"], cfg["md_page_break_placeholder"]
+                )
+                return {"ok": True, "mode": "markdown", "text": text, "meta": meta}
+
+            # structured
+            try:
+                doc_dict = doc.export_to_dict()
+            except Exception as e:
+                return {"ok": False, "error": f"Docling export_to_dict failed: {e}", "meta": meta}
+
+            return {"ok": True, "mode": "structured", "doc": to_rows(doc_dict), "meta": meta}
+        except Exception as e:
+            return {"ok": False, "error": f"Docling processing error: {e}", "meta": meta}
+
+    def main():
+        # Answers are written to the original stdout; whatever Docling prints goes to stderr
+        out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+        os.dup2(2, 1)
+        converters = {}
+        for line in sys.stdin:
+            result = process(json.loads(line), converters)
+            result["rss_mb"] = rss_mb()
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+    if __name__ == "__main__":
+        main()
+    """
+)
+
+
+class DoclingJobResult(NamedTuple):
+    """Output of a Docling job: the JSON line answered by the worker, or the stderr of a worker that failed."""
+
+    stdout: bytes
+    stderr: bytes
+
+
+class DoclingWorker:
+    """A Docling worker process, and the threads reading its output."""
+
+    def __init__(self, script: str) -> None:
+        self.process = subprocess.Popen(  # noqa: S603
+            [sys.executable, "-u", "-c", script],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self.jobs = 0
+        self.rss_mb: float | None = None
+        self._lines: queue.Queue[bytes] = queue.Queue()
+        self._stderr: deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        self._stderr_reader = threading.Thread(target=self._read_stderr, daemon=True)
+        self._stderr_reader.start()
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _read_stdout(self) -> None:
+        for line in iter(self.process.stdout.readline, b""):  # type: ignore[union-attr]
+            self._lines.put(line)
+        # The worker exited
+        self._lines.put(b"")
+
+    def _read_stderr(self) -> None:
+        for line in iter(self.process.stderr.readline, b""):  # type: ignore[union-attr]
+            self._stderr.append(line)
+
+    def _stderr_tail(self) -> bytes:
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            self.process.wait(timeout=WORKER_EXIT_TIMEOUT)
+        self._stderr_reader.join(timeout=WORKER_EXIT_TIMEOUT)
+        return b"".join(self._stderr)
+
+    def run(self, job: dict[str, Any], timeout: float | None) -> DoclingJobResult:
+        """Send a job to the worker and wait for its answer, killing the worker if it takes over `timeout` seconds."""
+        self.jobs += 1
+        try:
+            self.process.stdin.write(json.dumps(job).encode("utf-8") + b"\n")  # type: ignore[union-attr]
+            self.process.stdin.flush()  # type: ignore[union-attr]
+        except OSError:
+            return DoclingJobResult(b"", self._stderr_tail())
+
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            return DoclingJobResult(b"", f"Docling job timed out after {timeout} seconds".encode())
+        if not line:
+            return DoclingJobResult(b"", self._stderr_tail())
+
+        with contextlib.suppress(ValueError, AttributeError):
+            self.rss_mb = json.loads(line).get("rss_mb")
+        return DoclingJobResult(line.strip(), b"")
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.wait()
+
+    def close(self) -> None:
+        """Let the worker exit once its stdin is closed, or kill it."""
+        with contextlib.suppress(OSError):
+            self.process.stdin.close()  # type: ignore[union-attr]
+        try:
+            self.process.wait(timeout=WORKER_EXIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+
+class DoclingWorkerPool:
+    """Up to `size` Docling workers, each running one job at a time.
+
+    Workers are started on demand and kept between jobs. A worker is replaced after `max_jobs_per_worker` jobs, once
+    its memory exceeds `max_memory_mb` after a job, and when a job times out or makes it crash. With `idle_timeout`,
+    a reaper thread stops the workers that ran no job for `idle_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        job_timeout: float | None = None,
+        max_jobs_per_worker: int = 0,
+        max_memory_mb: int = 0,
+        idle_timeout: float = 0,
+        script: str = WORKER_SCRIPT,
+    ) -> None:
+        self.size = max(1, size)
+        self.job_timeout = job_timeout or None
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_memory_mb = max_memory_mb
+        self.idle_timeout = idle_timeout
+        self.script = script
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        # Idle workers, with the time they finished their last job, most recently used last
+        self._idle: list[tuple[DoclingWorker, float]] = []
+        self._closed = threading.Event()
+        if idle_timeout > 0:
+            threading.Thread(
+                target=_reap_idle_workers,
+                args=(weakref.ref(self), self._closed, idle_timeout / 2),
+                daemon=True,
+            ).start()
+
+    def run(self, job: dict[str, Any]) -> DoclingJobResult:
+        """Run a job on an idle worker, waiting for one if all of them are busy."""
+        with self._slots:
+            worker = self._acquire()
+            try:
+                return worker.run(job, self.job_timeout)
+            finally:
+                self._release(worker)
+
+    def _acquire(self) -> DoclingWorker:
+        with self._lock:
+            while self._idle:
+                worker, _ = self._idle.pop()
+                if worker.alive:
+                    return worker
+        return DoclingWorker(self.script)
+
+    def _release(self, worker: DoclingWorker) -> None:
+        recycle = (
+            not worker.alive
+            or (self.max_jobs_per_worker and worker.jobs >= self.max_jobs_per_worker)
+            or (self.max_memory_mb and worker.rss_mb is not None and worker.rss_mb > self.max_memory_mb)
+        )
+        if recycle:
+            logger.debug(f"Recycling Docling worker {worker.process.pid} after {worker.jobs} jobs")
+            worker.close()
+            return
+        with self._lock:
+            if not self._closed.is_set():
+                self._idle.append((worker, time.monotonic()))
+                return
+        # The pool was closed during the job
+        worker.close()
+
+    def reap_idle_workers(self) -> None:
+        """Stop the workers that ran no job for `idle_timeout` seconds."""
+        deadline = time.monotonic() - self.idle_timeout
+        with self._lock:
+            expired = [worker for worker, idle_since in self._idle if idle_since <= deadline]
+            self._idle = [(worker, idle_since) for worker, idle_since in self._idle if idle_since > deadline]
+        for worker in expired:
+            logger.debug(f"Stopping Docling worker {worker.process.pid}, idle for {self.idle_timeout} seconds")
+            worker.close()
+
+    def close(self) -> None:
+        """Stop the idle workers, and the workers running a job once it is done."""
+        with self._lock:
+            self._closed.set()
+            workers, self._idle = self._idle, []
+        for worker, _ in workers:
+            worker.close()
+
+
+def _reap_idle_workers(pool_ref: weakref.ref, closed: threading.Event, interval: float) -> None:
+    # Only a weak reference is kept, so the reaper doesn't keep a discarded pool alive
+    while not closed.wait(interval):
+        pool = pool_ref()
+        if pool is None:
+            return
+        pool.reap_idle_workers()
+        del pool
+
+
+@lru_cache(maxsize=1)
+def get_docling_pool() -> DoclingWorkerPool:
+    """Return the Docling worker pool of the process, configured from the settings."""
+    settings = get_settings_service().settings
+    pool = DoclingWorkerPool(
+        settings.docling_workers,
+        job_timeout=settings.docling_job_timeout,
+        max_jobs_per_worker=settings.docling_worker_max_jobs,
+        max_memory_mb=settings.docling_worker_max_memory,
+        idle_timeout=settings.docling_worker_idle_timeout,
+    )
+    atexit.register(pool.close)
+    return pool
+
+
+def close_docling_pool() -> None:
+    """Stop the workers of the Docling worker pool of the process, if it was created.
+
+    The next call to `get_docling_pool` creates a new pool.
+    """
+    if not get_docling_pool.cache_info().currsize:
+        return
+    pool = get_docling_pool()
+    get_docling_pool.cache_clear()
+    atexit.unregister(pool.close)
+    pool.close()
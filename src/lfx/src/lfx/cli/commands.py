@@ -25,7 +25,7 @@ from lfx.cli.common import (
     is_port_in_use,
     load_graph_from_path,
 )
-from lfx.cli.serve_app import FlowMeta, create_multi_serve_app
+from lfx.cli.serve_app import DEFAULT_GRAPH_POOL_SIZE, FlowMeta, create_multi_serve_app
 
 # Initialize console
 console = Console()
@@ -72,6 +72,12 @@ async def serve_command(
         "--check-variables/--no-check-variables",
         help="Check global variables for environment compatibility",
     ),
+    pool_size: int = typer.Option(
+        DEFAULT_GRAPH_POOL_SIZE,
+        "--pool-size",
+        min=0,
+        help="Number of ready-to-run copies of the flow kept for concurrent requests",
+    ),
 ) -> None:
     """Serve LFX flows as a web API.
 
@@ -272,6 +278,7 @@ async def serve_command(
             graphs=graphs,
             metas=metas,
             verbose_print=verbose_print,
+            pool_size=pool_size,
         )
 
         verbose_print("🚀 Starting single-flow server...")
@@ -14,7 +14,6 @@ import sys
 import tempfile
 import uuid
 import zipfile
-from io import StringIO
 from pathlib import Path
 from shutil import which
 from typing import TYPE_CHECKING
@@ -29,6 +28,7 @@ from lfx.cli.script_loader import (
     load_graph_from_script,
 )
 from lfx.load import load_flow_from_json
+from lfx.log.capture import capture_output
 from lfx.schema.schema import InputValueRequest
 
 if TYPE_CHECKING:
@@ -309,32 +309,19 @@ async def execute_graph_with_capture(graph, input_value: str | None):
     # Create input request
     inputs = InputValueRequest(input_value=input_value) if input_value else None
 
-    # Capture output during execution
-    captured_stdout = StringIO()
-    captured_stderr = StringIO()
-
-    # Redirect stdout and stderr during graph execution
-    original_stdout = sys.stdout
-    original_stderr = sys.stderr
-
-    try:
-        sys.stdout = captured_stdout
-        sys.stderr = captured_stderr
-        results = [result async for result in graph.async_start(inputs)]
-    except Exception as exc:
-        # Capture any error output that was written to stderr
-        error_output = captured_stderr.getvalue()
-        if error_output:
-            # Add error output to the exception for better debugging
-            exc.args = (f"{exc.args[0] if exc.args else str(exc)}\n\nCaptured stderr:\n{error_output}",)
-        raise
-    finally:
-        # Restore original stdout/stderr
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
-
-    # Get captured logs
-    captured_logs = captured_stdout.getvalue() + captured_stderr.getvalue()
+    # Capture the output of this run only, so concurrent runs keep their logs apart
+    with capture_output() as capture:
+        try:
+            results = [result async for result in graph.async_start(inputs)]
+        except Exception as exc:
+            # Capture any error output that was written to stderr
+            error_output = capture.stderr.getvalue()
+            if error_output:
+                # Add error output to the exception for better debugging
+                exc.args = (f"{exc.args[0] if exc.args else str(exc)}\n\nCaptured stderr:\n{error_output}",)
+            raise
+
+    captured_logs = capture.getvalue()
 
     return results, captured_logs
 
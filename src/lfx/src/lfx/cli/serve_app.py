@@ -19,6 +19,7 @@ from __future__ import annotations
 
 import asyncio
 import time
+from contextlib import asynccontextmanager
 from copy import deepcopy
 from typing import TYPE_CHECKING, Annotated, Any
 
@@ -31,7 +32,7 @@ from lfx.cli.common import execute_graph_with_capture, extract_result_data, get_
 from lfx.log.logger import logger
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator, Callable
+    from collections.abc import AsyncGenerator, AsyncIterator, Callable
     from pathlib import Path
 
     from lfx.graph import Graph
@@ -41,6 +42,9 @@ API_KEY_NAME = "x-api-key"
 api_key_query = APIKeyQuery(name=API_KEY_NAME, scheme_name="API key query", auto_error=False)
 api_key_header = APIKeyHeader(name=API_KEY_NAME, scheme_name="API key header", auto_error=False)
 
+# Number of ready-to-run copies kept for each served flow
+DEFAULT_GRAPH_POOL_SIZE = 4
+
 
 def verify_api_key(
     query_param: Annotated[str | None, Security(api_key_query)],
@@ -253,6 +257,51 @@ class ErrorResponse(BaseModel):
     success: bool = Field(default=False, description="Always false for errors")
 
 
+# -----------------------------------------------------------------------------
+# Graph pool
+# -----------------------------------------------------------------------------
+
+
+class GraphPool:
+    """Ready-to-run copies of a served graph.
+
+    Runs mutate the graph they execute, so each request needs its own copy, and deep-copying
+    a graph copies every vertex, component and template. The pool makes ``size`` copies up
+    front and resets them cheaply with :meth:`Graph.reset_run_state` when they are checked
+    back in. When every copy is in use, a fresh copy is made, and it is kept only if there is
+    room left in the pool once it is checked in.
+    """
+
+    def __init__(self, graph: Graph, size: int = DEFAULT_GRAPH_POOL_SIZE) -> None:
+        self.graph = graph
+        self.size = size
+        # Components like Loop keep their progress in the graph context
+        self._context = dict(graph.context)
+        self._idle: list[Graph] = [self._copy() for _ in range(size)]
+
+    def _copy(self) -> Graph:
+        graph = deepcopy(self.graph)
+        graph.context = dict(self._context)
+        return graph
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[Graph]:
+        """Check out a copy of the graph for one run.
+
+        Copies whose run raised, or was cancelled, are discarded instead of being reused.
+        """
+        graph = self._idle.pop() if self._idle else self._copy()
+        yield graph
+        if len(self._idle) < self.size:
+            try:
+                graph.reset_run_state()
+            except Exception:  # noqa: BLE001
+                logger.debug("Could not reset pooled graph, discarding it", exc_info=True)
+                return
+            graph.context = dict(self._context)
+            self._idle.append(graph)
+
+
 # -----------------------------------------------------------------------------
 # Streaming helper functions
 # -----------------------------------------------------------------------------
@@ -352,6 +401,7 @@ def create_multi_serve_app(
     graphs: dict[str, Graph],
     metas: dict[str, FlowMeta],
     verbose_print: Callable[[str], None],  # noqa: ARG001
+    pool_size: int = DEFAULT_GRAPH_POOL_SIZE,
 ) -> FastAPI:
     """Create a FastAPI app exposing multiple LFX flows.
 
@@ -366,6 +416,9 @@ def create_multi_serve_app(
         Mapping ``flow_id -> FlowMeta`` containing metadata for each flow.
     verbose_print
         Diagnostic printer inherited from the CLI (unused, kept for backward compatibility).
+    pool_size
+        Number of ready-to-run copies kept for each flow, see :class:`GraphPool`.
+        Use 0 to copy the graph for every request.
     """
     if set(graphs) != set(metas):  # pragma: no cover - sanity check
         msg = "graphs and metas must contain the same keys"
@@ -401,6 +454,7 @@ def create_multi_serve_app(
         """Create a router for a specific flow to avoid loop variable binding issues."""
         analysis = _analyze_graph_structure(graph)
         run_description = _generate_dynamic_run_description(graph)
+        graph_pool = GraphPool(graph, size=pool_size)
 
         router = APIRouter(
             prefix=f"/flows/{flow_id}",
@@ -419,8 +473,8 @@ def create_multi_serve_app(
             request: RunRequest,
         ) -> RunResponse:
             try:
-                graph_copy = deepcopy(graph)
-                results, logs = await execute_graph_with_capture(graph_copy, request.input_value)
+                async with graph_pool.checkout() as graph_copy:
+                    results, logs = await execute_graph_with_capture(graph_copy, request.input_value)
                 result_data = extract_result_data(results, logs)
 
                 # Debug logging
@@ -492,15 +546,17 @@ def create_multi_serve_app(
                 asyncio_queue_client_consumed: asyncio.Queue = asyncio.Queue()
                 event_manager = create_stream_tokens_event_manager(queue=asyncio_queue)
 
-                main_task = asyncio.create_task(
-                    run_flow_generator_for_serve(
-                        graph=graph,
-                        input_request=request,
-                        flow_id=flow_id,
-                        event_manager=event_manager,
-                        client_consumed_queue=asyncio_queue_client_consumed,
-                    )
-                )
+                async def run_pooled_flow() -> None:
+                    async with graph_pool.checkout() as graph_copy:
+                        await run_flow_generator_for_serve(
+                            graph=graph_copy,
+                            input_request=request,
+                            flow_id=flow_id,
+                            event_manager=event_manager,
+                            client_consumed_queue=asyncio_queue_client_consumed,
+                        )
+
+                main_task = asyncio.create_task(run_pooled_flow())
 
                 async def on_disconnect() -> None:
                     logger.debug(f"Client disconnected from flow {flow_id}, closing tasks")
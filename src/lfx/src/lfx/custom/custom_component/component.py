@@ -5,6 +5,7 @@ import asyncio
 import inspect
 from collections.abc import AsyncIterator, Iterator
 from copy import deepcopy
+from functools import partial
 from textwrap import dedent
 from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, get_type_hints
 from uuid import UUID
@@ -22,6 +23,7 @@ from lfx.base.tools.constants import (
     TOOLS_METADATA_INPUT_NAME,
 )
 from lfx.custom.tree_visitor import RequiredInputsVisitor
+from lfx.events.event_manager import TokenBuffer
 from lfx.exceptions.component import StreamingError
 from lfx.field_typing import Tool  # noqa: TC001
 
@@ -37,6 +39,7 @@ from lfx.schema.log import Log
 from lfx.schema.message import ErrorMessage, Message
 from lfx.schema.properties import Source
 from lfx.serialization.serialization import serialize
+from lfx.services.deps import get_settings_service
 from lfx.template.field.base import UNDEFINED, Input, Output
 from lfx.template.frontend_node.custom_components import ComponentFrontendNode
 from lfx.utils.async_helpers import run_until_complete
@@ -53,7 +56,7 @@ if TYPE_CHECKING:
     from lfx.graph.vertex.base import Vertex
     from lfx.inputs.inputs import InputTypes
     from lfx.schema.dataframe import DataFrame
-    from lfx.schema.log import LoggableType
+    from lfx.schema.log import LoggableType, OnTokenFunctionType
 
 
 _ComponentToolkit = None
@@ -135,6 +138,8 @@ class Component(CustomComponent):
         self._edges: list[EdgeData] = []
         self._components: list[Component] = []
         self._event_manager: EventManager | None = None
+        # Coalesces the token events of the message being streamed, if enabled
+        self._token_buffer: TokenBuffer | None = None
         self._state_model = None
         self._telemetry_input_values: dict[str, Any] | None = None
 
@@ -854,7 +859,8 @@ class Component(CustomComponent):
         except KeyError:
             input_ = self._get_fallback_input(name=key, display_name=key)
             self._inputs[key] = input_
-            self.inputs.append(input_)
+            # Rebind rather than append, the list may be shared with the class and its other instances
+            self.inputs = [*self.inputs, input_]
             return input_
 
     def _connect_to_component(self, key, value, input_) -> None:
@@ -1541,14 +1547,15 @@ class Component(CustomComponent):
 
     def _append_tool_output(self) -> None:
         if next((output for output in self.outputs if output.name == TOOL_OUTPUT_NAME), None) is None:
-            self.outputs.append(
+            self.outputs = [
+                *self.outputs,
                 Output(
                     name=TOOL_OUTPUT_NAME,
                     display_name=TOOL_OUTPUT_DISPLAY_NAME,
                     method="to_toolkit",
                     types=["Tool"],
-                )
-            )
+                ),
+            ]
 
     def is_connected_to_chat_output(self) -> bool:
         # Lazy import to avoid circular dependency
@@ -1672,28 +1679,57 @@ class Component(CustomComponent):
 
     async def _send_message_event(self, message: Message, id_: str | None = None, category: str | None = None) -> None:
         if hasattr(self, "_event_manager") and self._event_manager:
+            # Tokens still buffered belong before this message
+            if getattr(self, "_token_buffer", None) is not None:
+                self._token_buffer.flush()
             data_dict = message.model_dump()["data"] if hasattr(message, "data") else message.model_dump()
             if id_ and not data_dict.get("id"):
                 data_dict["id"] = id_
             category = category or data_dict.get("category", None)
 
-            def _send_event():
-                match category:
-                    case "error":
-                        self._event_manager.on_error(data=data_dict)
-                    case "remove_message":
-                        # Check if id exists in data_dict before accessing it
-                        if "id" in data_dict:
-                            self._event_manager.on_remove_message(data={"id": data_dict["id"]})
-                        else:
-                            # If no id, try to get it from the message object or id_ parameter
-                            message_id = getattr(message, "id", None) or id_
-                            if message_id:
-                                self._event_manager.on_remove_message(data={"id": message_id})
-                    case _:
-                        self._event_manager.on_message(data=data_dict)
-
-            await asyncio.to_thread(_send_event)
+            match category:
+                case "error":
+                    await self._send_event("on_error", data_dict)
+                case "remove_message":
+                    # Check if id exists in data_dict before accessing it
+                    if "id" in data_dict:
+                        await self._send_event("on_remove_message", {"id": data_dict["id"]})
+                    else:
+                        # If no id, try to get it from the message object or id_ parameter
+                        message_id = getattr(message, "id", None) or id_
+                        if message_id:
+                            await self._send_event("on_remove_message", {"id": message_id})
+                case _:
+                    await self._send_event("on_message", data_dict)
+
+    async def _send_event(self, name: str, data: dict) -> None:
+        # Events sent with the default callback are only enqueued, so they are sent on the event loop.
+        # Custom callbacks may block and run in a thread.
+        callback = getattr(self._event_manager, name)
+        if self._event_manager.has_default_callback(name):
+            callback(data=data)
+        else:
+            await asyncio.to_thread(callback, data=data)
+
+    def _get_token_callback(self) -> OnTokenFunctionType | None:
+        """Return the callback that sends the token events of streamed messages.
+
+        Like other events, token events are sent on the event loop unless a custom callback is registered.
+        They are coalesced by a `TokenBuffer` when `token_coalesce_interval` or `token_coalesce_max_bytes`
+        is set; the buffer is flushed before the next message event and must be flushed at the end of the stream.
+        """
+        if not self._event_manager:
+            return None
+        if not self._event_manager.has_default_callback("on_token"):
+            return partial(asyncio.to_thread, self._event_manager.on_token)
+        settings_service = get_settings_service()
+        settings = settings_service.settings if settings_service else None
+        interval = getattr(settings, "token_coalesce_interval", 0.0)
+        max_bytes = getattr(settings, "token_coalesce_max_bytes", 0)
+        if interval or max_bytes:
+            self._token_buffer = TokenBuffer(self._event_manager, interval=interval, max_bytes=max_bytes)
+            return self._token_buffer
+        return self._event_manager.on_token
 
     def _should_stream_message(self, stored_message: Message, original_message: Message) -> bool:
         return bool(
@@ -1728,47 +1764,49 @@ class Component(CustomComponent):
 
         if isinstance(iterator, AsyncIterator):
             return await self._handle_async_iterator(iterator, message.id, message)
+        chunks: list[str] = []
+        token_callback = self._get_token_callback()
         try:
-            complete_message = ""
-            first_chunk = True
             for chunk in iterator:
-                complete_message = await self._process_chunk(
-                    chunk.content, complete_message, message.id, message, first_chunk=first_chunk
-                )
-                first_chunk = False
+                await self._process_chunk(chunk.content, chunks, message.id, message, token_callback)
         except Exception as e:
             raise StreamingError(cause=e, source=message.properties.source) from e
-        else:
-            return complete_message
+        finally:
+            if isinstance(token_callback, TokenBuffer):
+                token_callback.flush()
+        return "".join(chunks)
 
     async def _handle_async_iterator(self, iterator: AsyncIterator, message_id: str, message: Message) -> str:
-        complete_message = ""
-        first_chunk = True
-        async for chunk in iterator:
-            complete_message = await self._process_chunk(
-                chunk.content, complete_message, message_id, message, first_chunk=first_chunk
-            )
-            first_chunk = False
-        return complete_message
+        chunks: list[str] = []
+        token_callback = self._get_token_callback()
+        try:
+            async for chunk in iterator:
+                await self._process_chunk(chunk.content, chunks, message_id, message, token_callback)
+        finally:
+            if isinstance(token_callback, TokenBuffer):
+                token_callback.flush()
+        return "".join(chunks)
 
     async def _process_chunk(
-        self, chunk: str, complete_message: str, message_id: str, message: Message, *, first_chunk: bool = False
-    ) -> str:
-        complete_message += chunk
+        self,
+        chunk: str,
+        chunks: list[str],
+        message_id: str,
+        message: Message,
+        token_callback: OnTokenFunctionType | None,
+    ) -> None:
+        # The chunks are joined once at the end of the stream
+        chunks.append(chunk)
         if self._event_manager:
-            if first_chunk:
+            if len(chunks) == 1:
                 # Send the initial message only on the first chunk
                 msg_copy = message.model_copy()
-                msg_copy.text = complete_message
+                msg_copy.text = chunk
                 await self._send_message_event(msg_copy, id_=message_id)
-            await asyncio.to_thread(
-                self._event_manager.on_token,
-                data={
-                    "chunk": chunk,
-                    "id": str(message_id),
-                },
-            )
-        return complete_message
+            if token_callback is not None:
+                result = token_callback(data={"chunk": chunk, "id": str(message_id)})
+                if inspect.isawaitable(result):
+                    await result
 
     async def send_error(
         self,
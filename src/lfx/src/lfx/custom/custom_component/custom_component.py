@@ -483,6 +483,17 @@ class CustomComponent(BaseComponent):
         else:
             msg = f"Invalid user id: {self.user_id}"
             raise TypeError(msg)
+
+        # Resolve every variable the graph references with the first lookup of the run,
+        # so the other vertices do not need to go to the database again
+        graph = self.graph if hasattr(self, "graph") else None
+        if isinstance(getattr(graph, "variables", None), dict) and hasattr(variable_service, "get_variables_by_names"):
+            if name not in graph.variables:
+                names = (graph.get_variable_names() | {name}) - graph.variables.keys()
+                graph.variables.update(
+                    await variable_service.get_variables_by_names(user_id=user_id, names=names, session=session)
+                )
+            return variable_service.get_variable_value(name, field, graph.variables.get(name))
         return await variable_service.get_variable(user_id=user_id, name=name, field=field, session=session)
 
     async def list_key_names(self):
@@ -1,3 +1,6 @@
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 
 from lfx.custom import validate
@@ -5,8 +8,86 @@ from lfx.custom import validate
 if TYPE_CHECKING:
     from lfx.custom.custom_component.custom_component import CustomComponent
 
+COMPONENT_CLASS_CACHE_MAX_SIZE = 512
+
+
+class ComponentClassCache:
+    """A process-wide LRU cache of compiled component classes.
+
+    Classes are keyed by the SHA-256 hash of the component source code, so running the same
+    component code again skips parsing, import resolution and ``exec`` of the class body.
+    Code that fails to compile is never cached.
+
+    Attributes:
+        max_size (int): Maximum number of classes to keep. The least recently used class is evicted first.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that required compiling the code.
+        evictions (int): Number of classes evicted because the cache was full.
+    """
+
+    def __init__(self, max_size: int = COMPONENT_CLASS_CACHE_MAX_SIZE) -> None:
+        self._cache: OrderedDict[str, type] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def hash_code(code: str) -> str:
+        return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+    def get(self, code_hash: str) -> type | None:
+        with self._lock:
+            class_object = self._cache.get(code_hash)
+            if class_object is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(code_hash)
+            self.hits += 1
+            return class_object
+
+    def set(self, code_hash: str, class_object: type) -> None:
+        with self._lock:
+            self._cache[code_hash] = class_object
+            self._cache.move_to_end(code_hash)
+            while self.max_size and len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+component_class_cache = ComponentClassCache()
+
 
 def eval_custom_component_code(code: str) -> type["CustomComponent"]:
-    """Evaluate custom component code."""
+    """Evaluate custom component code.
+
+    Compiled classes are cached by the hash of the code, so the same source is only compiled once per process.
+    """
+    code_hash = ComponentClassCache.hash_code(code)
+    if (class_object := component_class_cache.get(code_hash)) is not None:
+        return class_object
     class_name = validate.extract_class_name(code)
-    return validate.create_class(code, class_name)
+    class_object = validate.create_class(code, class_name)
+    component_class_cache.set(code_hash, class_object)
+    return class_object
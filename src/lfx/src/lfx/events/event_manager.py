@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
-import json
+import itertools
 import time
 import uuid
 from functools import partial
 from typing import TYPE_CHECKING
 
+import orjson
 from fastapi.encoders import jsonable_encoder
 from typing_extensions import Protocol
 
@@ -29,6 +31,9 @@ class EventManager:
     def __init__(self, queue):
         self.queue = queue
         self.events: dict[str, PartialEventCallback] = {}
+        # Events registered without a callback, which are sent with `send_event`
+        self._default_events: set[str] = set()
+        self._token_ids = itertools.count()
 
     @staticmethod
     def _validate_callback(callback: EventCallback) -> None:
@@ -59,11 +64,24 @@ class EventManager:
             raise ValueError(msg)
         if callback is None:
             callback_ = partial(self.send_event, event_type=event_type)
+            self._default_events.add(name)
         else:
             callback_ = partial(callback, manager=self, event_type=event_type)
+            self._default_events.discard(name)
         self.events[name] = callback_
 
+    def has_default_callback(self, name: str) -> bool:
+        """Whether the event is sent with `send_event`, which only enqueues and can be called on the event loop."""
+        return name in self._default_events
+
     def send_event(self, *, event_type: str, data: LoggableType):
+        if event_type == "token" and isinstance(data, dict):
+            # Token events are sent for every chunk of a streamed message, so their data, a chunk and a
+            # message id, skips the generic encoding
+            event_id = f"token-{next(self._token_ids)}"
+            encoded_data = orjson.dumps({"event": event_type, "data": data}, default=str) + b"\n\n"
+            self._put(event_id, encoded_data)
+            return
         try:
             # Simple event creation without heavy dependencies
             if isinstance(data, dict) and event_type in {"message", "error", "warning", "info", "token"}:
@@ -74,10 +92,12 @@ class EventManager:
         jsonable_data = jsonable_encoder(data)
         json_data = {"event": event_type, "data": jsonable_data}
         event_id = f"{event_type}-{uuid.uuid4()}"
-        str_data = json.dumps(json_data) + "\n\n"
+        self._put(event_id, orjson.dumps(json_data, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n\n")
+
+    def _put(self, event_id: str, data: bytes) -> None:
         if self.queue:
             try:
-                self.queue.put_nowait((event_id, str_data.encode("utf-8"), time.time()))
+                self.queue.put_nowait((event_id, data, time.time()))
             except Exception:  # noqa: BLE001
                 logger.debug("Queue not available for event")
 
@@ -88,6 +108,46 @@ class EventManager:
         return self.events.get(name, self.noop)
 
 
+class TokenBuffer:
+    """Coalesces token events, to send the chunks of a streamed message in fewer events.
+
+    It is called like `EventManager.on_token`. The buffered chunks of a message are sent together,
+    in one token event, `interval` seconds after the first of them was added or as soon as
+    `max_bytes` are buffered, whichever comes first. `flush` sends what is left at the end of the stream.
+    """
+
+    def __init__(self, event_manager: EventManager, interval: float = 0.0, max_bytes: int = 0):
+        self.event_manager = event_manager
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self._message_id: str | None = None
+        self._chunks: list[str] = []
+        self._size = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    def __call__(self, *, data: dict) -> None:
+        if self._chunks and data["id"] != self._message_id:
+            self.flush()
+        self._message_id = data["id"]
+        self._chunks.append(data["chunk"])
+        self._size += len(data["chunk"].encode("utf-8"))
+        if (self.max_bytes and self._size >= self.max_bytes) or not self.interval:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.interval, self.flush)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._chunks:
+            return
+        chunk = "".join(self._chunks)
+        self._chunks.clear()
+        self._size = 0
+        self.event_manager.on_token(data={"chunk": chunk, "id": self._message_id})
+
+
 def create_default_event_manager(queue=None):
     manager = EventManager(queue)
     manager.register_event("on_token", "token")
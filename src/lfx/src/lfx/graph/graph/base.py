@@ -11,9 +11,8 @@ import traceback
 import uuid
 from collections import defaultdict, deque
 from datetime import datetime, timezone
-from functools import partial
 from itertools import chain
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 from lfx.exceptions.component import ComponentBuildError
 from lfx.graph.edge.base import CycleEdge, Edge
@@ -38,7 +37,7 @@ from lfx.log.logger import LogConfig, configure, logger
 from lfx.schema.dotdict import dotdict
 from lfx.schema.schema import INPUT_FIELD_NAME, InputType, OutputValue
 from lfx.services.cache.utils import CacheMiss
-from lfx.services.deps import get_chat_service, get_tracing_service
+from lfx.services.deps import get_chat_service, get_settings_service, get_tracing_service
 from lfx.utils.async_helpers import run_until_complete
 
 if TYPE_CHECKING:
@@ -94,6 +93,8 @@ class Graph:
         self.has_session_id_vertices: list[str] = []
         self._sorted_vertices_layers: list[list[str]] = []
         self._run_id = ""
+        # Variables resolved during the current run, see `CustomComponent.get_variable`
+        self.variables: dict[str, Any] = {}
         self._session_id = ""
         self._start_time = datetime.now(timezone.utc)
         self.inactivated_vertices: set = set()
@@ -105,6 +106,8 @@ class Graph:
         # Conditional routing system (separate from ACTIVE/INACTIVE cycle management)
         self.conditionally_excluded_vertices: set = set()  # Vertices excluded by conditional routing
         self.conditional_exclusion_sources: dict[str, set[str]] = {}  # Maps source vertex -> excluded vertices
+        # Edges of each vertex (as source or target), in the same order as self.edges
+        self._vertex_edges: dict[str, list[CycleEdge]] = {}
         self.edges: list[CycleEdge] = []
         self.vertices: list[Vertex] = []
         self.run_manager = RunnableVerticesManager()
@@ -125,7 +128,9 @@ class Graph:
         self._cycles: list[tuple[str, str]] | None = None
         self._cycle_vertices: set[str] | None = None
         self._call_order: list[str] = []
-        self._snapshots: list[dict[str, Any]] = []
+        # Journal of run state changes, see `_record_snapshot`
+        self._snapshot_journal_size: int | None = None
+        self._reset_snapshot_journal()
         self._end_trace_tasks: set[asyncio.Task] = set()
 
         if context and not isinstance(context, dict):
@@ -149,6 +154,27 @@ class Graph:
             self._lock = asyncio.Lock()
         return self._lock
 
+    @property
+    def edges(self) -> list[CycleEdge]:
+        """The edges of the graph.
+
+        Assigning a new list re-indexes the edges by vertex. Edges should not be appended to the list in place,
+        use `_add_edge_to_index` alongside so that vertex lookups stay consistent.
+        """
+        return self._edge_list
+
+    @edges.setter
+    def edges(self, edges: list[CycleEdge]) -> None:
+        self._edge_list = edges
+        self._vertex_edges = {}
+        for edge in edges:
+            self._add_edge_to_index(edge)
+
+    def _add_edge_to_index(self, edge: CycleEdge) -> None:
+        self._vertex_edges.setdefault(edge.source_id, []).append(edge)
+        if edge.target_id != edge.source_id:
+            self._vertex_edges.setdefault(edge.target_id, []).append(edge)
+
     @property
     def context(self) -> dotdict:
         if isinstance(self._context, dotdict):
@@ -266,6 +292,30 @@ class Graph:
         self._edges = self._graph_data["edges"]
         self.initialize()
 
+    def add_compiled_nodes_and_edges(
+        self,
+        raw_graph_data: GraphData,
+        graph_data: GraphData,
+        *,
+        top_level_vertices: list[str],
+        cycle_vertices: set[str],
+    ) -> None:
+        """Adds nodes and edges that were already processed by `add_nodes_and_edges`.
+
+        This skips ungrouping and cycle detection, which only depend on the flow payload.
+        See `lfx.graph.graph.compiled.CompiledFlow`.
+        """
+        self.raw_graph_data = raw_graph_data
+        self.top_level_vertices = top_level_vertices
+        self._cycle_vertices = cycle_vertices
+        for vertex_id in self.top_level_vertices:
+            if vertex_id in self._cycle_vertices:
+                self.run_manager.add_to_cycle_vertices(vertex_id)
+        self._graph_data = graph_data
+        self._vertices = graph_data["nodes"]
+        self._edges = graph_data["edges"]
+        self.initialize()
+
     def add_component(self, component: Component, component_id: str | None = None) -> str:
         component_id = component_id or component.get_id()
         if component_id in self.vertex_map:
@@ -404,6 +454,29 @@ class Graph:
                 continue
             vertex.custom_component.reset_all_output_values()
 
+    def reset_run_state(self) -> None:
+        """Clear the state left by a previous run so that the graph can be run again.
+
+        This is much cheaper than copying the graph: vertices and their components are kept, only
+        their results, output values and the run bookkeeping are reset.
+        """
+        self._reset_all_output_values()
+        for vertex in self.vertices:
+            vertex.reset_run_state()
+        self.run_manager = RunnableVerticesManager()
+        self._run_id = ""
+        self.variables = {}
+        self._start_time = datetime.now(timezone.utc)
+        self.inactivated_vertices = set()
+        self.activated_vertices = []
+        self.inactive_vertices = set()
+        self.conditionally_excluded_vertices = set()
+        self.conditional_exclusion_sources = {}
+        self.stop_vertex = None
+        self._run_queue = deque()
+        self._call_order = []
+        self._reset_snapshot_journal()
+
     def start(
         self,
         inputs: list[dict] | None = None,
@@ -637,6 +710,8 @@ class Graph:
         if run_id is None:
             run_id = uuid.uuid4()
 
+        if str(run_id) != self._run_id:
+            self.variables = {}
         self._run_id = str(run_id)
 
     async def initialize_run(self) -> None:
@@ -777,7 +852,7 @@ class Graph:
         try:
             cache_service = get_chat_service()
             if cache_service and self.flow_id:
-                await cache_service.set_cache(self.flow_id, self)
+                await cache_service.set_graph_state(self)
         except Exception:  # noqa: BLE001
             logger.exception("Error setting cache")
 
@@ -1024,7 +1099,7 @@ class Graph:
 
     def get_edge(self, source_id: str, target_id: str) -> CycleEdge | None:
         """Returns the edge between two vertices."""
-        for edge in self.edges:
+        for edge in self._vertex_edges.get(source_id, ()):
             if edge.source_id == source_id and edge.target_id == target_id:
                 return edge
         return None
@@ -1041,6 +1116,61 @@ class Graph:
     def increment_update_count(self) -> None:
         self._updates += 1
 
+    def get_variable_names(self) -> set[str]:
+        """Returns the names of the variables referenced by the `load_from_db` fields of the vertices."""
+        names = set()
+        for vertex in self.vertices:
+            for field in vertex.load_from_db_fields:
+                value = vertex.params.get(field)
+                if value and isinstance(value, str):
+                    names.add(value)
+        return names
+
+    def get_run_state(self) -> dict[str, Any]:
+        """Returns the part of the graph state that changes while the graph runs.
+
+        Together with `raw_graph_data` and the build state of the built vertices
+        (see `Vertex.get_build_state`), this is enough to rebuild the graph in another process.
+        """
+        return copy.deepcopy(
+            {
+                "run_id": self._run_id,
+                "run_manager": self.run_manager.to_dict(),
+                "inactivated_vertices": self.inactivated_vertices,
+                "activated_vertices": self.activated_vertices,
+                "inactive_vertices": [vertex.id for vertex in self.vertices if not vertex.is_active()],
+                "built_vertices": [vertex.id for vertex in self.vertices if vertex.built],
+                "vertices_layers": self.vertices_layers,
+                "vertices_to_run": self.vertices_to_run,
+                "stop_vertex": self.stop_vertex,
+                "run_queue": list(self._run_queue),
+                "first_layer": self._first_layer,
+                "sorted_vertices_layers": self._sorted_vertices_layers,
+                "prepared": self._prepared,
+            }
+        )
+
+    def set_run_state(self, state: dict[str, Any]) -> None:
+        """Restores a run state returned by `get_run_state`.
+
+        The build state of the built vertices is not part of the run state and has to be restored separately.
+        """
+        if state["run_id"]:
+            self.set_run_id(state["run_id"])
+        self.run_manager = RunnableVerticesManager.from_dict(state["run_manager"])
+        self.run_manager.cycle_vertices = set(self.cycle_vertices)
+        self.inactivated_vertices = state["inactivated_vertices"]
+        self.activated_vertices = state["activated_vertices"]
+        for vertex in self.vertices:
+            vertex.state = VertexStates.INACTIVE if vertex.id in state["inactive_vertices"] else VertexStates.ACTIVE
+        self.vertices_layers = state["vertices_layers"]
+        self.vertices_to_run = state["vertices_to_run"]
+        self.stop_vertex = state["stop_vertex"]
+        self._run_queue = deque(state["run_queue"])
+        self._first_layer = state["first_layer"]
+        self._sorted_vertices_layers = state["sorted_vertices_layers"]
+        self._prepared = state["prepared"]
+
     def __getstate__(self):
         # Get all attributes that are useful in runs.
         # We don't need to save the state_manager because it is
@@ -1109,13 +1239,16 @@ class Graph:
         return new_graph
 
     def __setstate__(self, state):
+        edges = state.pop("edges", [])
         run_manager = state["run_manager"]
         if isinstance(run_manager, RunnableVerticesManager):
             state["run_manager"] = run_manager
         else:
             state["run_manager"] = RunnableVerticesManager.from_dict(run_manager)
         self.__dict__.update(state)
+        self.edges = edges
         self.vertex_map = {vertex.id: vertex for vertex in self.vertices}
+        self.variables = {}
         # Tracing service will be lazily initialized via property when needed
         self.set_run_id(self._run_id)
 
@@ -1286,8 +1419,13 @@ class Graph:
         """Updates the edges of a vertex."""
         # Vertex has edges, so we need to update the edges
         for edge in vertex.edges:
-            if edge not in self.edges and edge.source_id in self.vertex_map and edge.target_id in self.vertex_map:
+            if (
+                edge.source_id in self.vertex_map
+                and edge.target_id in self.vertex_map
+                and edge not in self._vertex_edges.get(edge.source_id, ())
+            ):
                 self.edges.append(edge)
+                self._add_edge_to_index(edge)
 
     def _build_graph(self) -> None:
         """Builds the graph from the vertices and edges."""
@@ -1443,7 +1581,7 @@ class Graph:
         self.reset_activated_vertices()
 
         if chat_service is not None:
-            await chat_service.set_cache(str(self.flow_id or self._run_id), self)
+            await chat_service.set_graph_state(self, vertex_ids=[vertex_id])
         self._record_snapshot(vertex_id)
         return vertex_build_result
 
@@ -1459,10 +1597,74 @@ class Graph:
             }
         )
 
+    def enable_snapshots(self, journal_size: int) -> None:
+        """Record the run state after each step, keeping the last `journal_size` snapshots.
+
+        Overrides the `graph_snapshot_journal_size` setting for this graph. Use 0 to disable recording.
+        """
+        self._snapshot_journal_size = journal_size
+        self._reset_snapshot_journal()
+
+    def get_snapshots(self) -> list[dict[str, Any]]:
+        """Returns the recorded snapshots of the run state, oldest first.
+
+        The journal only stores what changed at each step, full snapshots are rebuilt from it.
+        """
+        if not self._snapshots:
+            return []
+        state = self._snapshot_base
+        snapshots = []
+        for entry in self._snapshots:
+            state = {**state, **entry["changes"]}
+            snapshots.append(state)
+        return copy.deepcopy(snapshots)
+
+    def _reset_snapshot_journal(self) -> None:
+        # None until the first snapshot, when the journal size is read from the settings
+        self._snapshots: deque[dict[str, Any]] | None = None
+        # Run state before the oldest entry of the journal, and after the newest one
+        self._snapshot_base: dict[str, Any] = {}
+        self._snapshot_head: dict[str, Any] = {}
+
+    def _get_snapshot_journal(self) -> deque[dict[str, Any]]:
+        if self._snapshots is None:
+            journal_size = self._snapshot_journal_size
+            if journal_size is None:
+                settings_service = get_settings_service()
+                settings = settings_service.settings if settings_service else None
+                journal_size = getattr(settings, "graph_snapshot_journal_size", 0)
+            self._snapshots = deque(maxlen=journal_size)
+        return self._snapshots
+
     def _record_snapshot(self, vertex_id: str | None = None) -> None:
-        self._snapshots.append(self.get_snapshot())
+        """Appends the changes of the run state since the last snapshot to the journal.
+
+        Recording is off unless the journal has a size. The journal is a ring buffer: when it is full,
+        its oldest entry is folded into the base state the snapshots are rebuilt from.
+        """
         if vertex_id:
             self._call_order.append(vertex_id)
+        journal = self._get_snapshot_journal()
+        if not journal.maxlen:
+            return
+        state = {
+            "run_manager": self.run_manager.to_dict(),
+            "run_queue": self._run_queue,
+            "vertices_layers": self.vertices_layers,
+            "first_layer": self._first_layer,
+            "inactive_vertices": self.inactive_vertices,
+            "activated_vertices": self.activated_vertices,
+        }
+        # Only the values that changed are copied
+        changes = {
+            key: copy.deepcopy(value)
+            for key, value in state.items()
+            if key not in self._snapshot_head or self._snapshot_head[key] != value
+        }
+        self._snapshot_head.update(changes)
+        if len(journal) == journal.maxlen:
+            self._snapshot_base = {**self._snapshot_base, **journal[0]["changes"]}
+        journal.append({"vertex_id": vertex_id, "changes": changes})
 
     def step(
         self,
@@ -1601,9 +1803,12 @@ class Graph:
         """Returns a list of edges for a given vertex."""
         # The idea here is to return the edges that have the vertex_id as source or target
         # or both
+        vertex_edges = self._vertex_edges.get(vertex_id, [])
+        if is_source is not False and is_target is not False:
+            return list(vertex_edges)
         return [
             edge
-            for edge in self.edges
+            for edge in vertex_edges
             if (edge.source_id == vertex_id and is_source is not False)
             or (edge.target_id == vertex_id and is_target is not False)
         ]
@@ -1611,7 +1816,7 @@ class Graph:
     def get_vertices_with_target(self, vertex_id: str) -> list[Vertex]:
         """Returns the vertices connected to a vertex."""
         vertices: list[Vertex] = []
-        for edge in self.edges:
+        for edge in self._vertex_edges.get(vertex_id, ()):
             if edge.target_id == vertex_id:
                 vertex = self.get_vertex(edge.source_id)
                 if vertex is None:
@@ -1625,8 +1830,28 @@ class Graph:
         fallback_to_env_vars: bool,
         start_component_id: str | None = None,
         event_manager: EventManager | None = None,
+        scheduler: Literal["layered", "dataflow"] | None = None,
+        max_concurrency: int | None = None,
+        vertex_type_concurrency: dict[str, int] | None = None,
     ) -> Graph:
-        """Processes the graph with vertices in each layer run in parallel."""
+        """Processes the graph, running independent vertices in parallel.
+
+        With the "layered" scheduler every vertex in a layer must finish before the next layer starts.
+        With the "dataflow" scheduler a vertex starts as soon as all of its predecessors are done.
+
+        Args:
+            fallback_to_env_vars: Whether to fallback to environment variables.
+            start_component_id: The ID of the component to start the graph from.
+            event_manager: The event manager for the graph.
+            scheduler: "layered" or "dataflow". Defaults to the `graph_scheduler` setting.
+            max_concurrency: Maximum number of vertices built at once by the dataflow scheduler (0 for no limit).
+                Defaults to the `graph_max_concurrency` setting.
+            vertex_type_concurrency: Maximum number of concurrent builds per vertex type for the dataflow
+                scheduler. Defaults to the `graph_vertex_type_concurrency` setting.
+        """
+        scheduler, max_concurrency, vertex_type_concurrency = self._get_scheduler_config(
+            scheduler, max_concurrency, vertex_type_concurrency
+        )
         has_webhook_component = "webhook" in start_component_id.lower() if start_component_id else False
         first_layer = self.sort_vertices(start_component_id=start_component_id)
         vertex_task_run_count: dict[str, int] = {}
@@ -1648,6 +1873,21 @@ class Graph:
 
         await self.initialize_run()
         lock = asyncio.Lock()
+        if scheduler == "dataflow":
+            await self._process_dataflow(
+                first_layer,
+                lock=lock,
+                fallback_to_env_vars=fallback_to_env_vars,
+                get_cache=get_cache_func,
+                set_cache=set_cache_func,
+                event_manager=event_manager,
+                max_concurrency=max_concurrency,
+                vertex_type_concurrency=vertex_type_concurrency,
+                has_webhook_component=has_webhook_component,
+            )
+            await logger.adebug("Graph processing complete")
+            return self
+
         while to_process:
             current_batch = list(to_process)  # Copy current deque items to a list
             to_process.clear()  # Clear the deque for new items
@@ -1685,6 +1925,137 @@ class Graph:
         await logger.adebug("Graph processing complete")
         return self
 
+    @staticmethod
+    def _get_scheduler_config(
+        scheduler: Literal["layered", "dataflow"] | None,
+        max_concurrency: int | None,
+        vertex_type_concurrency: dict[str, int] | None,
+    ) -> tuple[str, int, dict[str, int]]:
+        """Fills the scheduler options that were not given explicitly from the settings service."""
+        settings = None
+        if scheduler is None or max_concurrency is None or vertex_type_concurrency is None:
+            settings_service = get_settings_service()
+            settings = settings_service.settings if settings_service else None
+        if scheduler is None:
+            scheduler = getattr(settings, "graph_scheduler", "layered")
+        if max_concurrency is None:
+            max_concurrency = getattr(settings, "graph_max_concurrency", 0)
+        if vertex_type_concurrency is None:
+            vertex_type_concurrency = getattr(settings, "graph_vertex_type_concurrency", None) or {}
+        if scheduler not in {"layered", "dataflow"}:
+            msg = f"Invalid scheduler: {scheduler}. Expected 'layered' or 'dataflow'"
+            raise ValueError(msg)
+        return scheduler, max_concurrency, vertex_type_concurrency
+
+    async def _process_dataflow(
+        self,
+        first_layer: list[str],
+        *,
+        lock: asyncio.Lock,
+        fallback_to_env_vars: bool,
+        get_cache: GetCache | None,
+        set_cache: SetCache | None,
+        event_manager: EventManager | None,
+        max_concurrency: int = 0,
+        vertex_type_concurrency: dict[str, int] | None = None,
+        has_webhook_component: bool = False,
+    ) -> None:
+        """Runs the graph launching each vertex as soon as all of its predecessors are built.
+
+        Instead of waiting for a whole layer to finish, every completed vertex immediately releases the
+        successors that became runnable, so independent branches progress at their own pace.
+
+        Args:
+            first_layer: The vertices to start with.
+            lock: Async lock for synchronization of the run manager.
+            fallback_to_env_vars: Whether to fallback to environment variables.
+            get_cache: A coroutine to get the cache.
+            set_cache: A coroutine to set the cache.
+            event_manager: The event manager for the graph.
+            max_concurrency: Maximum number of vertices built at the same time. 0 means no limit.
+            vertex_type_concurrency: Maximum number of concurrent builds per vertex type.
+            has_webhook_component: Whether the graph has a webhook component.
+        """
+        global_semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        type_semaphores = {
+            vertex_type: asyncio.Semaphore(limit)
+            for vertex_type, limit in (vertex_type_concurrency or {}).items()
+            if limit > 0
+        }
+        vertex_task_run_count: dict[str, int] = {}
+        running: dict[asyncio.Task, str] = {}
+
+        async def build_with_limits(vertex_id: str) -> VertexBuildResult:
+            vertex = self.get_vertex(vertex_id)
+            async with contextlib.AsyncExitStack() as stack:
+                # Take the narrower type slot first so a waiting vertex does not hold a global slot
+                if (type_semaphore := type_semaphores.get(vertex.vertex_type)) is not None:
+                    await stack.enter_async_context(type_semaphore)
+                if global_semaphore is not None:
+                    await stack.enter_async_context(global_semaphore)
+                return await self.build_vertex(
+                    vertex_id=vertex_id,
+                    user_id=self.user_id,
+                    inputs_dict={},
+                    fallback_to_env_vars=fallback_to_env_vars,
+                    get_cache=get_cache,
+                    set_cache=set_cache,
+                    event_manager=event_manager,
+                )
+
+        def launch(vertex_id: str) -> None:
+            if vertex_id in running.values():
+                return
+            task = asyncio.create_task(
+                build_with_limits(vertex_id),
+                name=f"{vertex_id} Run {vertex_task_run_count.get(vertex_id, 0)}",
+            )
+            vertex_task_run_count[vertex_id] = vertex_task_run_count.get(vertex_id, 0) + 1
+            running[task] = vertex_id
+
+        for vertex_id in first_layer:
+            launch(vertex_id)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    vertex_id = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as exc:
+                        await logger.aerror(f"Task {task.get_name()} failed with exception: {exc}")
+                        if has_webhook_component:
+                            await self._log_vertex_build_from_exception(vertex_id, exc)
+                        raise
+                    if not isinstance(result, VertexBuildResult):
+                        msg = f"Invalid result from task {task.get_name()}: {result}"
+                        raise TypeError(msg)
+                    if self.flow_id is not None:
+                        await log_vertex_build(
+                            flow_id=self.flow_id,
+                            vertex_id=result.vertex.id,
+                            valid=result.valid,
+                            params=result.params,
+                            data=result.result_dict,
+                            artifacts=result.artifacts,
+                        )
+                    await logger.adebug(
+                        f"Vertex {result.vertex.id}, result: {result.vertex.built_result}, "
+                        f"object: {result.vertex.built_object}"
+                    )
+                    next_runnable_vertices = await self.get_next_runnable_vertices(
+                        lock, vertex=result.vertex, cache=False
+                    )
+                    for next_vertex_id in next_runnable_vertices:
+                        launch(next_vertex_id)
+        finally:
+            # On failure, stop the vertices that are still running
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
     def find_next_runnable_vertices(self, vertex_successors_ids: list[str]) -> list[str]:
         """Determines the next set of runnable vertices from a list of successor vertex IDs.
 
@@ -1726,9 +2097,8 @@ class Graph:
                     next_runnable_vertices.remove(v_id)
                 else:
                     self.run_manager.add_to_vertices_being_run(next_v_id)
-            if cache and self.flow_id is not None:
-                set_cache_coro = partial(get_chat_service().set_cache, key=self.flow_id)
-                await set_cache_coro(data=self, lock=lock)
+            if cache and self.flow_id is not None and (chat_service := get_chat_service()) is not None:
+                await chat_service.set_graph_state(self, vertex_ids=[v_id])
         if vertex.is_state:
             next_runnable_vertices.extend(self.activated_vertices)
         return next_runnable_vertices
@@ -1949,7 +2319,7 @@ class Graph:
         The count reflects the number of edges between the input vertex and each neighbor.
         """
         neighbors: dict[Vertex, int] = {}
-        for edge in self.edges:
+        for edge in self._vertex_edges.get(vertex.id, ()):
             if edge.source_id == vertex.id:
                 neighbor = self.get_vertex(edge.target_id)
                 if neighbor is None:
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from lfx.graph.graph.base import Graph
+from lfx.graph.graph.utils import find_cycle_vertices, process_flow
+from lfx.log.logger import logger
+
+if TYPE_CHECKING:
+    from lfx.graph.graph.schema import GraphData
+
+
+@dataclass(frozen=True)
+class CompiledFlow:
+    """The request independent part of building a Graph from a flow payload.
+
+    Group nodes are already ungrouped and cycle vertices already detected, and the processed
+    nodes and edges are kept serialized, so every call to `to_graph` starts from a fresh copy
+    that a run can freely mutate. Vertices, edges and layers are not cached: `to_graph` builds
+    them, and instantiates the components, for each graph.
+
+    Attributes:
+        raw_graph_data: The payload as it was given. It is shared by every graph built from this
+            compiled flow and must be treated as read-only.
+        graph_data: The processed nodes and edges, serialized with orjson.
+        top_level_vertices: The IDs of the nodes in the payload before ungrouping.
+        cycle_vertices: The IDs of the vertices that are part of a cycle.
+    """
+
+    raw_graph_data: GraphData
+    graph_data: bytes
+    top_level_vertices: tuple[str, ...]
+    cycle_vertices: frozenset[str]
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> CompiledFlow:
+        """Compiles a flow payload.
+
+        Args:
+            payload: The flow data, with `nodes` and `edges` either at the top level or under `data`.
+
+        Raises:
+            ValueError: If the payload has no `nodes` or `edges`.
+            TypeError: If the payload is not JSON serializable.
+        """
+        return cls._compile(payload)[0]
+
+    @classmethod
+    def compile_to_graph(
+        cls,
+        payload: dict[str, Any],
+        flow_id: str | None = None,
+        flow_name: str | None = None,
+        user_id: str | None = None,
+        context: dict | None = None,
+    ) -> tuple[CompiledFlow, Graph]:
+        """Compiles a flow payload and creates a first Graph from it.
+
+        Same as `from_payload(payload).to_graph(...)`, without deserializing the processed nodes and edges again.
+        """
+        compiled_flow, graph_data = cls._compile(payload)
+        return compiled_flow, _build_graph(compiled_flow, graph_data, flow_id, flow_name, user_id, context)
+
+    @classmethod
+    def _compile(cls, payload: dict[str, Any]) -> tuple[CompiledFlow, GraphData]:
+        if "data" in payload:
+            payload = payload["data"]
+        if "nodes" not in payload or "edges" not in payload:
+            msg = f"Invalid payload. Expected keys 'nodes' and 'edges'. Found {list(payload.keys())}"
+            raise ValueError(msg)
+        raw_graph_data: GraphData = {"nodes": payload["nodes"], "edges": payload["edges"]}
+        top_level_vertices = tuple(node_id for node in raw_graph_data["nodes"] if (node_id := node.get("id")))
+        edges = [(e["data"]["sourceHandle"]["id"], e["data"]["targetHandle"]["id"]) for e in raw_graph_data["edges"]]
+        graph_data = process_flow(raw_graph_data)
+        compiled_flow = cls(
+            raw_graph_data=raw_graph_data,
+            graph_data=orjson.dumps(graph_data),
+            top_level_vertices=top_level_vertices,
+            cycle_vertices=frozenset(find_cycle_vertices(edges)),
+        )
+        return compiled_flow, graph_data
+
+    def to_graph(
+        self,
+        flow_id: str | None = None,
+        flow_name: str | None = None,
+        user_id: str | None = None,
+        context: dict | None = None,
+    ) -> Graph:
+        """Creates a new Graph, ready to run, from the compiled flow.
+
+        Args:
+            flow_id: The ID of the flow.
+            flow_name: The flow name.
+            user_id: The user ID.
+            context: Optional context dictionary for request-specific data.
+        """
+        return _build_graph(self, orjson.loads(self.graph_data), flow_id, flow_name, user_id, context)
+
+
+def _build_graph(
+    compiled_flow: CompiledFlow,
+    graph_data: GraphData,
+    flow_id: str | None,
+    flow_name: str | None,
+    user_id: str | None,
+    context: dict | None,
+) -> Graph:
+    graph = Graph(flow_id=flow_id, flow_name=flow_name, user_id=user_id, context=context)
+    try:
+        graph.add_compiled_nodes_and_edges(
+            compiled_flow.raw_graph_data,
+            graph_data,
+            top_level_vertices=list(compiled_flow.top_level_vertices),
+            cycle_vertices=set(compiled_flow.cycle_vertices),
+        )
+    except KeyError as exc:
+        logger.exception(exc)
+        msg = f"Error while creating graph from compiled flow: {exc}"
+        raise ValueError(msg) from exc
+    return graph
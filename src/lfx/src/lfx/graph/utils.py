@@ -5,6 +5,8 @@ from enum import Enum
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+from pydantic import BaseModel
+
 from lfx.interface.utils import extract_input_variables_from_prompt
 from lfx.log.logger import logger
 from lfx.schema.data import Data
@@ -109,12 +111,12 @@ async def log_transaction(
     flow_id: str | UUID,
     source: Vertex,
     status,
-    target: Vertex | None = None,  # noqa: ARG001
-    error=None,  # noqa: ARG001
+    target: Vertex | None = None,
+    error=None,
 ) -> None:
     """Asynchronously logs a transaction record for a vertex in a flow if transaction storage is enabled.
 
-    This is a lightweight implementation that only logs if database service is available.
+    The record is handed to the database service, which may buffer it before writing it.
     """
     try:
         settings_service = get_settings_service()
@@ -132,8 +134,15 @@ async def log_transaction(
             else:
                 return
 
-        # Log basic transaction info - concrete implementation should be in langflow
-        logger.debug(f"Transaction logged: vertex={source.id}, flow={flow_id}, status={status}")
+        await db_service.log_transaction(
+            flow_id=flow_id,
+            vertex_id=source.id,
+            target_id=target.id if target else None,
+            inputs=_vertex_to_primitive_dict(source),
+            outputs=source.result.model_dump() if source.result else None,
+            status=status,
+            error=str(error) if error else None,
+        )
     except Exception as exc:  # noqa: BLE001
         logger.debug(f"Error logging transaction: {exc!s}")
 
@@ -143,13 +152,13 @@ async def log_vertex_build(
     flow_id: str | UUID,
     vertex_id: str,
     valid: bool,
-    params: Any,  # noqa: ARG001
-    data: dict | Any,  # noqa: ARG001
-    artifacts: dict | None = None,  # noqa: ARG001
+    params: Any,
+    data: dict | Any,
+    artifacts: dict | None = None,
 ) -> None:
     """Asynchronously logs a vertex build record if vertex build storage is enabled.
 
-    This is a lightweight implementation that only logs if database service is available.
+    The record is handed to the database service, which may buffer it before writing it.
     """
     try:
         settings_service = get_settings_service()
@@ -168,8 +177,14 @@ async def log_vertex_build(
             logger.debug(f"Invalid flow_id passed to log_vertex_build: {flow_id!r}")
             return
 
-        # Log basic vertex build info - concrete implementation should be in langflow
-        logger.debug(f"Vertex build logged: vertex={vertex_id}, flow={flow_id}, valid={valid}")
+        await db_service.log_vertex_build(
+            flow_id=flow_id,
+            id=vertex_id,
+            valid=valid,
+            params=str(params) if params else None,
+            data=data.model_dump() if isinstance(data, BaseModel) else data,
+            artifacts=artifacts,
+        )
     except Exception:  # noqa: BLE001
         logger.debug("Error logging vertex build")
 
@@ -234,6 +234,40 @@ class Vertex:
         self.built_object = state.get("built_object") or UnbuiltObject()
         self.built_result = state.get("built_result") or UnbuiltResult()
 
+    def get_build_state(self) -> dict[str, Any]:
+        """Returns the result of building the vertex, without the component instance.
+
+        This is what a successor needs from the vertex, so it is all that has to be cached
+        for a built vertex when the graph is rebuilt in another process.
+        """
+        return {
+            "built": self.built,
+            "built_object": None if isinstance(self.built_object, UnbuiltObject) else self.built_object,
+            "built_result": None if isinstance(self.built_result, UnbuiltResult) else self.built_result,
+            "use_result": self.use_result,
+            "result": self.result,
+            "results": self.results,
+            "artifacts": self.artifacts,
+            "artifacts_raw": self.artifacts_raw,
+            "artifacts_type": self.artifacts_type,
+            "outputs_logs": self.outputs_logs,
+            "logs": self.logs,
+        }
+
+    def set_build_state(self, state: dict[str, Any]) -> None:
+        """Restores a build state returned by `get_build_state`."""
+        self.built = state["built"]
+        self.built_object = state["built_object"] or UnbuiltObject()
+        self.built_result = state["built_result"] or UnbuiltResult()
+        self.use_result = state["use_result"]
+        self.result = state["result"]
+        self.results = state["results"]
+        self.artifacts = state["artifacts"]
+        self.artifacts_raw = state["artifacts_raw"]
+        self.artifacts_type = state["artifacts_type"]
+        self.outputs_logs = state["outputs_logs"]
+        self.logs = state["logs"]
+
     def set_top_level(self, top_level_vertices: list[str]) -> None:
         self.parent_is_top_level = self.parent_node_id in top_level_vertices
 
@@ -700,6 +734,23 @@ class Vertex:
         self.steps_ran = []
         self.build_params()
 
+    def reset_run_state(self) -> None:
+        """Clear the results of a previous run.
+
+        The parameters are rebuilt from the template when the graph is prepared again.
+        """
+        self.updated_raw_params = False
+        self.built = False
+        self.built_object = UnbuiltObject()
+        self.built_result = UnbuiltResult()
+        self.artifacts = {}
+        self.steps_ran = []
+        self.state = VertexStates.ACTIVE
+        self.result = None
+        self.results = {}
+        self.outputs_logs = {}
+        self.logs = {}
+
     def _is_chat_input(self) -> bool:
         return False
 
@@ -0,0 +1,119 @@
+"""Per-context capture of stdout, stderr and log output.
+
+Replacing `sys.stdout` for the duration of a run captures the output of every run executing at the
+same time, so concurrent runs lose or mix their logs. Instead, `capture_output` installs a proxy on
+`sys.stdout` and `sys.stderr` once, and the proxy writes to the capture of the current context, or to
+the original stream when there is none. Context variables are copied into the tasks and
+`asyncio.to_thread` calls a run starts, so their output is captured with it.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from io import StringIO
+from typing import TYPE_CHECKING, Any, Literal, TextIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class OutputCapture:
+    """Output captured while running in one context."""
+
+    def __init__(self) -> None:
+        self.stdout = StringIO()
+        self.stderr = StringIO()
+
+    def getvalue(self) -> str:
+        return self.stdout.getvalue() + self.stderr.getvalue()
+
+
+_current_capture: ContextVar[OutputCapture | None] = ContextVar("output_capture", default=None)
+
+
+class ContextStream:
+    """Proxy for `sys.stdout` or `sys.stderr` that writes to the capture of the current context."""
+
+    def __init__(self, stream: TextIO, name: Literal["stdout", "stderr"]) -> None:
+        self.wrapped = stream
+        self._name = name
+
+    def _target(self) -> TextIO:
+        capture = _current_capture.get()
+        return self.wrapped if capture is None else getattr(capture, self._name)
+
+    def write(self, s: str) -> int:
+        return self._target().write(s)
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        self._target().writelines(lines)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return self._target().isatty()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+
+class _StreamProxies:
+    """Installs the stream proxies while at least one capture is active."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def acquire(self) -> None:
+        with self._lock:
+            if not self._active:
+                if not isinstance(sys.stdout, ContextStream):
+                    sys.stdout = ContextStream(sys.stdout, "stdout")
+                if not isinstance(sys.stderr, ContextStream):
+                    sys.stderr = ContextStream(sys.stderr, "stderr")
+            self._active += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            if self._active:
+                return
+            # Leave the streams alone if someone else replaced them in the meantime
+            if isinstance(sys.stdout, ContextStream):
+                sys.stdout = sys.stdout.wrapped
+            if isinstance(sys.stderr, ContextStream):
+                sys.stderr = sys.stderr.wrapped
+
+
+_stream_proxies = _StreamProxies()
+
+
+@contextmanager
+def capture_output() -> Iterator[OutputCapture]:
+    """Capture stdout, stderr and log output of the current context.
+
+    Other contexts, like concurrent requests, keep writing to their own capture or to the
+    original streams.
+    """
+    capture = OutputCapture()
+    _stream_proxies.acquire()
+    token = _current_capture.set(capture)
+    try:
+        yield capture
+    finally:
+        _current_capture.reset(token)
+        _stream_proxies.release()
+
+
+def capture_writer(logger: Any, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+    """Write the log entry to the capture of the current context, if any."""
+    capture = _current_capture.get()
+    # A logger printing to a proxied stream is captured already
+    if capture is not None and not isinstance(getattr(logger, "_file", None), ContextStream):
+        timestamp = event_dict.get("timestamp", "")
+        capture.stdout.write(f"{timestamp} [{method_name.upper()}] {event_dict.get('event', '')}\n")
+    return event_dict
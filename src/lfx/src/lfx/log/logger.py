@@ -16,6 +16,7 @@ import structlog
 from platformdirs import user_cache_dir
 from typing_extensions import NotRequired
 
+from lfx.log.capture import capture_writer
 from lfx.settings import DEV
 
 VALID_LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
@@ -267,6 +268,7 @@ def configure(
             add_serialized,
             remove_exception_in_production,
             buffer_writer,
+            capture_writer,
         ]
     )
 
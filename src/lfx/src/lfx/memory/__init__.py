@@ -13,6 +13,7 @@ if has_langflow_memory():
         from langflow.memory import (
             aadd_messages,
             aadd_messagetables,
+            abuffer_messages,
             add_messages,
             adelete_messages,
             aget_messages,
@@ -28,6 +29,7 @@ if has_langflow_memory():
         from lfx.memory.stubs import (
             aadd_messages,
             aadd_messagetables,
+            abuffer_messages,
             add_messages,
             adelete_messages,
             aget_messages,
@@ -43,6 +45,7 @@ else:
     from lfx.memory.stubs import (
         aadd_messages,
         aadd_messagetables,
+        abuffer_messages,
         add_messages,
         adelete_messages,
         aget_messages,
@@ -58,6 +61,7 @@ else:
 __all__ = [
     "aadd_messages",
     "aadd_messagetables",
+    "abuffer_messages",
     "add_messages",
     "adelete_messages",
     "aget_messages",
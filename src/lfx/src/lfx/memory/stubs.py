@@ -5,6 +5,8 @@ service-based architecture. It mirrors the langflow.memory API but works with
 lfx's Message model and service interfaces.
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from uuid import UUID
 
 from lfx.log.logger import logger
@@ -300,3 +302,12 @@ async def aadd_messagetables(messages: Message | list[Message]) -> list[Message]
         List[Message]: Added messages.
     """
     return await aadd_messages(messages)
+
+
+@asynccontextmanager
+async def abuffer_messages() -> AsyncIterator[None]:
+    """Coalesce the messages added in this context into a single write.
+
+    Messages are written one by one without langflow, so this is a no-op kept for API compatibility.
+    """
+    yield
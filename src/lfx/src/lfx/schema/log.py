@@ -1,5 +1,6 @@
 """Log schema and types for lfx package."""
 
+from collections.abc import Awaitable
 from typing import Any, Literal, TypeAlias
 
 from pydantic import BaseModel, field_serializer
@@ -39,9 +40,12 @@ class SendMessageFunctionType(Protocol):
 
 
 class OnTokenFunctionType(Protocol):
-    """Protocol for on token function type."""
+    """Protocol for on token function type.
 
-    def __call__(self, data: dict[str, Any]) -> None: ...
+    Callbacks that would block the event loop return an awaitable, which is awaited.
+    """
+
+    def __call__(self, data: dict[str, Any]) -> Awaitable[None] | None: ...
 
 
 class Log(BaseModel):
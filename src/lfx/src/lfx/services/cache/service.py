@@ -1,13 +1,15 @@
 """Cache service implementations for lfx."""
 
+import dataclasses
 import pickle
 import threading
 import time
+import weakref
 from collections import OrderedDict
 from typing import Generic, Union
 
 from lfx.services.cache.base import CacheService, LockType
-from lfx.services.cache.utils import CACHE_MISS
+from lfx.services.cache.utils import CACHE_MISS, CacheStats, approximate_size, sweep_expired_items
 
 
 class ThreadingInMemoryCache(CacheService, Generic[LockType]):
@@ -20,6 +22,9 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
     Attributes:
         max_size (int, optional): Maximum number of items to store in the cache.
         expiration_time (int, optional): Time in seconds after which a cached item expires. Default is 1 hour.
+        max_bytes (int, optional): Maximum approximate size in bytes of the cached values.
+        sweep_interval (float, optional): Time in seconds between removals of the expired items in a
+            background thread. Without it, expired items are only removed when they are accessed.
 
     Example:
         cache = ThreadingInMemoryCache(max_size=3, expiration_time=5)
@@ -34,17 +39,24 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
         b = cache["b"]
     """
 
-    def __init__(self, max_size=None, expiration_time=60 * 60) -> None:
+    def __init__(self, max_size=None, expiration_time=60 * 60, max_bytes=None, sweep_interval=None) -> None:
         """Initialize a new ThreadingInMemoryCache instance.
 
         Args:
             max_size (int, optional): Maximum number of items to store in the cache.
             expiration_time (int, optional): Time in seconds after which a cached item expires. Default is 1 hour.
+            max_bytes (int, optional): Maximum approximate size in bytes of the cached values.
+            sweep_interval (float, optional): Time in seconds between removals of the expired items.
         """
         self._cache: OrderedDict = OrderedDict()
         self._lock = threading.RLock()
         self.max_size = max_size
         self.expiration_time = expiration_time
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._stats = CacheStats()
+        self._sweeper: threading.Thread | None = None
+        self._stop_sweeper = threading.Event()
 
     def get(self, key, lock: Union[threading.Lock, None] = None):  # noqa: UP007
         """Retrieve an item from the cache.
@@ -65,9 +77,12 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
             if self.expiration_time is None or time.time() - item["time"] < self.expiration_time:
                 # Move the key to the end to make it recently used
                 self._cache.move_to_end(key)
+                self._stats.hits += 1
                 # Check if the value is pickled
                 return pickle.loads(item["value"]) if isinstance(item["value"], bytes) else item["value"]  # noqa: S301
-            self.delete(key)
+            self._remove(key)
+            self._stats.expirations += 1
+        self._stats.misses += 1
         return CACHE_MISS
 
     def set(self, key, value, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
@@ -83,13 +98,17 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
         with lock or self._lock:
             if key in self._cache:
                 # Remove existing key before re-inserting to update order
-                self.delete(key)
+                self._remove(key)
             elif self.max_size and len(self._cache) >= self.max_size:
                 # Remove least recently used item
-                self._cache.popitem(last=False)
-            # pickle locally to mimic Redis
-
-            self._cache[key] = {"value": value, "time": time.time()}
+                self._evict()
+            size = approximate_size(value) if self.max_bytes else 0
+            self._cache[key] = {"value": value, "time": time.time(), "size": size}
+            self._stats.bytes += size
+            # Remove least recently used items until the cache fits its budget, keeping at least the new item
+            while self.max_bytes and self._stats.bytes > self.max_bytes and len(self._cache) > 1:
+                self._evict()
+            self._start_sweeper()
 
     def upsert(self, key, value, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         """Inserts or updates a value in the cache.
@@ -130,12 +149,59 @@ class ThreadingInMemoryCache(CacheService, Generic[LockType]):
 
     def delete(self, key, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         with lock or self._lock:
-            self._cache.pop(key, None)
+            self._remove(key)
 
     def clear(self, lock: Union[threading.Lock, None] = None) -> None:  # noqa: UP007
         """Clear all items from the cache."""
         with lock or self._lock:
             self._cache.clear()
+            self._stats.bytes = 0
+
+    def expire(self) -> int:
+        """Remove the expired items from the cache.
+
+        Returns:
+            The number of items removed.
+        """
+        if self.expiration_time is None:
+            return 0
+        with self._lock:
+            now = time.time()
+            expired = [key for key, item in self._cache.items() if now - item["time"] >= self.expiration_time]
+            for key in expired:
+                self._remove(key)
+            self._stats.expirations += len(expired)
+        return len(expired)
+
+    def get_stats(self) -> CacheStats:
+        """Return the hits, misses, evictions, expirations, items and bytes of the cache."""
+        with self._lock:
+            return dataclasses.replace(self._stats, items=len(self._cache))
+
+    def _remove(self, key) -> None:
+        if (item := self._cache.pop(key, None)) is not None:
+            self._stats.bytes -= item["size"]
+
+    def _evict(self) -> None:
+        _, item = self._cache.popitem(last=False)
+        self._stats.bytes -= item["size"]
+        self._stats.evictions += 1
+
+    def _start_sweeper(self) -> None:
+        if not self.sweep_interval or self.expiration_time is None or self._stop_sweeper.is_set():
+            return
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = threading.Thread(
+                target=sweep_expired_items,
+                args=(weakref.ref(self), self._stop_sweeper, self.sweep_interval),
+                name=f"{type(self).__name__}-sweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
+
+    async def teardown(self) -> None:
+        """Stop the background removal of expired items."""
+        self._stop_sweeper.set()
 
     def contains(self, key) -> bool:
         """Check if the key is in the cache."""
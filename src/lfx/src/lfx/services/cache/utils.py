@@ -1,8 +1,14 @@
 import base64
 import contextlib
 import hashlib
+import sys
 import tempfile
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
+from types import FunctionType, MethodType, ModuleType
 from typing import TYPE_CHECKING, Any
 
 from fastapi import UploadFile
@@ -26,6 +32,73 @@ class CacheMiss:
         return False
 
 
+@dataclass
+class CacheStats:
+    """Counters of an in-memory cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    items: int = 0
+    bytes: int = 0
+    """Approximate size of the cached values, only tracked when the cache has a `max_bytes` budget."""
+
+
+# Objects shared by many values, which are not counted in their size
+_SHARED_TYPES = (type, ModuleType, FunctionType, MethodType)
+_LEAF_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+
+def approximate_size(value: Any, max_objects: int = 10_000) -> int:
+    """Approximate the memory used by a value and the objects it references, in bytes.
+
+    Containers and the attributes of objects are followed, objects that know their own size
+    (like DataFrames and numpy arrays) are counted with `sys.getsizeof`. At most `max_objects`
+    objects are visited, to bound the cost on large graphs of objects.
+    """
+    size = 0
+    seen: set[int] = set()
+    stack = [value]
+    while stack and len(seen) < max_objects:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj, 0)
+        if isinstance(obj, _LEAF_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, list | tuple | set | frozenset | deque):
+            stack.extend(obj)
+        elif type(obj).__sizeof__ is object.__sizeof__:
+            if (attributes := getattr(obj, "__dict__", None)) is not None:
+                stack.append(attributes)
+            slots = getattr(type(obj), "__slots__", ())
+            stack.extend(
+                getattr(obj, slot)
+                for slot in ((slots,) if isinstance(slots, str) else slots)
+                if slot not in {"__dict__", "__weakref__"} and hasattr(obj, slot)
+            )
+    return size
+
+
+def sweep_expired_items(cache_ref: weakref.ref, stop: threading.Event, interval: float) -> None:
+    """Remove the expired items of a cache every `interval` seconds, until `stop` is set or the cache is gone.
+
+    Target of the sweeper threads of the in-memory caches. Only a weak reference is kept, so the sweeper
+    doesn't keep a discarded cache alive.
+    """
+    while not stop.wait(interval):
+        cache = cache_ref()
+        if cache is None:
+            return
+        cache.expire()
+        del cache
+
+
 def create_cache_folder(func):
     def wrapper(*args, **kwargs):
         # Get the destination folder
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
+from typing import Any
 
 
 class NoopDatabaseService:
@@ -23,3 +24,9 @@ class NoopDatabaseService:
 
         async with NoopSession() as session:
             yield session
+
+    async def log_transaction(self, **transaction: Any) -> None:
+        """Transactions are not stored without a database."""
+
+    async def log_vertex_build(self, **vertex_build: Any) -> None:
+        """Vertex builds are not stored without a database."""
@@ -17,6 +17,16 @@ class DatabaseServiceProtocol(Protocol):
         """Get database session."""
         ...
 
+    @abstractmethod
+    async def log_transaction(self, **transaction: Any) -> None:
+        """Log a transaction between two vertices."""
+        ...
+
+    @abstractmethod
+    async def log_vertex_build(self, **vertex_build: Any) -> None:
+        """Log the build of a vertex."""
+        ...
+
 
 class StorageServiceProtocol(Protocol):
     """Protocol for storage service."""
@@ -93,6 +103,11 @@ class ChatServiceProtocol(Protocol):
         """Set cached value."""
         ...
 
+    @abstractmethod
+    async def set_graph_state(self, graph: Any, vertex_ids: list[str] | None = None) -> None:
+        """Cache the state of a graph, or only what changed for the given vertices."""
+        ...
+
 
 class TracingServiceProtocol(Protocol):
     """Protocol for tracing service."""
@@ -151,6 +151,12 @@ class Settings(BaseSettings):
     """The cache type can be 'async' or 'redis'."""
     cache_expire: int = 3600
     """The cache expire in seconds."""
+    cache_compression_threshold: int = 1024 * 1024
+    """Values of at least this many bytes are compressed when stored in the 'redis' or 'disk' cache. 0 disables it."""
+    cache_max_bytes: int = 0
+    """Maximum approximate size in bytes of the values kept by the 'async' and 'memory' caches. 0 means no limit."""
+    cache_sweep_interval: float = 60.0
+    """Time in seconds between removals of the expired items of the 'async' and 'memory' caches. 0 disables it."""
     variable_store: str = "db"
     """The store can be 'db' or 'kubernetes'."""
 
@@ -160,6 +166,12 @@ class Settings(BaseSettings):
     """The port on which Langflow will expose Prometheus metrics. 9090 is the default port."""
 
     disable_track_apikey_usage: bool = False
+    api_key_cache_ttl: float = 10.0
+    """How long in seconds validated API keys are cached with their user. Deleting a key or updating its user clears
+    its cached entry in the worker that made the change. Set to 0 to check every request against the database."""
+    api_key_usage_flush_interval: float = 10.0
+    """Interval in seconds at which the usage of API keys, counted in memory, is written to the database in one
+    batched update. Set to 0 to update the key on every request."""
     remove_api_keys: bool = False
     components_path: list[str] = []
     components_index_path: str | None = None
@@ -179,6 +191,26 @@ class Settings(BaseSettings):
     redis_db: int = 0
     redis_url: str | None = None
     redis_cache_expire: int = 3600
+    job_queue_type: Literal["memory", "redis"] = "memory"
+    """Where the events of build jobs are kept. 'redis' keeps them in Redis streams, using the redis_* settings,
+    so the events of a build can be read from any worker, without sticky sessions."""
+    redis_job_queue_expire: int = 3600
+    """Time in seconds the events of a build job are kept in Redis after its last event."""
+    job_events_replay_size: int = 10000
+    """Maximum number of events of each build job kept to replay them to clients that reconnect with the ID of
+    the last event they received. Older events are dropped. 0 keeps all of them."""
+    keep_build_running_on_disconnect: bool = False
+    """If set to True, a build keeps running when the client streaming its events disconnects, so the client can
+    reconnect and resume the stream. Otherwise the build is cancelled."""
+    job_queue_max_size: int = 1000
+    """Maximum number of events of a build job its client has not read yet. Past it, the job_queue_overflow_policy
+    applies to new token events. 0 keeps all of them. Read events stay in the replay log of the job, up to
+    job_events_replay_size of them, until the job is cleaned up, so a build holds up to the sum of both in memory
+    with the in-memory event backend."""
+    job_queue_overflow_policy: Literal["block", "drop_tokens", "coalesce_tokens"] = "coalesce_tokens"
+    """What happens to the token events of a build job past job_queue_max_size. 'coalesce_tokens' merges them
+    with the last token event of the same message, 'drop_tokens' drops them, and 'block' pauses the build before its
+    next component until the client reads its events. Other events are always kept."""
 
     # Sentry
     sentry_dsn: str | None = None
@@ -198,6 +230,21 @@ class Settings(BaseSettings):
     """Object storage prefix for file storage. Defaults to 'files'."""
     object_storage_tags: dict[str, str] | None = None
     """Object storage tags for file storage."""
+    deduplicate_files: bool = False
+    """If set to True, the content of files uploaded by users is stored once, keyed by its SHA-256 checksum, and
+    shared by all the files with the same content."""
+    docling_workers: int = 2
+    """Number of long-lived Docling worker processes the File component converts files with in advanced mode, which
+    is also the number of files converted at once."""
+    docling_job_timeout: float = 600.0
+    """Time in seconds a Docling worker is given to convert a file before it is killed. 0 means no timeout."""
+    docling_worker_max_jobs: int = 100
+    """Number of files a Docling worker converts before it is replaced by a new one. 0 means no limit."""
+    docling_worker_max_memory: int = 0
+    """Memory in MB past which a Docling worker is replaced by a new one after its current file. 0 means no limit."""
+    docling_worker_idle_timeout: float = 300.0
+    """Time in seconds after which a Docling worker that converted no file is stopped, to free its memory. 0 keeps
+    idle workers until shutdown."""
 
     celery_enabled: bool = False
 
@@ -209,6 +256,8 @@ class Settings(BaseSettings):
     """Whether to store environment variables as Global Variables in the database."""
     variables_to_get_from_environment: list[str] = VARIABLES_TO_GET_FROM_ENVIRONMENT
     """List of environment variables to get from the environment and store in the database."""
+    variable_cache_ttl: float = 10.0
+    """How long in seconds decrypted Global Variables are cached per user. Set to 0 to disable the cache."""
     worker_timeout: int = 300
     """Timeout for the API calls in seconds."""
     frontend_timeout: int = 0
@@ -278,6 +327,13 @@ class Settings(BaseSettings):
     """The maximum number of vertex builds to keep in the database."""
     max_vertex_builds_per_vertex: int = 2
     """The maximum number of builds to keep per vertex. Older builds will be deleted."""
+    db_log_batch_size: int = 100
+    """The maximum number of transactions and vertex builds written to the database in a single batch."""
+    db_log_flush_interval: float = 1.0
+    """The maximum time in seconds transactions and vertex builds are buffered before being written to the database."""
+    db_log_retention_interval: float = 60.0
+    """How often in seconds old transactions and vertex builds are deleted to enforce max_transactions_to_keep,
+    max_vertex_builds_to_keep and max_vertex_builds_per_vertex."""
     webhook_polling_interval: int = 5000
     """The polling interval for the webhook in ms."""
     fs_flows_polling_interval: int = 10000
@@ -322,6 +378,32 @@ class Settings(BaseSettings):
     Default is 24 hours (86400 seconds). Minimum is 600 seconds (10 minutes)."""
     event_delivery: Literal["polling", "streaming", "direct"] = "streaming"
     """How to deliver build events to the frontend. Can be 'polling', 'streaming' or 'direct'."""
+    token_coalesce_interval: float = 0.0
+    """Time in seconds the chunks of a streamed message are collected before they are sent together in one token
+    event. 0 sends every chunk as soon as it is received."""
+    token_coalesce_max_bytes: int = 0
+    """Size in bytes of the collected chunks of a streamed message at which they are sent without waiting for
+    token_coalesce_interval. 0 means no limit."""
+
+    # Graph execution
+    graph_scheduler: Literal["layered", "dataflow"] = "layered"
+    """How Graph.process schedules vertices. 'layered' runs the graph layer by layer and waits for every
+    vertex in a layer before starting the next one. 'dataflow' starts each vertex as soon as all of its
+    predecessors have finished, so a slow vertex only delays the vertices that depend on it."""
+    graph_max_concurrency: int = 0
+    """Maximum number of vertices built concurrently by the 'dataflow' scheduler. 0 means no limit."""
+    graph_vertex_type_concurrency: dict[str, int] = {}
+    """Per vertex type concurrency limits for the 'dataflow' scheduler,
+    e.g. {"OpenAIModel": 2, "Agent": 1}. Vertex types not listed are only bound by graph_max_concurrency."""
+    graph_snapshot_journal_size: int = 0
+    """Number of snapshots of the run state kept by each graph for debugging, one per step, oldest dropped first.
+    0 disables snapshot recording."""
+    compiled_flow_cache_size: int = 128
+    """Maximum number of compiled flows kept in memory by the run endpoints, keyed by flow, flow version
+    and tweaks. Set to 0 to build the graph from the flow data on every request."""
+    flow_cache_size: int = 256
+    """Maximum number of flow definitions kept in memory by the run and webhook endpoints. A cached flow is used
+    as long as its updated_at in the database is unchanged. Set to 0 to load the whole flow on every request."""
     lazy_load_components: bool = False
     """If set to True, Langflow will only partially load components at startup and fully load them on demand.
     This significantly reduces startup time but may cause a slight delay when a component is first used."""
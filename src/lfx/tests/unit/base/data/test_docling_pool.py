@@ -0,0 +1,148 @@
+import json
+import textwrap
+import threading
+import time
+from types import SimpleNamespace
+
+from lfx.base.data import docling_pool
+from lfx.base.data.docling_pool import DoclingWorkerPool, close_docling_pool, get_docling_pool
+
+# Stand-in for the Docling worker script, speaking the same protocol
+FAKE_WORKER_SCRIPT = textwrap.dedent(
+    r"""
+    import json, os, sys, time
+
+    for line in sys.stdin:
+        job = json.loads(line)
+        if job.get("crash"):
+            sys.stderr.write("Segmentation fault\n")
+            sys.stderr.flush()
+            os._exit(1)
+        time.sleep(job.get("sleep", 0))
+        print(json.dumps({"ok": True, "pid": os.getpid(), "file_path": job["file_path"], "rss_mb": 100}))
+        sys.stdout.flush()
+    """
+)
+
+
+def _pid(result) -> int:
+    return json.loads(result.stdout)["pid"]
+
+
+def test_workers_are_reused_between_jobs():
+    pool = DoclingWorkerPool(1, script=FAKE_WORKER_SCRIPT)
+    try:
+        first = pool.run({"file_path": "a.pdf"})
+        second = pool.run({"file_path": "b.pdf"})
+
+        assert json.loads(first.stdout)["file_path"] == "a.pdf"
+        assert json.loads(second.stdout)["file_path"] == "b.pdf"
+        assert _pid(first) == _pid(second)
+    finally:
+        pool.close()
+
+
+def test_workers_are_recycled_after_max_jobs():
+    pool = DoclingWorkerPool(1, max_jobs_per_worker=2, script=FAKE_WORKER_SCRIPT)
+    try:
+        pids = [_pid(pool.run({"file_path": f"{i}.pdf"})) for i in range(3)]
+
+        assert pids[0] == pids[1]
+        assert pids[2] != pids[1]
+    finally:
+        pool.close()
+
+
+def test_workers_are_recycled_over_max_memory():
+    pool = DoclingWorkerPool(1, max_memory_mb=50, script=FAKE_WORKER_SCRIPT)
+    try:
+        assert _pid(pool.run({"file_path": "a.pdf"})) != _pid(pool.run({"file_path": "b.pdf"}))
+    finally:
+        pool.close()
+
+
+def test_jobs_run_in_parallel():
+    pool = DoclingWorkerPool(3, script=FAKE_WORKER_SCRIPT)
+    results = []
+    try:
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(pool.run({"file_path": f"{i}.pdf", "sleep": 0.5})))
+            for i in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({_pid(result) for result in results}) == 3
+    finally:
+        pool.close()
+
+
+def test_job_timeout_kills_worker():
+    pool = DoclingWorkerPool(1, job_timeout=0.5, script=FAKE_WORKER_SCRIPT)
+    try:
+        result = pool.run({"file_path": "slow.pdf", "sleep": 30})
+
+        assert result.stdout == b""
+        assert b"timed out" in result.stderr
+        # A new worker takes the next job
+        assert json.loads(pool.run({"file_path": "a.pdf"}).stdout)["ok"] is True
+    finally:
+        pool.close()
+
+
+def test_worker_crash_reports_stderr():
+    pool = DoclingWorkerPool(1, script=FAKE_WORKER_SCRIPT)
+    try:
+        result = pool.run({"file_path": "crash.pdf", "crash": True})
+
+        assert result.stdout == b""
+        assert b"Segmentation fault" in result.stderr
+        assert json.loads(pool.run({"file_path": "a.pdf"}).stdout)["ok"] is True
+    finally:
+        pool.close()
+
+
+def test_idle_workers_are_stopped():
+    pool = DoclingWorkerPool(1, idle_timeout=0.2, script=FAKE_WORKER_SCRIPT)
+    try:
+        first = _pid(pool.run({"file_path": "a.pdf"}))
+        worker, _ = pool._idle[0]
+        time.sleep(1)
+
+        assert pool._idle == []
+        assert not worker.alive
+        assert _pid(pool.run({"file_path": "b.pdf"})) != first
+    finally:
+        pool.close()
+
+
+def test_closed_pool_stops_workers_of_running_jobs():
+    pool = DoclingWorkerPool(1, script=FAKE_WORKER_SCRIPT)
+    thread = threading.Thread(target=pool.run, args=({"file_path": "slow.pdf", "sleep": 0.5},))
+    thread.start()
+    time.sleep(0.2)
+    pool.close()
+    thread.join()
+
+    assert pool._idle == []
+
+
+def test_close_docling_pool_creates_a_new_pool_next_time(monkeypatch):
+    settings = SimpleNamespace(
+        docling_workers=1,
+        docling_job_timeout=0,
+        docling_worker_max_jobs=0,
+        docling_worker_max_memory=0,
+        docling_worker_idle_timeout=0,
+    )
+    monkeypatch.setattr(docling_pool, "get_settings_service", lambda: SimpleNamespace(settings=settings))
+    get_docling_pool.cache_clear()
+    pool = get_docling_pool()
+
+    close_docling_pool()
+
+    assert pool._closed.is_set()
+    assert get_docling_pool() is not pool
+    close_docling_pool()
@@ -1,5 +1,6 @@
 """Unit tests for LFX CLI common utilities."""
 
+import asyncio
 import os
 import socket
 import sys
@@ -255,6 +256,32 @@ class TestGraphExecution:
         with pytest.raises(RuntimeError, match="Execution failed"):
             await execute_graph_with_capture(mock_graph, "test input")
 
+    @pytest.mark.asyncio
+    async def test_execute_graph_with_capture_isolates_concurrent_runs(self):
+        """Test that concurrent runs only capture their own output."""
+
+        def make_graph(name):
+            async def mock_async_start(inputs):  # noqa: ARG001
+                for i in range(3):
+                    print(f"{name} stdout {i}")  # noqa: T201
+                    print(f"{name} stderr {i}", file=sys.stderr)  # noqa: T201
+                    await asyncio.sleep(0)
+                    yield MagicMock(results={"text": name})
+
+            mock_graph = MagicMock()
+            mock_graph.async_start = mock_async_start
+            return mock_graph
+
+        original_stdout = sys.stdout
+        (_, logs_a), (_, logs_b) = await asyncio.gather(
+            execute_graph_with_capture(make_graph("a"), "test input"),
+            execute_graph_with_capture(make_graph("b"), "test input"),
+        )
+
+        assert logs_a == "a stdout 0\na stdout 1\na stdout 2\na stderr 0\na stderr 1\na stderr 2\n"
+        assert logs_b == "b stdout 0\nb stdout 1\nb stdout 2\nb stderr 0\nb stderr 1\nb stderr 2\n"
+        assert sys.stdout is original_stdout
+
 
 class TestResultExtraction:
     """Test result data extraction."""
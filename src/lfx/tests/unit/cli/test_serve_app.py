@@ -10,6 +10,7 @@ from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from lfx.cli.serve_app import (
     FlowMeta,
+    GraphPool,
     create_multi_serve_app,
     verify_api_key,
 )
@@ -482,3 +483,47 @@ class TestServeAppEndpoints:
         data = response.json()
         assert data["result"] == "Message output"
         assert data["success"] is True
+
+
+class TestGraphPool:
+    """Test the pool of graph copies used by the serve app."""
+
+    @pytest.fixture
+    def graph(self):
+        test_data_dir = Path(__file__).parent.parent.parent / "data"
+        with (test_data_dir / "simple_chat_no_llm.json").open() as f:
+            return Graph.from_payload(json.load(f), flow_id="test-flow-id")
+
+    async def test_checkout_reuses_copies(self, graph):
+        pool = GraphPool(graph, size=1)
+
+        async with pool.checkout() as first:
+            assert first is not graph
+            first.context["loop_index"] = 1
+        async with pool.checkout() as second:
+            assert second is first
+            assert "loop_index" not in second.context
+
+    async def test_checkout_copies_when_pool_is_empty(self, graph):
+        pool = GraphPool(graph, size=1)
+
+        async with pool.checkout() as first, pool.checkout() as second:
+            assert second is not first
+        async with pool.checkout() as third:
+            assert third is first or third is second
+        assert len(pool._idle) == 1
+
+    async def test_checkout_discards_copy_on_error(self, graph):
+        pool = GraphPool(graph, size=1)
+
+        async def run_failing_flow():
+            async with pool.checkout():
+                msg = "run failed"
+                raise RuntimeError(msg)
+
+        failed = pool._idle[0]
+        with pytest.raises(RuntimeError, match="run failed"):
+            await run_failing_flow()
+        assert pool._idle == []
+        async with pool.checkout() as graph_copy:
+            assert graph_copy is not failed
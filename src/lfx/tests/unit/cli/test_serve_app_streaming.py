@@ -44,6 +44,7 @@ class MockGraph:
             "output_node": MockNode("output_node", "ChatOutput", "Chat Output"),
         }
         self.edges = edges or [MockEdge("input_node", "output_node")]
+        self.context = {}
 
 
 @pytest.fixture
@@ -1,5 +1,6 @@
 from typing import Any
 from unittest.mock import MagicMock
+from uuid import uuid4
 
 import pytest
 from lfx.components.input_output import ChatInput, ChatOutput
@@ -168,3 +169,47 @@ async def test_agent_component_send_message_events(monkeypatch):  # noqa: ARG001
     assert result.sender_name == "Test"
     # The focus is on testing the message handling logic, not the database persistence layer
     assert event_manager.on_message.called
+
+
+async def test_get_variable_resolves_graph_variables_once(monkeypatch):
+    from lfx.components.input_output import TextInputComponent, TextOutputComponent
+    from lfx.custom.custom_component import custom_component
+    from lfx.graph import Graph
+
+    class FakeVariableService:
+        def __init__(self):
+            self.calls = []
+
+        async def get_variables_by_names(self, user_id, names, session):  # noqa: ARG002
+            self.calls.append(set(names))
+            return {name: f"{name}-value" for name in names if name != "MISSING"}
+
+        @staticmethod
+        def get_variable_value(name, field, variable):  # noqa: ARG004
+            if variable is None:
+                msg = f"{name} variable not found."
+                raise ValueError(msg)
+            return variable
+
+    variable_service = FakeVariableService()
+    monkeypatch.setattr(custom_component, "get_variable_service", lambda: variable_service)
+
+    text_input = TextInputComponent(_id="text_input")
+    text_output = TextOutputComponent(_id="text_output")
+    text_output.set(input_value=text_input.text_response)
+    graph = Graph(text_input, text_output, user_id=str(uuid4()))
+    for vertex, variable_name in zip(graph.vertices, ["API_KEY", "OTHER_KEY"], strict=True):
+        vertex.load_from_db_fields = ["input_value"]
+        vertex.params["input_value"] = variable_name
+    component = graph.vertices[0].custom_component
+
+    assert await component.get_variable("API_KEY", "input_value", session=None) == "API_KEY-value"
+    assert await component.get_variable("OTHER_KEY", "input_value", session=None) == "OTHER_KEY-value"
+    assert variable_service.calls == [{"API_KEY", "OTHER_KEY"}]
+
+    with pytest.raises(ValueError, match="MISSING variable not found"):
+        await component.get_variable("MISSING", "input_value", session=None)
+
+    graph.set_run_id("new-run")
+    await component.get_variable("API_KEY", "input_value", session=None)
+    assert len(variable_service.calls) == 3
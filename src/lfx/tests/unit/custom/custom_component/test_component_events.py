@@ -1,12 +1,14 @@
 import asyncio
+import json
 import time
+from types import SimpleNamespace
 from typing import Any
 from unittest.mock import MagicMock
 from uuid import uuid4
 
 import pytest
 from lfx.custom.custom_component.component import Component
-from lfx.events.event_manager import EventManager
+from lfx.events.event_manager import EventManager, create_default_event_manager
 from lfx.schema.content_block import ContentBlock
 from lfx.schema.content_types import TextContent, ToolContent
 from lfx.schema.message import Message
@@ -261,3 +263,42 @@ async def test_component_streaming_message():
             tokens.append(event)
 
     assert len(tokens) > 0
+
+
+@pytest.mark.asyncio
+async def test_component_streaming_message_coalesces_tokens(monkeypatch):
+    """Test that the chunks of a streamed message are coalesced into fewer token events."""
+    settings = SimpleNamespace(token_coalesce_interval=10.0, token_coalesce_max_bytes=0)
+    monkeypatch.setattr(
+        "lfx.custom.custom_component.component.get_settings_service", lambda: SimpleNamespace(settings=settings)
+    )
+    queue = asyncio.Queue()
+    vertex = MagicMock()
+    vertex.graph.flow_id = str(uuid4())
+    component = ComponentForTesting(_vertex=vertex)
+    component.set_event_manager(create_default_event_manager(queue))
+
+    class StreamChunk:
+        def __init__(self, content: str):
+            self.content = content
+
+    async def text_generator():
+        for chunk in ["Hello", " ", "World", "!"]:
+            yield StreamChunk(chunk)
+
+    message = Message(
+        sender="test_sender",
+        session_id="test_session",
+        sender_name="test_sender_name",
+        text=text_generator(),
+    )
+    sent_message = await component.send_message(message)
+
+    assert sent_message.text == "Hello World!"
+    events = []
+    while not queue.empty():
+        _, event_data, _ = queue.get_nowait()
+        events.append(json.loads(event_data))
+    tokens = [event["data"]["chunk"] for event in events if event["event"] == "token"]
+    # The interval is longer than the stream, so all chunks are sent when the stream ends
+    assert tokens == ["Hello World!"]
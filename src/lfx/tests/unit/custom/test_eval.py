@@ -0,0 +1,91 @@
+from textwrap import dedent
+
+import pytest
+from lfx.custom import eval as custom_eval
+from lfx.custom.eval import ComponentClassCache, component_class_cache, eval_custom_component_code
+
+CODE = dedent("""
+from lfx.custom import Component
+
+class CachedComponent(Component):
+    def some_method(self):
+        return "cached"
+""")
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    component_class_cache.clear()
+    yield
+    component_class_cache.clear()
+
+
+def test_same_code_is_compiled_once(monkeypatch):
+    calls = []
+    create_class = custom_eval.validate.create_class
+
+    def counting_create_class(code, class_name):
+        calls.append(class_name)
+        return create_class(code, class_name)
+
+    monkeypatch.setattr(custom_eval.validate, "create_class", counting_create_class)
+
+    first = eval_custom_component_code(CODE)
+    second = eval_custom_component_code(CODE)
+
+    assert first is second
+    assert first.__name__ == "CachedComponent"
+    assert calls == ["CachedComponent"]
+    assert component_class_cache.stats() == {"size": 1, "max_size": 512, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_different_code_gets_different_classes():
+    first = eval_custom_component_code(CODE)
+    second = eval_custom_component_code(CODE.replace('"cached"', '"changed"'))
+
+    assert first is not second
+    assert second().some_method() == "changed"
+
+
+def test_invalid_code_is_not_cached():
+    code = "class Broken(:\n    pass"
+    with pytest.raises(ValueError, match="invalid syntax"):
+        eval_custom_component_code(code)
+
+    assert len(component_class_cache) == 0
+
+
+def test_lru_eviction():
+    cache = ComponentClassCache(max_size=2)
+    cache.set("a", int)
+    cache.set("b", str)
+    assert cache.get("a") is int
+    cache.set("c", float)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is int
+    assert cache.get("c") is float
+    assert cache.stats()["evictions"] == 1
+
+
+def test_instances_of_a_cached_class_do_not_share_inputs_or_outputs():
+    code = dedent("""
+    from lfx.custom import Component
+    from lfx.io import MessageTextInput, Output
+
+    class CachedComponent(Component):
+        inputs = [MessageTextInput(name="text")]
+        outputs = [Output(name="result", method="build_result")]
+
+        def build_result(self):
+            return self.text
+    """)
+    first = eval_custom_component_code(code)()
+    first.set(extra="value")
+    first._append_tool_output()
+    second = eval_custom_component_code(code)()
+
+    assert [input_.name for input_ in first.inputs] == ["text", "extra"]
+    assert [input_.name for input_ in second.inputs] == ["text"]
+    assert [output.name for output in second.outputs] == ["result"]
+    assert [input_.name for input_ in type(second).inputs] == ["text"]
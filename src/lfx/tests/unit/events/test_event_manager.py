@@ -7,6 +7,7 @@ from unittest.mock import MagicMock
 import pytest
 from lfx.events.event_manager import (
     EventManager,
+    TokenBuffer,
     create_default_event_manager,
     create_stream_tokens_event_manager,
 )
@@ -37,6 +38,20 @@ class TestEventManager:
         assert "on_test" in manager.events
         assert callable(manager.events["on_test"])
 
+    def test_has_default_callback(self):
+        """Test that only events registered without a callback use the default callback."""
+        manager = EventManager(asyncio.Queue())
+
+        def custom_callback(*, manager, event_type, data):
+            pass
+
+        manager.register_event("on_token", "token")
+        manager.register_event("on_custom", "custom", custom_callback)
+
+        assert manager.has_default_callback("on_token")
+        assert not manager.has_default_callback("on_custom")
+        assert not manager.has_default_callback("on_missing")
+
     def test_register_event_with_custom_callback(self):
         """Test registering event with custom callback."""
         queue = asyncio.Queue()
@@ -368,3 +383,31 @@ class TestEventManagerAsync:
         for sent, received in zip(events_to_send, received_events, strict=False):
             assert sent[0] == received[0]  # event type
             assert sent[1] == received[1]  # data
+
+    async def test_token_buffer_coalesces_chunks(self):
+        """Test that a token buffer sends the chunks of a message together."""
+        queue = asyncio.Queue()
+        manager = create_default_event_manager(queue)
+        token_buffer = TokenBuffer(manager, interval=0.05, max_bytes=10)
+
+        token_buffer(data={"chunk": "Hello", "id": "1"})
+        token_buffer(data={"chunk": " ", "id": "1"})
+        assert queue.empty()
+
+        # The size limit sends the buffered chunks right away
+        token_buffer(data={"chunk": "World", "id": "1"})
+        token_buffer(data={"chunk": "!", "id": "1"})
+        # A chunk of another message sends the chunks of the previous one first
+        token_buffer(data={"chunk": "Bye", "id": "2"})
+        # The interval sends the remaining chunks
+        await asyncio.sleep(0.1)
+
+        events = []
+        while not queue.empty():
+            _, data_bytes, _ = queue.get_nowait()
+            events.append(json.loads(data_bytes)["data"])
+        assert events == [
+            {"chunk": "Hello World", "id": "1"},
+            {"chunk": "!", "id": "1"},
+            {"chunk": "Bye", "id": "2"},
+        ]
@@ -4,6 +4,7 @@ import pytest
 from lfx.components.input_output import ChatInput, ChatOutput, TextOutputComponent
 from lfx.graph import Graph
 from lfx.graph.graph.constants import Finish
+from lfx.schema.schema import InputValueRequest
 
 
 @pytest.mark.asyncio
@@ -72,6 +73,55 @@ async def test_graph_functional_async_start():
     assert results[-1] == Finish()
 
 
+def _chat_graph() -> Graph:
+    chat_input = ChatInput(_id="chat_input")
+    chat_input.set(should_store_message=False)
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=chat_input.message_response, should_store_message=False)
+    return Graph(chat_input, chat_output)
+
+
+@pytest.mark.asyncio
+async def test_graph_reset_run_state():
+    graph = _chat_graph()
+
+    for input_value in ["first", "second"]:
+        results = [result async for result in graph.async_start(InputValueRequest(input_value=input_value))]
+        assert results[-1] == Finish()
+        assert graph.get_vertex("chat_output").results["message"].text == input_value
+
+        graph.reset_run_state()
+        assert graph._run_id == ""
+        assert graph.get_snapshots() == []
+        assert graph.run_manager.ran_at_least_once == set()
+        assert all(not vertex.built and vertex.results == {} for vertex in graph.vertices)
+
+
+@pytest.mark.asyncio
+async def test_graph_snapshots_disabled_by_default():
+    graph = _chat_graph()
+    results = [result async for result in graph.async_start()]
+
+    assert results[-1] == Finish()
+    assert graph.get_snapshots() == []
+
+
+@pytest.mark.asyncio
+async def test_graph_snapshot_journal():
+    graph = _chat_graph()
+    graph.enable_snapshots(2)
+    graph.prepare()
+    snapshots = [graph.get_snapshot()]
+    await graph.astep()
+    snapshots.append(graph.get_snapshot())
+    await graph.astep()
+    snapshots.append(graph.get_snapshot())
+
+    # Only the last two snapshots are kept
+    assert graph.get_snapshots() == snapshots[1:]
+    assert [entry["vertex_id"] for entry in graph._snapshots] == ["chat_input", "chat_output"]
+
+
 def test_graph_functional_start_end():
     chat_input = ChatInput(_id="chat_input")
     text_output = TextOutputComponent(_id="text_output")
@@ -102,6 +152,54 @@ def test_graph_functional_start_end():
     assert results[-1] == Finish()
 
 
+def _chain_graph() -> Graph:
+    chat_input = ChatInput(_id="chat_input")
+    text_output = TextOutputComponent(_id="text_output")
+    text_output.set(input_value=chat_input.message_response)
+    chat_output = ChatOutput(_id="chat_output")
+    chat_output.set(input_value=text_output.text_response, sender_name=chat_input.message_response)
+    return Graph(chat_input, chat_output)
+
+
+def test_graph_edge_index_matches_edges():
+    graph = _chain_graph()
+
+    for vertex in graph.vertices:
+        expected = [edge for edge in graph.edges if vertex.id in {edge.source_id, edge.target_id}]
+        assert graph.get_vertex_edges(vertex.id) == expected
+        assert graph.get_vertex_edges(vertex.id, is_source=False) == [
+            edge for edge in expected if edge.target_id == vertex.id
+        ]
+        assert graph.get_vertex_edges(vertex.id, is_target=False) == [
+            edge for edge in expected if edge.source_id == vertex.id
+        ]
+    assert {v.id for v in graph.get_vertices_with_target("chat_output")} == {"chat_input", "text_output"}
+    assert graph.get_edge("chat_input", "text_output") is not None
+    assert graph.get_edge("text_output", "chat_input") is None
+
+
+def test_graph_edge_index_after_remove_vertex():
+    graph = _chain_graph()
+
+    graph.remove_vertex("text_output")
+
+    assert graph.get_vertex_edges("text_output") == []
+    assert [(edge.source_id, edge.target_id) for edge in graph.get_vertex_edges("chat_output")] == [
+        ("chat_input", "chat_output")
+    ]
+    assert graph.get_edge("chat_input", "text_output") is None
+
+
+def test_graph_edge_index_after_setstate():
+    graph = _chain_graph()
+
+    new_graph = Graph.__new__(Graph)
+    new_graph.__setstate__(graph.__getstate__())
+
+    assert new_graph.edges == graph.edges
+    assert new_graph.get_vertex_edges("text_output") == graph.get_vertex_edges("text_output")
+
+
 # TODO: Move to Langflow tests
 @pytest.mark.skip(reason="Temporarily disabled")
 def test_graph_set_with_valid_component():
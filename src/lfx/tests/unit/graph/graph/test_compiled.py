@@ -0,0 +1,50 @@
+import json
+
+import pytest
+from lfx.graph import Graph
+from lfx.graph.graph.compiled import CompiledFlow
+
+
+def _vertex_ids(graph: Graph) -> list[str]:
+    return sorted(vertex.id for vertex in graph.vertices)
+
+
+def _edge_ids(graph: Graph) -> list[tuple[str, str]]:
+    return sorted((edge.source_id, edge.target_id) for edge in graph.edges)
+
+
+@pytest.mark.parametrize("flow_fixture", ["json_memory_chatbot_no_llm", "json_simple_api_test", "json_loop_test"])
+def test_compiled_flow_matches_from_payload(flow_fixture, request):
+    payload = json.loads(request.getfixturevalue(flow_fixture))
+
+    expected = Graph.from_payload(payload, flow_id="flow")
+    compiled_flow, first_graph = CompiledFlow.compile_to_graph(payload, flow_id="flow")
+
+    for graph in (first_graph, compiled_flow.to_graph(flow_id="flow")):
+        assert _vertex_ids(graph) == _vertex_ids(expected)
+        assert _edge_ids(graph) == _edge_ids(expected)
+        assert graph.top_level_vertices == expected.top_level_vertices
+        assert graph.cycle_vertices == expected.cycle_vertices
+        assert graph.run_manager.cycle_vertices == expected.run_manager.cycle_vertices
+        assert graph.predecessor_map == expected.predecessor_map
+        assert graph._is_input_vertices == expected._is_input_vertices
+        assert graph._is_output_vertices == expected._is_output_vertices
+
+
+def test_compiled_flow_graphs_are_independent(json_memory_chatbot_no_llm):
+    compiled_flow = CompiledFlow.from_payload(json.loads(json_memory_chatbot_no_llm))
+
+    first = compiled_flow.to_graph(flow_id="flow", user_id="user")
+    second = compiled_flow.to_graph(flow_id="flow")
+
+    assert first is not second
+    assert first.user_id == "user"
+    assert second.user_id is None
+    vertex_id = first.vertices[0].id
+    assert first.get_vertex(vertex_id) is not second.get_vertex(vertex_id)
+    assert first.get_vertex(vertex_id).data is not second.get_vertex(vertex_id).data
+
+
+def test_compiled_flow_invalid_payload():
+    with pytest.raises(ValueError, match="Invalid payload"):
+        CompiledFlow.from_payload({"nodes": []})
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from lfx.custom.custom_component.component import Component
+from lfx.exceptions.component import ComponentBuildError
+from lfx.graph import Graph
+from lfx.inputs.inputs import FloatInput, MessageTextInput
+from lfx.schema.message import Message
+from lfx.template import Output
+
+EVENTS: list[tuple[str, str]] = []
+
+
+class SleepComponent(Component):
+    display_name = "SleepComponent"
+    inputs = [
+        MessageTextInput(name="input_value", value=""),
+        MessageTextInput(name="other_value", value=""),
+        FloatInput(name="delay", value=0.0),
+    ]
+    outputs = [Output(name="text", method="run_sleep")]
+
+    async def run_sleep(self) -> Message:
+        EVENTS.append(("start", self._id))
+        await asyncio.sleep(self.delay)
+        EVENTS.append(("end", self._id))
+        return Message(text=f"{self._id}:{self.input_value}")
+
+
+class OtherSleepComponent(SleepComponent):
+    display_name = "OtherSleepComponent"
+
+
+@pytest.fixture(autouse=True)
+def _clear_events():
+    EVENTS.clear()
+    yield
+    EVENTS.clear()
+
+
+def build_branching_graph(component_class: type[SleepComponent] = SleepComponent) -> Graph:
+    """Builds source -> slow -> sink and source -> fast -> after_fast -> sink."""
+    source = SleepComponent(_id="source")
+    slow = component_class(_id="slow", delay=0.3)
+    slow.set(input_value=source.run_sleep)
+    fast = component_class(_id="fast", delay=0.0)
+    fast.set(input_value=source.run_sleep)
+    after_fast = component_class(_id="after_fast", delay=0.0)
+    after_fast.set(input_value=fast.run_sleep)
+    sink = SleepComponent(_id="sink")
+    sink.set(input_value=slow.run_sleep, other_value=after_fast.run_sleep)
+    graph = Graph()
+    graph.add_component(sink)
+    graph.prepare()
+    return graph
+
+
+def index_of(event: str, vertex_id: str) -> int:
+    return EVENTS.index((event, vertex_id))
+
+
+async def test_layered_scheduler_waits_for_the_whole_layer():
+    graph = build_branching_graph()
+    await graph.process(fallback_to_env_vars=False, scheduler="layered")
+
+    assert index_of("start", "after_fast") > index_of("end", "slow")
+    assert graph.get_vertex("sink").built
+
+
+async def test_dataflow_scheduler_does_not_wait_for_slow_siblings():
+    graph = build_branching_graph()
+    await graph.process(fallback_to_env_vars=False, scheduler="dataflow")
+
+    assert index_of("end", "after_fast") < index_of("end", "slow")
+    # The sink still waits for both of its predecessors
+    assert index_of("start", "sink") > index_of("end", "slow")
+    assert index_of("start", "sink") > index_of("end", "after_fast")
+    assert all(vertex.built for vertex in graph.vertices)
+    assert graph.get_vertex("sink").results["text"].text.startswith("sink:slow:")
+
+
+async def test_dataflow_scheduler_max_concurrency():
+    graph = build_branching_graph()
+    await graph.process(fallback_to_env_vars=False, scheduler="dataflow", max_concurrency=1)
+
+    # With a single slot every vertex finishes before the next one starts
+    for start, end in zip(EVENTS[::2], EVENTS[1::2], strict=True):
+        assert start[0] == "start"
+        assert end == ("end", start[1])
+
+
+async def test_dataflow_scheduler_vertex_type_concurrency():
+    graph = build_branching_graph(OtherSleepComponent)
+    vertex_type = graph.get_vertex("slow").vertex_type
+    await graph.process(
+        fallback_to_env_vars=False,
+        scheduler="dataflow",
+        vertex_type_concurrency={vertex_type: 1},
+    )
+
+    # slow and fast share a type, so only one of them runs at a time
+    assert index_of("start", "fast") > index_of("end", "slow") or index_of("start", "slow") > index_of("end", "fast")
+    assert all(vertex.built for vertex in graph.vertices)
+
+
+async def test_dataflow_scheduler_propagates_errors():
+    class FailingComponent(SleepComponent):
+        async def run_sleep(self) -> Message:
+            msg = "boom"
+            raise ValueError(msg)
+
+    source = SleepComponent(_id="source")
+    failing = FailingComponent(_id="failing")
+    failing.set(input_value=source.run_sleep)
+    graph = Graph()
+    graph.add_component(failing)
+    graph.prepare()
+
+    with pytest.raises(ComponentBuildError, match="boom"):
+        await graph.process(fallback_to_env_vars=False, scheduler="dataflow")
+
+
+def test_invalid_scheduler():
+    with pytest.raises(ValueError, match="Invalid scheduler"):
+        Graph._get_scheduler_config("unknown", 0, {})